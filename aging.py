@@ -0,0 +1,96 @@
+"""Vehicle aging: maintenance cost multipliers and age-triggered activities.
+
+Both depend only on a vehicle's age and its expected lifespan in whole years.
+Lifespans in reference_data.vehicle_lifespan are small integers, so everything
+is tabulated once per process as ``(lifespan, age)`` arrays and forecasts look
+it up with one fancy index.
+
+The multiplier grows piecewise with age as a share of the lifespan:
+
+- +15% a year past 60% of the lifespan
+- another +25% a year past 80%
+- another +50% a year past the lifespan
+- another +75% a year more than five years past it
+
+It is capped at MAX_AGING_MULTIPLIER.
+
+Past ``lifespan + 5`` every rule repeats with a period of AGE_PERIOD years, and
+the multiplier is already at its cap by then. Ages beyond MAX_AGE are
+therefore folded back into the table's last AGE_PERIOD years, and negative ages
+are treated as new. Lifespans outside the table, and ages or lifespans that
+aren't whole numbers, fall back to evaluating the rules directly.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from forecast_result import ACTIVITY_BITS
+
+MAX_AGING_MULTIPLIER = 8.0
+MAX_LIFESPAN = 40
+MAX_AGE = 63
+AGE_PERIOD = 12                 # lcm of the every-3 and every-4 year repairs
+
+# Age-triggered activities; each rule is a predicate of (age, lifespan)
+AGE_RULES = {
+    'Transmission Service': lambda age, lifespan: age >= lifespan * 0.7,
+    'Suspension Check': lambda age, lifespan: age >= lifespan * 0.8,
+    # Beyond expected lifespan - major component issues
+    'Engine Mount Replacement': lambda age, lifespan: age > lifespan,
+    'CV Joint Replacement': lambda age, lifespan: age > lifespan + 2,
+    'Power Steering Service': lambda age, lifespan: age > lifespan + 3,
+    # Very old vehicles - extreme maintenance
+    'Radiator Replacement': lambda age, lifespan: (age > lifespan + 5) & (age % 3 == 0),
+    'Catalytic Converter Replacement': lambda age, lifespan: (age > lifespan + 5) & (age % 4 == 0),
+    # EVs: the battery pack and drive unit wear out instead
+    'Battery Pack Degradation Service': lambda age, lifespan: age > lifespan,
+    'Drive Unit Overhaul': lambda age, lifespan: age > lifespan + 3,
+}
+
+
+def aging_multiplier(age, lifespan):
+    """Maintenance cost multiplier, evaluated directly; broadcasts"""
+    multiplier = np.where(age > lifespan * 0.6, 1.0 + (age - (lifespan * 0.6)) * 0.15, 1.0)
+    multiplier = np.where(age > lifespan * 0.8, multiplier + (age - (lifespan * 0.8)) * 0.25, multiplier)
+    multiplier = np.where(age > lifespan, multiplier + (age - lifespan) * 0.50, multiplier)
+    multiplier = np.where(age > lifespan + 5, multiplier + (age - (lifespan + 5)) * 0.75, multiplier)
+    return np.minimum(multiplier, MAX_AGING_MULTIPLIER)
+
+
+def age_activity_mask(age, lifespan):
+    """ACTIVITY_BITS mask of the age-triggered activities due, evaluated directly; broadcasts"""
+    age, lifespan = np.broadcast_arrays(age, lifespan)
+    mask = np.zeros(age.shape, dtype=np.uint64)
+    for name, rule in AGE_RULES.items():
+        mask[rule(age, lifespan)] |= np.uint64(ACTIVITY_BITS[name])
+    return mask
+
+
+@lru_cache(maxsize=None)
+def aging_tables():
+    """``(multiplier, activity mask)`` tables indexed by ``[lifespan, age]``; read-only"""
+    lifespan, age = np.ogrid[:MAX_LIFESPAN + 1, :MAX_AGE + 1]
+    tables = aging_multiplier(age, lifespan), age_activity_mask(age, lifespan)
+    for table in tables:
+        table.flags.writeable = False
+    return tables
+
+
+def _table_index(age, lifespan):
+    """Row and column into aging_tables, or None if some entry isn't in the table"""
+    age, lifespan = np.asarray(age), np.asarray(lifespan)
+    if not (np.all(age == np.floor(age)) and np.all(lifespan == np.floor(lifespan))
+            and np.all((lifespan >= 1) & (lifespan <= MAX_LIFESPAN))):
+        return None
+    age = np.maximum(age, 0).astype(np.int64)
+    age = np.where(age > MAX_AGE, age - (age - MAX_AGE + AGE_PERIOD - 1) // AGE_PERIOD * AGE_PERIOD, age)
+    return lifespan.astype(np.int64), age
+
+
+def aging_lookup(age, lifespan):
+    """``(multiplier, activity mask)`` for every broadcast age and lifespan"""
+    index = _table_index(age, lifespan)
+    if index is None:
+        return aging_multiplier(age, lifespan), age_activity_mask(age, lifespan)
+    multipliers, masks = aging_tables()
+    return multipliers[index], masks[index]
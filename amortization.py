@@ -0,0 +1,96 @@
+"""Vectorized loan amortization.
+
+Loans are fixed-rate with monthly payments and compounding. With ``P`` the
+principal, ``r`` the monthly rate and ``n`` the term in months:
+
+    payment    = P * r / (1 - (1 + r) ** -n)        (P / n when r == 0)
+    balance(k) = P * (1 + r) ** k - payment * ((1 + r) ** k - 1) / r
+
+The balance has a closed form, so schedules for any number of loans are built
+without stepping month by month, and annual_schedule only evaluates balances at
+year ends, keeping portfolio runs at O(loans x years). Payments stop once the
+term ends. Rates are annual percentages, as entered in the app.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+MONTHS_PER_YEAR = 12
+
+
+def _loan_arrays(principal, annual_rate, term_years):
+    """Principal, monthly rate and term in whole months, broadcast together"""
+    principal = np.maximum(np.asarray(principal, dtype=np.float64), 0.0)
+    monthly_rate = np.maximum(np.asarray(annual_rate, dtype=np.float64), 0.0) / 100 / MONTHS_PER_YEAR
+    months = np.maximum(np.rint(np.asarray(term_years, dtype=np.float64) * MONTHS_PER_YEAR), 1)
+    return np.broadcast_arrays(principal, monthly_rate, months)
+
+
+def _payment(principal, r, n):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(r > 0, principal * r / (1 - (1 + r) ** -n), principal / n)
+
+
+def _balance(principal, r, payment, n, k):
+    """Balance after ``k`` of ``n`` payments"""
+    growth = (1 + r) ** k
+    with np.errstate(divide='ignore', invalid='ignore'):
+        balance = np.where(r > 0, principal * growth - payment * (growth - 1) / r, principal - payment * k)
+    return np.where(k >= n, 0.0, np.maximum(balance, 0.0))
+
+
+def monthly_payment(principal, annual_rate, term_years):
+    """Level monthly payment for each loan"""
+    return _payment(*_loan_arrays(principal, annual_rate, term_years))
+
+
+def max_principal(payment, annual_rate, term_years):
+    """Largest loan a level monthly ``payment`` pays off over the term (inverse of monthly_payment)"""
+    payment, r, n = _loan_arrays(payment, annual_rate, term_years)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(r > 0, payment * (1 - (1 + r) ** -n) / r, payment * n)
+
+
+@dataclass(frozen=True)
+class AmortizationSchedule:
+    """Per-period loan cash flows; the last axis is the period, index 0 being period 1"""
+    payment: np.ndarray
+    principal: np.ndarray
+    interest: np.ndarray
+    balance: np.ndarray         # left owing at the end of each period
+
+    @property
+    def total_paid(self):
+        return self.payment.sum(axis=-1)
+
+    @property
+    def total_interest(self):
+        return self.interest.sum(axis=-1)
+
+
+def _schedule(principal, annual_rate, term_years, periods, months_per_period):
+    P, r, n = _loan_arrays(principal, annual_rate, term_years)
+    payment = _payment(P, r, n)
+    P, r, n, payment = P[..., None], r[..., None], n[..., None], payment[..., None]
+
+    # Payments made by the end of each period, and the balances either side of it
+    made = np.minimum(np.arange(1, periods + 1) * months_per_period, n)
+    made_before = np.concatenate([np.zeros_like(made[..., :1]), made[..., :-1]], axis=-1)
+    balance = _balance(P, r, payment, n, made)
+    opening = np.concatenate([P, balance[..., :-1]], axis=-1)
+
+    paid = payment * (made - made_before)
+    principal_paid = opening - balance
+    return AmortizationSchedule(paid, principal_paid, paid - principal_paid, balance)
+
+
+def amortization_schedule(principal, annual_rate, term_years, months=None):
+    """Month-by-month schedule for each loan; ``months`` defaults to the longest term"""
+    if months is None:
+        months = int(_loan_arrays(principal, annual_rate, term_years)[2].max())
+    return _schedule(principal, annual_rate, term_years, months, 1)
+
+
+def annual_schedule(principal, annual_rate, term_years, years):
+    """Schedule summed over each of ``years`` years, starting with the first payment"""
+    return _schedule(principal, annual_rate, term_years, years, MONTHS_PER_YEAR)
@@ -0,0 +1,60 @@
+"""Vectorized EV battery state-of-health model.
+
+Capacity fades with calendar age and with charge cycles, counted as full
+equivalent cycles (miles driven / rated range):
+
+    SoH = 1 - CALENDAR_FADE * sqrt(age) - CYCLE_FADE * miles / range_miles
+
+floored at MIN_STATE_OF_HEALTH. As capacity fades, internal resistance rises
+and more energy is lost per mile driven:
+
+    energy_factor = 1 + RESISTANCE_PENALTY * (1 - SoH)
+
+Every function broadcasts, and battery_curves follows the same
+``(N,)`` -> ``(N, years)`` convention as depreciation.value_curve.
+"""
+import numpy as np
+
+from reference_data import ev_charging_data
+
+CALENDAR_FADE = 0.02            # capacity lost per sqrt(year)
+CYCLE_FADE = 0.00015            # capacity lost per full equivalent cycle
+RESISTANCE_PENALTY = 0.5        # extra energy per mile per unit of capacity lost
+MIN_STATE_OF_HEALTH = 0.5
+SERVICE_STATE_OF_HEALTH = 0.75  # below this the pack needs a degradation service
+
+# Used for EVs missing from ev_charging_data
+FALLBACK_BATTERY = {'battery_kwh': 75, 'range_miles': 250}
+
+
+def battery_specs(makes, models):
+    """Rated pack capacity (kWh) and range (miles) arrays for each vehicle"""
+    data = [ev_charging_data.get(make, {}).get(model) or FALLBACK_BATTERY for make, model in zip(makes, models)]
+    return (np.array([d['battery_kwh'] for d in data], dtype=np.float64),
+            np.array([d['range_miles'] for d in data], dtype=np.float64))
+
+
+def state_of_health(age, odometer, range_miles):
+    """Remaining share of rated capacity after ``age`` years and ``odometer`` miles"""
+    age = np.maximum(np.asarray(age, dtype=np.float64), 0.0)
+    cycles = np.maximum(np.asarray(odometer, dtype=np.float64), 0.0) / range_miles
+    soh = 1 - CALENDAR_FADE * np.sqrt(age) - CYCLE_FADE * cycles
+    return np.maximum(soh, MIN_STATE_OF_HEALTH)
+
+
+def energy_factor(soh):
+    """Energy drawn per mile relative to a new pack"""
+    return 1 + RESISTANCE_PENALTY * (1 - np.asarray(soh, dtype=np.float64))
+
+
+def battery_curves(battery_kwh, range_miles, current_vehicle_age, current_mileage, avg_mpy, years):
+    """State of health, usable capacity (kWh) and energy factor at the end of years 1..``years``.
+
+    Scalar arguments give 1-D curves; arrays of shape ``(N,)`` give
+    ``(N, years)`` matrices, one row per vehicle.
+    """
+    i = np.arange(1, years + 1)
+    age = np.asarray(current_vehicle_age)[..., None] + i
+    odometer = np.asarray(current_mileage)[..., None] + np.asarray(avg_mpy)[..., None] * i
+    soh = state_of_health(age, odometer, np.asarray(range_miles, dtype=np.float64)[..., None])
+    return soh, np.asarray(battery_kwh, dtype=np.float64)[..., None] * soh, energy_factor(soh)
@@ -0,0 +1,54 @@
+"""Per-stage timing of the forecast pipeline.
+
+Runs predict_5_years_cost for a random sample of vehicles with profiling
+switched on and prints the count, total and p50/p95/p99 of every stage span.
+
+    python benchmarks/forecast_stages.py [--vehicles 200] [--years 10] [-o spans.json]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import profiling  # noqa: E402
+from estimator import is_electric_vehicle, predict_5_years_cost  # noqa: E402
+from reference_data import car_makes_and_models, msrp_data, state_cost_multipliers  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vehicles', type=int, default=200, help='forecasts to run')
+    parser.add_argument('--years', type=int, default=10, help='forecast horizon')
+    parser.add_argument('-o', '--output', help='write the span stats here as JSON')
+    args = parser.parse_args()
+
+    vehicles = [(make, model) for make, models in car_makes_and_models.items() for model in models]
+    states = sorted(state_cost_multipliers)
+    rng = np.random.default_rng(0)
+    profiling.enable()
+    start = time.perf_counter()
+    for k in rng.integers(len(vehicles), size=args.vehicles):
+        make, model = vehicles[k]
+        msrp = msrp_data.get((make, model))
+        price = float(rng.uniform(0.4, 1.0) * (msrp or 30000))
+        with profiling.span('forecast.total'):
+            predict_5_years_cost(
+                make, model, int(rng.integers(2008, 2025)), float(rng.uniform(0, 150000)),
+                float(rng.uniform(5000, 20000)), 0 if is_electric_vehicle(make, model) else 25, price,
+                states[rng.integers(len(states))], args.years, price * 0.8, 6.5, 5, 35, 18, msrp, 'normal', 'flat'
+            )
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        profiling.export(args.output)
+    print(profiling.stats_frame().to_string(float_format='{:,.3f}'.format))
+    print(f"Ran {args.vehicles:,} forecasts in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Import-time report for the estimator's entry points.
+
+Runs each entry point in a fresh interpreter under ``python -X importtime`` and
+prints the total import time, the slowest top-level imports and which of the
+heavy optional dependencies got pulled in.
+
+    python benchmarks/importtime.py [--top 15]
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_DIR, 'costapp.py')
+
+
+def app_imports(path=APP_PATH):
+    """costapp.py's top-level import statements, as code; running the script itself needs a Streamlit server"""
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+# Entry point label -> code executed in the child interpreter
+ENTRY_POINTS = {
+    'reference data': 'import reference_data',
+    'estimator (no forecast)': 'import estimator',
+    'estimator + model load': 'import estimator; estimator.load_cost_model()',
+    'estimator + sklearn pickles': 'import estimator; estimator.load_models()',
+    'app cold start (before first forecast)': app_imports(),
+}
+
+# Dependencies that should only load on the code paths that need them
+HEAVY_MODULES = ['streamlit', 'sklearn', 'scipy', 'plotly', 'pandas', 'pandas.io.formats.style', 'pyarrow']
+
+
+def parse_importtime(stderr):
+    """Parse ``-X importtime`` output into {module: (self_us, cumulative_us, depth)}"""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return timings
+
+
+def measure(code):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{code!r} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def report(label, timings, top):
+    top_level = {name: t for name, t in timings.items() if t[2] == 0}
+    total_ms = sum(t[1] for t in top_level.values()) / 1000
+    print(f"\n── {label}: {total_ms:,.1f} ms across {len(timings)} modules")
+    for name, (_, cumulative_us, _) in sorted(top_level.items(), key=lambda kv: -kv[1][1])[:top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+    loaded = [name for name in HEAVY_MODULES if name in timings]
+    print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=10, help='number of top-level imports to list')
+    args = parser.parse_args()
+    for label, code in ENTRY_POINTS.items():
+        report(label, measure(code), args.top)
+
+
+if __name__ == '__main__':
+    main()
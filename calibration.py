@@ -0,0 +1,146 @@
+"""Offline calibration of the depreciation curve from historical listings.
+
+Fits the decay rate ``a`` and value floor ``Vmin`` of
+
+    price = Vmin + (V0 - Vmin) * exp(-a * t)
+
+(the same curve as depreciation.residual_values, rearranged) for every
+make/model, make and tier with enough listings, and writes them to
+``depreciation_params.json`` where forecasts pick them up automatically.
+
+For a fixed ``a`` the model is linear in ``Vmin``, so each group's best
+``Vmin`` and squared error have closed forms built from per-group sums. That
+leaves a one-dimensional search over ``a``, done for every group at once: a
+coarse log-spaced grid followed by a golden-section refinement. Each step is a
+handful of array operations plus ``np.bincount`` over all listings.
+
+The listings CSV needs ``make``, ``model``, ``model_year``, ``listing_year`` and
+``price`` columns; ``msrp`` is optional and falls back to reference_data.msrp_data.
+
+    python calibration.py listings.csv [-o depreciation_params.json] [--min-listings 50]
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from depreciation import DECAY_RATE, MAX_ELAPSED_YEARS, PARAMS_PATH, VALUE_FLOOR
+from reference_data import msrp_data
+
+A_GRID = np.geomspace(0.01, 2.0, 160)
+GOLDEN_ITERATIONS = 40
+MIN_LISTINGS = 50
+_INV_PHI = (np.sqrt(5) - 1) / 2
+
+
+def load_listings(path):
+    """Read listings into a DataFrame with elapsed years and MSRP filled in"""
+    import pandas as pd
+    df = pd.read_csv(path, dtype={'make': 'category', 'model': 'category'})
+    missing = {'make', 'model', 'model_year', 'listing_year', 'price'} - set(df.columns)
+    if missing:
+        raise ValueError(f"{path} is missing columns: {', '.join(sorted(missing))}")
+    if 'msrp' not in df.columns:
+        df['msrp'] = np.nan
+    fallback = [msrp_data.get((make, model), np.nan) for make, model in zip(df['make'], df['model'])]
+    df['msrp'] = df['msrp'].fillna(pd.Series(fallback, index=df.index))
+    df['elapsed'] = (df['listing_year'] - df['model_year']).clip(0, MAX_ELAPSED_YEARS)
+    df = df.dropna(subset=['msrp', 'price', 'elapsed'])
+    return df[df['msrp'] > 0]
+
+
+def _group_sse(a, groups, t, V0, price, n_groups):
+    """Squared error and best non-negative Vmin per group for per-group decay rates ``a``"""
+    e = np.exp(-a[groups] * t)
+    r = price - V0 * e
+    b = 1 - e
+    srr = np.bincount(groups, r * r, n_groups)
+    srb = np.bincount(groups, r * b, n_groups)
+    sbb = np.bincount(groups, b * b, n_groups)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vmin = np.where(sbb > 0, np.maximum(srb / sbb, 0.0), VALUE_FLOOR)
+    return srr - 2 * vmin * srb + vmin * vmin * sbb, vmin
+
+
+def fit_groups(groups, t, V0, price, n_groups):
+    """Least-squares (a, Vmin, rmse) for each of ``n_groups`` integer-coded groups"""
+    t = np.asarray(t, dtype=np.float64)
+    V0 = np.asarray(V0, dtype=np.float64)
+    price = np.asarray(price, dtype=np.float64)
+
+    # Coarse grid, evaluated for every group at once
+    best_sse = np.full(n_groups, np.inf)
+    best_k = np.zeros(n_groups, dtype=np.int64)
+    for k, a in enumerate(A_GRID):
+        sse, _ = _group_sse(np.full(n_groups, a), groups, t, V0, price, n_groups)
+        better = sse < best_sse
+        best_sse[better] = sse[better]
+        best_k[better] = k
+
+    # Golden-section search inside each group's bracketing grid cell pair
+    lo = A_GRID[np.maximum(best_k - 1, 0)]
+    hi = A_GRID[np.minimum(best_k + 1, len(A_GRID) - 1)]
+    x1 = hi - _INV_PHI * (hi - lo)
+    x2 = lo + _INV_PHI * (hi - lo)
+    f1, _ = _group_sse(x1, groups, t, V0, price, n_groups)
+    f2, _ = _group_sse(x2, groups, t, V0, price, n_groups)
+    for _ in range(GOLDEN_ITERATIONS):
+        left = f1 < f2
+        hi = np.where(left, x2, hi)
+        lo = np.where(left, lo, x1)
+        x2_new = np.where(left, x1, lo + _INV_PHI * (hi - lo))
+        x1_new = np.where(left, hi - _INV_PHI * (hi - lo), x2)
+        f_new, _ = _group_sse(np.where(left, x1_new, x2_new), groups, t, V0, price, n_groups)
+        f1, f2 = np.where(left, f_new, f2), np.where(left, f1, f_new)
+        x1, x2 = x1_new, x2_new
+
+    a = (lo + hi) / 2
+    sse, vmin = _group_sse(a, groups, t, V0, price, n_groups)
+    counts = np.bincount(groups, minlength=n_groups)
+    rmse = np.sqrt(np.maximum(sse, 0) / np.maximum(counts, 1))
+    return a, vmin, rmse, counts
+
+
+def calibrate(df, min_listings=MIN_LISTINGS):
+    """Fit parameters per make/model, make and tier; returns the lookup table dict"""
+    import pandas as pd
+    from estimator import get_car_tier
+
+    keys = {
+        'make_model': df['make'].astype(str) + '|' + df['model'].astype(str),
+        'make': df['make'].astype(str),
+        'tier': df['make'].astype(str).map(get_car_tier),
+    }
+    table = {'version': 1, 'default': [DECAY_RATE, VALUE_FLOOR]}
+    for level, labels in keys.items():
+        codes, uniques = pd.factorize(labels)
+        a, vmin, rmse, counts = fit_groups(codes, df['elapsed'], df['msrp'], df['price'], len(uniques))
+        table[level] = {
+            label: [round(float(a[g]), 6), round(float(vmin[g]), 2), int(counts[g]), round(float(rmse[g]), 2)]
+            for g, label in enumerate(uniques) if counts[g] >= min_listings
+        }
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Fit depreciation parameters from historical listings')
+    parser.add_argument('listings', help='CSV of historical listings')
+    parser.add_argument('-o', '--output', default=PARAMS_PATH, help='lookup table to write')
+    parser.add_argument('--min-listings', type=int, default=MIN_LISTINGS,
+                        help='smallest group that gets its own parameters')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    df = load_listings(args.listings)
+    table = calibrate(df, args.min_listings)
+    with open(args.output, 'w') as f:
+        json.dump(table, f, separators=(',', ':'))
+    elapsed = time.perf_counter() - start
+    print(f"Calibrated {len(table['make_model'])} models, {len(table['make'])} makes and "
+          f"{len(table['tier'])} tiers from {len(df):,} listings in {elapsed:.1f}s -> {args.output}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Plotly figures built straight from forecast arrays.
+
+Figures take ForecastResult / ForecastBatch arrays rather than display tables.
+Costs are sent as whole dollars on a shared integer year axis, which keeps the
+trace payload small even for 30-year, multi-vehicle charts. Every view a chart
+offers is already in the figure: legend clicks hide and show series, and the
+buttons above a chart switch between views by toggling trace visibility in the
+browser, so neither causes a Streamlit rerun or a new forecast.
+
+plotly is only imported when a figure is built.
+"""
+import numpy as np
+
+from estimator import REGISTRATION_FEE
+
+# Cost components in stacking order: (label, ForecastResult field or None for registration)
+BREAKDOWN_COMPONENTS = (
+    ('Maintenance', 'maintenance'),
+    ('Fuel/Electricity', 'fuel'),
+    ('Registration', None),
+    ('Loan', 'loan'),
+    ('Insurance', 'insurance'),
+)
+EV_COLOR = '#2ca02c'
+ICE_COLOR = '#d62728'
+
+
+def _dollars(values):
+    """Whole-dollar ints, the compact form costs are sent to the browser in"""
+    return np.round(values).astype(np.int64).tolist()
+
+
+def _year_axis(years, start_year):
+    return list(range(start_year + 1, start_year + years + 1))
+
+
+def _view_buttons(views):
+    """updatemenus buttons switching between ``{label: visible flags}`` views client-side"""
+    return [dict(
+        type='buttons', direction='right', x=0, y=1.15, xanchor='left', yanchor='bottom', showactive=True,
+        buttons=[dict(label=label, method='restyle', args=[{'visible': visible}])
+                 for label, visible in views.items()],
+    )]
+
+
+def ownership_cost(result):
+    """Annual ownership cost as the app totals it: the forecast total plus insurance"""
+    return result.total + result.insurance
+
+
+def cost_breakdown_figure(result, start_year):
+    """Stacked annual cost components, with an Annual / Cumulative switch"""
+    import plotly.graph_objects as go
+    x = _year_axis(result.years, start_year)
+    components = [(label, np.full(result.years, float(REGISTRATION_FEE)) if field is None
+                   else getattr(result, field)) for label, field in BREAKDOWN_COMPONENTS]
+    fig = go.Figure()
+    for view, transform in (('Annual', lambda v: v), ('Cumulative', np.cumsum)):
+        for label, values in components:
+            fig.add_trace(go.Bar(
+                x=x, y=_dollars(transform(values)), name=label, legendgroup=label,
+                visible=view == 'Annual', showlegend=view == 'Annual',
+                hovertemplate=f"{label}: $%{{y:,}}<extra>{view}</extra>",
+            ))
+    n = len(components)
+    fig.update_layout(
+        barmode='stack', hovermode='x unified', yaxis_tickprefix='$', yaxis_tickformat=',',
+        legend_orientation='h', margin=dict(t=60),
+        updatemenus=_view_buttons({'Annual': [True] * n + [False] * n, 'Cumulative': [False] * n + [True] * n}),
+    )
+    return fig
+
+
+def value_cost_figure(result, start_year):
+    """Car value, cumulative ownership cost and annual maintenance, with the point
+    where maintenance first exceeds the car's value marked"""
+    import plotly.graph_objects as go
+    x = _year_axis(result.years, start_year)
+    fig = go.Figure()
+    for label, values, dash in (
+        ('Car Value', result.value, None),
+        ('Cumulative Cost', np.cumsum(ownership_cost(result)), None),
+        ('Annual Maintenance', result.maintenance, 'dot'),
+    ):
+        fig.add_trace(go.Scatter(x=x, y=_dollars(values), name=label, mode='lines', line_dash=dash,
+                                 hovertemplate=f"{label}: $%{{y:,}}<extra></extra>"))
+    if result.intersection is not None:
+        i = result.intersection
+        fig.add_trace(go.Scatter(
+            x=[x[i]], y=_dollars(result.maintenance[i:i + 1]), name='Maintenance > Value', mode='markers',
+            marker=dict(size=12, symbol='x', color='black'),
+            hovertemplate="Maintenance exceeds value: $%{y:,}<extra></extra>",
+        ))
+        fig.add_vline(x=x[i], line_dash='dash', line_color='gray')
+    fig.update_layout(hovermode='x unified', yaxis_tickprefix='$', yaxis_tickformat=',',
+                      legend_orientation='h')
+    return fig
+
+
+def comparison_figure(labels, results, start_year):
+    """Cumulative ownership cost of several vehicles (ForecastResults, or a ForecastBatch),
+    EVs in green and gas vehicles in red, with All / EVs / Gas views"""
+    import plotly.graph_objects as go
+    results = list(results)
+    x = _year_axis(results[0].years, start_year)
+    fig = go.Figure()
+    for label, result in zip(labels, results):
+        fig.add_trace(go.Scatter(
+            x=x, y=_dollars(np.cumsum(ownership_cost(result))), name=label, mode='lines',
+            line=dict(color=EV_COLOR if result.is_ev else ICE_COLOR, dash=None if result.is_ev else 'dash'),
+            hovertemplate=f"{label}: $%{{y:,}}<extra></extra>",
+        ))
+    ev = [bool(result.is_ev) for result in results]
+    fig.update_layout(
+        hovermode='x unified', yaxis_tickprefix='$', yaxis_tickformat=',', yaxis_title='Cumulative cost',
+        legend_orientation='h', margin=dict(t=60),
+        updatemenus=_view_buttons({'All': [True] * len(ev), 'EVs': ev, 'Gas': [not e for e in ev]}),
+    )
+    return fig
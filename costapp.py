@@ -1,876 +1,260 @@
 import streamlit as st
-import pickle
 import pandas as pd
-import numpy as np
-import math
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import plotly.graph_objects as go
 
-# ─── Tier multipliers ──────────────────────────────────────────────────────────
-tier_multipliers = {
-    'Luxury':   1.2,
-    'Midrange': 1.0,
-    'Economy':  0.8
-}
-
-# ─── Load model and encoders ────────────────────────────────────────────────────
-with open('car_maintenance_model.pkl', 'rb') as f:
-    trained_model = pickle.load(f)
-with open('le_make.pkl', 'rb') as f:
-    le_make = pickle.load(f)
-with open('le_model.pkl', 'rb') as f:
-    le_model = pickle.load(f)
-
-# ─── MSRP and Edmunds ratings ──────────────────────────────────────────────────
-msrp_data = {
-    ('Acura','MDX'):51000,('Acura','RDX'):41000,('Acura','TLX'):39000,('Acura','ILX'):31000,('Acura','NSX'):157000,
-    ('BMW','X1'):39000,('BMW','X3'):46000,('BMW','X5'):61000,('BMW','X7'):74000,
-    ('Chevrolet','Malibu'):26000,('Chevrolet','Tahoe'):54000,('Chevrolet','Silverado'):47000,
-    ('Ford','F-150'):35000,('Ford','Mustang'):31000,('Ford','Escape'):27000,
-    ('Honda','Civic'):23000,('Honda','Accord'):28000,('Honda','CR-V'):29000,
-    ('Hyundai','Elantra'):20000,('Hyundai','Sonata'):25000,('Hyundai','Tucson'):27000,
-    ('Kia','Optima'):24000,('Kia','Soul'):21000,('Kia','Sportage'):26000,
-    ('Lexus','ES'):42000,('Lexus','RX'):50000,('Lexus','NX'):42000,
-    ('Mazda','3'):22000,('Mazda','6'):25000,('Mazda','CX-5'):28000,
-    ('Mercedes-Benz','C-Class'):44000,('Mercedes-Benz','E-Class'):56000,('Mercedes-Benz','GLC'):49000,
-    ('Mini','Cooper'):25000,('Mini','Countryman'):32000,
-    ('Nissan','Altima'):25000,('Nissan','Sentra'):21000,('Nissan','Rogue'):28000,
-    ('Porsche','911'):105000,('Porsche','Cayenne'):79000,
-    ('Subaru','Impreza'):21000,('Subaru','Outback'):28000,('Subaru','Forester'):27000,
-    ('Toyota','Camry'):27000,('Toyota','Corolla'):21000,('Toyota','RAV4'):29000,
-    ('Volvo','XC60'):48000,('Volvo','XC90'):56000
-}
-
-# Vehicle ratings from accessible free sources (NHTSA, IIHS, Consumer Reports public data)
-vehicle_ratings = {
-    ('Acura','MDX'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA safety, IIHS Top Safety Pick, reliable luxury SUV'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Maintained excellent safety ratings, refreshed design'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced to Top Safety Pick+, improved LED headlights'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued safety excellence, technology updates'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained top-tier safety performance'}
-    },
-    ('BMW','X1'):{
-        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating, solid IIHS performance'},
-        2021:{'nhtsa':5,'iihs':'Good','desc':'Consistent safety performance, tech updates'},
-        2022:{'nhtsa':5,'iihs':'Good','desc':'Final year of generation, maintained quality'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'All-new generation, improved to TSP status'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Refined safety systems, enhanced features'}
-    },
-    ('BMW','X3'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Excellent safety across all categories'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced headlight performance for TSP+'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained premium safety standards'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued excellence in luxury SUV safety'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Industry-leading safety performance'}
-    },
-    ('Honda','Civic'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA, TSP award, excellent reliability'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced Honda Sensing safety suite'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'All-new generation achieves TSP+ status'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained top safety performance'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued compact car safety leadership'}
-    },
-    ('Honda','Accord'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA rating, TSP award'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Consistent midsize sedan safety excellence'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced to TSP+ with improved lighting'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Refreshed design maintains TSP+ status'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Industry-leading midsize sedan safety'}
-    },
-    ('Honda','CR-V'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Popular compact SUV with excellent safety'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Maintained TSP status with special editions'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Updated styling retains safety excellence'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'All-new generation achieves TSP+ award'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced safety tech and efficiency'}
-    },
-    ('Toyota','Camry'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA rating, reliable midsize sedan'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced Toyota Safety Sense 2.0'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Improved to TSP+ with lighting upgrades'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained TSP+ with consistent quality'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced safety tech and reliability'}
-    },
-    ('Toyota','Corolla'):{
-        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating, excellent reliability'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced to TSP with improved safety tech'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Maintained TSP status with updates'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Continued compact car safety leadership'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Refined Toyota Safety Sense features'}
-    },
-    ('Toyota','RAV4'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Popular compact SUV with standard AWD'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Prime PHEV variant maintains TSP status'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced to TSP+ with improved lighting'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued compact SUV safety leadership'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Refreshed design maintains TSP+ award'}
-    },
-    ('Ford','F-150'):{
-        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating, America\'s best-selling truck'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'All-new generation with enhanced safety tech'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Lightning EV variant maintains safety excellence'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Continued truck safety leadership'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Advanced driver assistance systems'}
-    },
-    ('Chevrolet','Malibu'):{
-        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star overall NHTSA rating, good IIHS scores'},
-        2021:{'nhtsa':5,'iihs':'Good','desc':'Maintained safety performance, updated features'},
-        2022:{'nhtsa':5,'iihs':'Good','desc':'Consistent midsize sedan safety'},
-        2023:{'nhtsa':5,'iihs':'Good','desc':'Final production year, maintained standards'},
-        2024:{'nhtsa':None,'iihs':None,'desc':'Model discontinued'}
-    },
-    ('Nissan','Altima'):{
-        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating with ProPILOT Assist'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced to TSP with improved safety tech'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Refreshed design maintains TSP status'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced Safety Shield 360 technology'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Continued midsize sedan safety leadership'}
-    },
-    ('Subaru','Outback'):{
-        2020:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'All-new generation with TSP+ award'},
-        2021:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced EyeSight driver assistance'},
-        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Wilderness variant maintains TSP+ status'},
-        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued adventure vehicle safety excellence'},
-        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Refined EyeSight and safety systems'}
-    }
-}
-
-# ─── Fuel requirements by make/model ────────────────────────────────────────────
-fuel_requirements = {
-    'Acura': {'MDX': 'premium', 'RDX': 'premium', 'TLX': 'premium', 'ILX': 'regular', 'NSX': 'premium'},
-    'BMW': {'X1': 'premium', 'X3': 'premium', 'X5': 'premium', 'X7': 'premium', 
-            'M3': 'premium', 'M4': 'premium', 'M5': 'premium', 'M8': 'premium',
-            '328i': 'premium', '530i': 'premium', '750i': 'premium', 'i4': 'electric', 'iX': 'electric'},
-    'Chevrolet': {'Malibu': 'regular', 'Tahoe': 'regular', 'Silverado': 'regular', 'Equinox': 'regular'},
-    'Ford': {'F-150': 'regular', 'Mustang': 'premium', 'Escape': 'regular'},
-    'Honda': {'Civic': 'regular', 'Accord': 'regular', 'CR-V': 'regular'},
-    'Hyundai': {'Elantra': 'regular', 'Sonata': 'regular', 'Tucson': 'regular'},
-    'Kia': {'Optima': 'regular', 'Soul': 'regular', 'Sportage': 'regular'},
-    'Lexus': {'ES': 'premium', 'RX': 'premium', 'NX': 'premium'},
-    'Mazda': {'3': 'regular', '6': 'regular', 'CX-5': 'regular'},
-    'Mercedes-Benz': {'C-Class': 'premium', 'E-Class': 'premium', 'GLC': 'premium'},
-    'Mini': {'Cooper': 'premium', 'Countryman': 'premium'},
-    'Nissan': {'Altima': 'regular', 'Sentra': 'regular', 'Rogue': 'regular'},
-    'Porsche': {'911': 'premium', 'Cayenne': 'premium'},
-    'Subaru': {'Impreza': 'regular', 'Outback': 'regular', 'Forester': 'regular'},
-    'Toyota': {'Camry': 'regular', 'Corolla': 'regular', 'RAV4': 'regular'},
-    'Volvo': {'XC60': 'premium', 'XC90': 'premium'},
-    'Tesla': {'Model 3': 'electric', 'Model S': 'electric', 'Model X': 'electric', 'Model Y': 'electric'}
-}
-
-# ─── State fuel prices (regular/premium) ───────────────────────────────────────
-state_fuel_prices = {
-    'Alabama': {'regular': 3.20, 'premium': 3.90}, 'Alaska': {'regular': 3.80, 'premium': 4.50},
-    'Arizona': {'regular': 3.45, 'premium': 4.15}, 'Arkansas': {'regular': 3.15, 'premium': 3.85},
-    'California': {'regular': 4.85, 'premium': 5.55}, 'Colorado': {'regular': 3.40, 'premium': 4.10},
-    'Connecticut': {'regular': 3.65, 'premium': 4.35}, 'Delaware': {'regular': 3.35, 'premium': 4.05},
-    'Florida': {'regular': 3.30, 'premium': 4.00}, 'Georgia': {'regular': 3.25, 'premium': 3.95},
-    'Hawaii': {'regular': 4.20, 'premium': 4.90}, 'Idaho': {'regular': 3.55, 'premium': 4.25},
-    'Illinois': {'regular': 3.75, 'premium': 4.45}, 'Indiana': {'regular': 3.35, 'premium': 4.05},
-    'Iowa': {'regular': 3.25, 'premium': 3.95}, 'Kansas': {'regular': 3.20, 'premium': 3.90},
-    'Kentucky': {'regular': 3.30, 'premium': 4.00}, 'Louisiana': {'regular': 3.10, 'premium': 3.80},
-    'Maine': {'regular': 3.50, 'premium': 4.20}, 'Maryland': {'regular': 3.55, 'premium': 4.25},
-    'Massachusetts': {'regular': 3.70, 'premium': 4.40}, 'Michigan': {'regular': 3.45, 'premium': 4.15},
-    'Minnesota': {'regular': 3.40, 'premium': 4.10}, 'Mississippi': {'regular': 3.05, 'premium': 3.75},
-    'Missouri': {'regular': 3.15, 'premium': 3.85}, 'Montana': {'regular': 3.60, 'premium': 4.30},
-    'Nebraska': {'regular': 3.25, 'premium': 3.95}, 'Nevada': {'regular': 3.85, 'premium': 4.55},
-    'New Hampshire': {'regular': 3.45, 'premium': 4.15}, 'New Jersey': {'regular': 3.50, 'premium': 4.20},
-    'New Mexico': {'regular': 3.35, 'premium': 4.05}, 'New York': {'regular': 3.75, 'premium': 4.45},
-    'North Carolina': {'regular': 3.25, 'premium': 3.95}, 'North Dakota': {'regular': 3.30, 'premium': 4.00},
-    'Ohio': {'regular': 3.40, 'premium': 4.10}, 'Oklahoma': {'regular': 3.10, 'premium': 3.80},
-    'Oregon': {'regular': 3.85, 'premium': 4.55}, 'Pennsylvania': {'regular': 3.65, 'premium': 4.35},
-    'Rhode Island': {'regular': 3.60, 'premium': 4.30}, 'South Carolina': {'regular': 3.20, 'premium': 3.90},
-    'South Dakota': {'regular': 3.25, 'premium': 3.95}, 'Tennessee': {'regular': 3.15, 'premium': 3.85},
-    'Texas': {'regular': 3.00, 'premium': 3.70}, 'Utah': {'regular': 3.55, 'premium': 4.25},
-    'Vermont': {'regular': 3.65, 'premium': 4.35}, 'Virginia': {'regular': 3.35, 'premium': 4.05},
-    'Washington': {'regular': 4.10, 'premium': 4.80}, 'West Virginia': {'regular': 3.40, 'premium': 4.10},
-    'Wisconsin': {'regular': 3.35, 'premium': 4.05}, 'Wyoming': {'regular': 3.45, 'premium': 4.15}
-}
-
-# ─── Lookup tables ─────────────────────────────────────────────────────────────
-car_makes_and_models = {
-    'Acura': ['MDX', 'RDX', 'TLX', 'ILX', 'NSX'],
-    'Alfa Romeo': ['Giulia', 'Stelvio', '4C'],
-    'Audi': ['A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'Q3', 'Q5', 'Q7', 'Q8', 'Q5 Sportback', 'S4', 'RS7'],
-    'BMW': ['X1', 'X3', 'X5', 'X7', 'M3', 'M4', 'M5', 'M8', '328i', '530i', '750i', 'i4', 'iX'],
-    'Buick': ['Enclave', 'Encore', 'LaCrosse', 'Regal', 'Envision'],
-    'Cadillac': ['Escalade', 'XT5', 'CTS', 'ATS', 'CT4', 'CT5', 'XT4', 'SRX'],
-    'Chevrolet': ['Equinox', 'Malibu', 'Silverado 1500', 'Traverse', 'Tahoe', 'Impala', 'Colorado', 'Suburban', 'Spark', 'Silverado'],
-    'Chrysler': ['Pacifica', 'Voyager', '300'],
-    'Dodge': ['Charger', 'Durango', 'Ram 1500', 'Challenger', 'Grand Caravan'],
-    'Fiat': ['500', '500X', '124 Spider'],
-    'Ford': ['F-150', 'Mustang', 'Explorer', 'Escape', 'Bronco', 'Edge', 'Ranger', 'Fusion', 'Expedition'],
-    'GMC': ['Sierra 1500', 'Yukon', 'Canyon', 'Acadia', 'Terrain'],
-    'Honda': ['Civic', 'Accord', 'CR-V', 'Pilot', 'Odyssey', 'Ridgeline', 'Insight'],
-    'Hyundai': ['Elantra', 'Sonata', 'Tucson', 'Santa Fe', 'Kona', 'Palisade', 'Veloster'],
-    'Infiniti': ['Q50', 'Q60', 'QX60', 'QX80', 'QX50'],
-    'Jaguar': ['F-PACE', 'XE', 'XJ', 'F-TYPE'],
-    'Jeep': ['Grand Cherokee', 'Wrangler', 'Cherokee', 'Compass', 'Renegade'],
-    'Kia': ['Sorento', 'Optima', 'Stinger', 'Sportage', 'Telluride', 'Seltos', 'Niro', 'Soul'],
-    'Lexus': ['RX', 'ES', 'NX', 'GX', 'LX', 'IS', 'LS', 'UX'],
-    'Lincoln': ['Navigator', 'MKX', 'Corsair', 'MKZ'],
-    'Mazda': ['CX-5', 'Mazda 3', 'Mazda 6', 'MX-5 Miata', 'CX-9'],
-    'McLaren': ['720S', '570S', 'GT', '765LT'],
-    'Mercedes-Benz': ['C-Class', 'E-Class', 'GLC', 'S-Class', 'GLS', 'A-Class', 'CLA', 'G-Class', 'AMG GT'],
-    'Mini': ['Cooper', 'Countryman', 'Clubman'],
-    'Mitsubishi': ['Outlander', 'Eclipse Cross', 'Mirage'],
-    'Nissan': ['Altima', 'Maxima', 'Sentra', 'Murano', 'Rogue', 'Titan', '370Z'],
-    'Porsche': ['911', 'Macan', 'Cayenne', 'Panamera', 'Taycan'],
-    'Ram': ['1500', '2500', '3500', 'ProMaster'],
-    'Subaru': ['Outback', 'Forester', 'Impreza', 'Crosstrek', 'Legacy'],
-    'Tesla': ['Model 3', 'Model S', 'Model X', 'Model Y'],
-    'Toyota': ['Camry', 'Corolla', 'RAV4', 'Highlander', 'Tacoma', 'Tundra', 'Land Cruiser', 'Sequoia'],
-    'Volkswagen': ['Passat', 'Jetta', 'Tiguan', 'Atlas', 'Golf'],
-    'Volvo': ['XC90', 'XC60', 'S60', 'V90', 'XC40']
-}
-
-# ─── Vehicle Lifespan Data ─────────────────────────────────────────────────────
-# Expected vehicle lifespan in years based on make/model reliability data
-vehicle_lifespan = {
-    'Toyota': {'default': 20, 'Camry': 22, 'Corolla': 25, 'RAV4': 20, 'Highlander': 18, 'Tacoma': 25, 'Tundra': 22, 'Land Cruiser': 30, 'Sequoia': 20},
-    'Honda': {'default': 20, 'Civic': 22, 'Accord': 20, 'CR-V': 18, 'Pilot': 17, 'Odyssey': 16, 'Ridgeline': 20, 'Insight': 18},
-    'Lexus': {'default': 18, 'ES': 20, 'RX': 18, 'NX': 16, 'GX': 22, 'LX': 25, 'IS': 18, 'LS': 20, 'UX': 16},
-    'Acura': {'default': 16, 'MDX': 16, 'RDX': 15, 'TLX': 16, 'ILX': 16, 'NSX': 12},
-    'Subaru': {'default': 18, 'Outback': 20, 'Forester': 18, 'Impreza': 18, 'Crosstrek': 17, 'Legacy': 18},
-    'Mazda': {'default': 16, '3': 16, '6': 16, 'CX-5': 15, 'Mazda3': 16, 'Mazda6': 16, 'MX-5 Miata': 18, 'CX-9': 15},
-    'Nissan': {'default': 15, 'Altima': 15, 'Sentra': 14, 'Rogue': 14, 'Maxima': 16, 'Murano': 15, 'Titan': 18, '370Z': 14},
-    'Hyundai': {'default': 14, 'Elantra': 14, 'Sonata': 15, 'Tucson': 13, 'Santa Fe': 14, 'Kona': 12, 'Palisade': 14, 'Veloster': 12},
-    'Kia': {'default': 14, 'Optima': 14, 'Soul': 13, 'Sportage': 13, 'Sorento': 14, 'Stinger': 12, 'Telluride': 14, 'Seltos': 12, 'Niro': 14},
-    'Ford': {'default': 14, 'F-150': 18, 'Mustang': 15, 'Escape': 13, 'Explorer': 14, 'Bronco': 16, 'Edge': 13, 'Ranger': 16, 'Fusion': 14, 'Expedition': 16},
-    'Chevrolet': {'default': 13, 'Malibu': 13, 'Tahoe': 16, 'Silverado': 18, 'Equinox': 12, 'Silverado 1500': 18, 'Traverse': 13, 'Impala': 14, 'Colorado': 16, 'Suburban': 18, 'Spark': 10},
-    'GMC': {'default': 14, 'Sierra 1500': 18, 'Yukon': 16, 'Canyon': 16, 'Acadia': 13, 'Terrain': 12},
-    'BMW': {'default': 12, 'X1': 12, 'X3': 13, 'X5': 14, 'X7': 12, 'M3': 10, 'M4': 10, 'M5': 10, 'M8': 10, '328i': 12, '530i': 13, '750i': 12, 'i4': 15, 'iX': 15},
-    'Mercedes-Benz': {'default': 12, 'C-Class': 12, 'E-Class': 13, 'GLC': 12, 'S-Class': 14, 'GLS': 13, 'A-Class': 11, 'CLA': 11, 'G-Class': 20, 'AMG GT': 10},
-    'Audi': {'default': 12, 'A3': 11, 'A4': 12, 'A5': 12, 'A6': 13, 'A7': 12, 'A8': 13, 'Q3': 11, 'Q5': 12, 'Q7': 13, 'Q8': 12, 'Q5 Sportback': 12, 'S4': 10, 'RS7': 10},
-    'Volvo': {'default': 14, 'XC90': 15, 'XC60': 14, 'S60': 13, 'V90': 14, 'XC40': 12},
-    'Mini': {'default': 11, 'Cooper': 11, 'Countryman': 12, 'Clubman': 11},
-    'Porsche': {'default': 12, '911': 15, 'Cayenne': 12, 'Macan': 11, 'Panamera': 12, 'Taycan': 15},
-    'Jaguar': {'default': 10, 'F-PACE': 10, 'XE': 9, 'XJ': 11, 'F-TYPE': 10},
-    'Tesla': {'default': 15, 'Model 3': 15, 'Model S': 16, 'Model X': 14, 'Model Y': 15},
-    'Jeep': {'default': 12, 'Grand Cherokee': 13, 'Wrangler': 15, 'Cherokee': 12, 'Compass': 11, 'Renegade': 10},
-    'Ram': {'default': 16, '1500': 16, '2500': 18, '3500': 20, 'ProMaster': 14},
-    'Cadillac': {'default': 11, 'Escalade': 13, 'XT5': 11, 'CTS': 12, 'ATS': 10, 'CT4': 11, 'CT5': 12, 'XT4': 10, 'SRX': 11},
-    'Lincoln': {'default': 12, 'Navigator': 13, 'MKX': 12, 'Corsair': 11, 'MKZ': 12},
-    'Infiniti': {'default': 12, 'Q50': 12, 'Q60': 11, 'QX60': 13, 'QX80': 14, 'QX50': 11},
-    'Buick': {'default': 13, 'Enclave': 13, 'Encore': 12, 'LaCrosse': 14, 'Regal': 13, 'Envision': 12},
-    'Chrysler': {'default': 11, 'Pacifica': 11, 'Voyager': 10, '300': 12},
-    'Dodge': {'default': 11, 'Charger': 12, 'Durango': 12, 'Ram 1500': 16, 'Challenger': 13, 'Grand Caravan': 10},
-    'Mitsubishi': {'default': 12, 'Outlander': 12, 'Eclipse Cross': 11, 'Mirage': 10},
-    'Volkswagen': {'default': 11, 'Passat': 11, 'Jetta': 12, 'Tiguan': 11, 'Atlas': 11, 'Golf': 12},
-    'Fiat': {'default': 8, '500': 8, '500X': 9, '124 Spider': 10},
-    'McLaren': {'default': 8, '720S': 8, '570S': 8, 'GT': 9, '765LT': 7},
-    'Alfa Romeo': {'default': 9, 'Giulia': 9, 'Stelvio': 10, '4C': 8}
-}
-
-def get_vehicle_lifespan(make, model):
-    """Get expected vehicle lifespan in years"""
-    make_data = vehicle_lifespan.get(make, {'default': 12})
-    return make_data.get(model, make_data.get('default', 12))
-
-def get_max_forecast_years(make, model, current_year, model_year):
-    """Calculate maximum realistic forecast years - now allows up to 30 years"""
-    vehicle_age = current_year - model_year
-    # Allow forecasting up to 30 years total, regardless of expected lifespan
-    max_possible_age = 30
-    remaining_years = max(1, max_possible_age - vehicle_age)
-    
-    return min(remaining_years, 30)
-
-# State electricity rates ($/kWh) for residential use
-state_electricity_rates = {
-    'Alabama': 0.1421, 'Alaska': 0.2298, 'Arizona': 0.1378, 'Arkansas': 0.1140,
-    'California': 0.2855, 'Colorado': 0.1378, 'Connecticut': 0.2406, 'Delaware': 0.1355,
-    'Florida': 0.1302, 'Georgia': 0.1268, 'Hawaii': 0.4018, 'Idaho': 0.1089,
-    'Illinois': 0.1371, 'Indiana': 0.1465, 'Iowa': 0.1421, 'Kansas': 0.1418,
-    'Kentucky': 0.1198, 'Louisiana': 0.1089, 'Maine': 0.1640, 'Maryland': 0.1421,
-    'Massachusetts': 0.2298, 'Michigan': 0.1640, 'Minnesota': 0.1421, 'Mississippi': 0.1235,
-    'Missouri': 0.1198, 'Montana': 0.1140, 'Nebraska': 0.1089, 'Nevada': 0.1235,
-    'New Hampshire': 0.1888, 'New Jersey': 0.1640, 'New Mexico': 0.1355, 'New York': 0.2051,
-    'North Carolina': 0.1198, 'North Dakota': 0.1089, 'Ohio': 0.1355, 'Oklahoma': 0.1235,
-    'Oregon': 0.1140, 'Pennsylvania': 0.1465, 'Rhode Island': 0.2051, 'South Carolina': 0.1355,
-    'South Dakota': 0.1198, 'Tennessee': 0.1198, 'Texas': 0.1235, 'Utah': 0.1140,
-    'Vermont': 0.1888, 'Virginia': 0.1235, 'Washington': 0.1037, 'West Virginia': 0.1198,
-    'Wisconsin': 0.1421, 'Wyoming': 0.1140
-}
-
-# EV charging efficiency and consumption data
-ev_charging_data = {
-    'Tesla': {
-        'Model 3': {
-            'battery_kwh': 75, 'efficiency_miles_per_kwh': 4.0, 'range_miles': 300,
-            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
-        },
-        'Model S': {
-            'battery_kwh': 100, 'efficiency_miles_per_kwh': 3.4, 'range_miles': 340,
-            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
-        },
-        'Model X': {
-            'battery_kwh': 100, 'efficiency_miles_per_kwh': 3.0, 'range_miles': 300,
-            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
-        },
-        'Model Y': {
-            'battery_kwh': 75, 'efficiency_miles_per_kwh': 3.7, 'range_miles': 280,
-            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
-        }
-    },
-    'BMW': {
-        'i4': {
-            'battery_kwh': 84, 'efficiency_miles_per_kwh': 3.5, 'range_miles': 294,
-            'home_charging_loss': 0.12, 'public_charging_loss': 0.18
-        },
-        'iX': {
-            'battery_kwh': 106, 'efficiency_miles_per_kwh': 2.8, 'range_miles': 297,
-            'home_charging_loss': 0.12, 'public_charging_loss': 0.18
-        }
-    },
-    'Porsche': {
-        'Taycan': {
-            'battery_kwh': 93, 'efficiency_miles_per_kwh': 2.4, 'range_miles': 223,
-            'home_charging_loss': 0.12, 'public_charging_loss': 0.18
-        }
-    }
-}
-
-# Time-of-use electricity rates for EV optimization ($/kWh)
-time_of_use_rates = {
-    'California': {'peak': 0.52, 'off_peak': 0.16, 'ev_rate': 0.13},
-    'Texas': {'peak': 0.18, 'off_peak': 0.08, 'ev_rate': 0.10},
-    'Florida': {'peak': 0.16, 'off_peak': 0.09, 'ev_rate': 0.11},
-    'New York': {'peak': 0.28, 'off_peak': 0.12, 'ev_rate': 0.14},
-    'Illinois': {'peak': 0.19, 'off_peak': 0.08, 'ev_rate': 0.10},
-    'Arizona': {'peak': 0.20, 'off_peak': 0.08, 'ev_rate': 0.09},
-    'Washington': {'peak': 0.14, 'off_peak': 0.06, 'ev_rate': 0.07},
-    'Massachusetts': {'peak': 0.32, 'off_peak': 0.14, 'ev_rate': 0.16},
-    'Colorado': {'peak': 0.18, 'off_peak': 0.08, 'ev_rate': 0.10},
-    'Georgia': {'peak': 0.16, 'off_peak': 0.08, 'ev_rate': 0.09}
-}
-
-# ─── Vehicle MPG/Efficiency Data ───────────────────────────────────────────────
-average_mpg = {
-    'Acura': {
-        'MDX': 22, 'RDX': 23, 'TLX': 24, 'ILX': 25, 'NSX': 21
-    },
-    'BMW': {
-        'X1': 28, 'X3': 25, 'X5': 22, 'X7': 21,
-        'M3': 20, 'M4': 19, 'M5': 18, 'M8': 17,
-        '328i': 30, '530i': 29, '750i': 22,
-        'i4': 103, 'iX': 80
-    },
-    'Chevrolet': {
-        'Malibu': 29, 'Tahoe': 20, 'Silverado': 23,
-        'Equinox': 26, 'Silverado 1500': 20, 'Traverse': 22,
-        'Impala': 19, 'Colorado': 20, 'Suburban': 19, 'Spark': 30
-    },
-    'Ford': {
-        'F-150': 20, 'Mustang': 24, 'Escape': 27,
-        'Explorer': 24, 'Bronco': 21, 'Edge': 24,
-        'Ranger': 23, 'Fusion': 25, 'Expedition': 17
-    },
-    'Honda': {
-        'Civic': 32, 'Accord': 30, 'CR-V': 29,
-        'Pilot': 22, 'Odyssey': 28, 'Ridgeline': 21, 'Insight': 52
-    },
-    'Hyundai': {
-        'Elantra': 33, 'Sonata': 31, 'Tucson': 26,
-        'Santa Fe': 25, 'Kona': 28, 'Palisade': 22, 'Veloster': 28
-    },
-    'Kia': {
-        'Optima': 27, 'Soul': 28, 'Sportage': 26,
-        'Sorento': 25, 'Stinger': 22, 'Telluride': 21, 'Seltos': 29, 'Niro': 50
-    },
-    'Lexus': {
-        'ES': 26, 'RX': 23, 'NX': 25,
-        'GX': 16, 'LX': 16, 'IS': 26, 'LS': 23, 'UX': 29
-    },
-    'Mazda': {
-        '3': 28, '6': 26, 'CX-5': 25,
-        'Mazda3': 28, 'Mazda6': 26, 'MX-5 Miata': 26, 'CX-9': 22
-    },
-    'Mercedes-Benz': {
-        'C-Class': 25, 'E-Class': 24, 'GLC': 24,
-        'S-Class': 21, 'GLS': 19, 'A-Class': 30, 'CLA': 27, 'G-Class': 13, 'AMG GT': 18
-    },
-    'Mini': {
-        'Cooper': 29, 'Countryman': 27, 'Clubman': 27
-    },
-    'Nissan': {
-        'Altima': 32, 'Sentra': 29, 'Rogue': 28,
-        'Maxima': 23, 'Murano': 25, 'Titan': 18, '370Z': 19
-    },
-    'Porsche': {
-        '911': 22, 'Cayenne': 22,
-        'Macan': 21, 'Panamera': 22, 'Taycan': 72
-    },
-    'Subaru': {
-        'Impreza': 31, 'Outback': 29, 'Forester': 28,
-        'Crosstrek': 28, 'Legacy': 29
-    },
-    'Toyota': {
-        'Camry': 32, 'Corolla': 33, 'RAV4': 28,
-        'Highlander': 24, 'Tacoma': 20, 'Tundra': 17, 'Land Cruiser': 14, 'Sequoia': 17
-    },
-    'Volvo': {
-        'XC60': 24, 'XC90': 21, 'S60': 26, 'V90': 25, 'XC40': 28
-    },
-    'Tesla': {'Model 3': 120, 'Model S': 102, 'Model X': 90, 'Model Y': 112},
-}
-
-# ─── Maintenance Schedules & Costs ─────────────────────────────────────────────
-
-# Regular ICE maintenance schedule
-maintenance_schedule = {
-    'Oil Change':5000,'Tire Rotation':7500,'Cabin Air Filter Replacement':15000,
-    'Brake Inspection':20000,'Coolant Flush':30000,'Battery Check':30000,
-    'Brake Pad Replacement':40000,'Transmission Fluid Replacement':60000,
-    'Spark Plug Replacement':80000,'Alternator Inspection':90000,
-    'Timing Belt Replacement':100000,'Wheel Bearings Check':110000,
-    'AC System Service':120000,'Head Gasket Inspection':130000,
-    'Major Overhaul Recommended':150000
-}
-
-# Electric vehicle maintenance schedule
-ev_maintenance_schedule = {
-    'Tire Rotation':7500,'Cabin Air Filter Replacement':15000,
-    'Brake Inspection':25000,'Battery Coolant Check':30000,'12V Battery Check':30000,
-    'Brake Pad Replacement':60000,'Drive Unit Service':60000,
-    'HVAC Filter Replacement':24000,'Wheel Bearings Check':100000,
-    'AC System Service':120000,'Battery Health Check':100000
-}
-
-# Enhanced maintenance costs with labor/parts breakdown
-maintenance_costs = {
-    # Regular maintenance
-    'Oil Change': {'labor': 25, 'parts': 35, 'total': 60},
-    'Tire Rotation': {'labor': 25, 'parts': 0, 'total': 25},
-    'Cabin Air Filter Replacement': {'labor': 20, 'parts': 25, 'total': 45},
-    'Brake Inspection': {'labor': 40, 'parts': 0, 'total': 40},
-    'Coolant Flush': {'labor': 60, 'parts': 40, 'total': 100},
-    '12V Battery Check': {'labor': 20, 'parts': 0, 'total': 20},
-    'Battery Check': {'labor': 30, 'parts': 0, 'total': 30},
-    'Brake Pad Replacement': {'labor': 80, 'parts': 120, 'total': 200},
-    'Transmission Fluid Replacement': {'labor': 75, 'parts': 85, 'total': 160},
-    'Spark Plug Replacement': {'labor': 60, 'parts': 80, 'total': 140},
-    'Alternator Inspection': {'labor': 60, 'parts': 0, 'total': 60},
-    'Timing Belt Replacement': {'labor': 450, 'parts': 350, 'total': 800},
-    'Wheel Bearings Check': {'labor': 100, 'parts': 0, 'total': 100},
-    'AC System Service': {'labor': 90, 'parts': 60, 'total': 150},
-    'Head Gasket Inspection': {'labor': 200, 'parts': 0, 'total': 200},
-    'Major Overhaul Recommended': {'labor': 2000, 'parts': 1500, 'total': 3500},
-    
-    # EV-specific maintenance
-    'Battery Coolant Check': {'labor': 40, 'parts': 20, 'total': 60},
-    'Drive Unit Service': {'labor': 120, 'parts': 80, 'total': 200},
-    'HVAC Filter Replacement': {'labor': 30, 'parts': 40, 'total': 70},
-    'Battery Health Check': {'labor': 80, 'parts': 0, 'total': 80},
-    
-    # Age-related maintenance (appears in older vehicles)
-    'Transmission Service': {'labor': 150, 'parts': 150, 'total': 300},
-    'Suspension Check': {'labor': 100, 'parts': 50, 'total': 150},
-    'Engine Mount Replacement': {'labor': 400, 'parts': 400, 'total': 800},
-    'CV Joint Replacement': {'labor': 300, 'parts': 250, 'total': 550},
-    'Power Steering Service': {'labor': 80, 'parts': 70, 'total': 150},
-    'Radiator Replacement': {'labor': 200, 'parts': 300, 'total': 500},
-    'Catalytic Converter Replacement': {'labor': 150, 'parts': 800, 'total': 950},
-    
-    # Extreme aging maintenance (beyond expected lifespan)
-    'Battery Pack Degradation Service': {'labor': 500, 'parts': 1500, 'total': 2000},
-    'Drive Unit Overhaul': {'labor': 800, 'parts': 1200, 'total': 2000},
-    'Engine Overhaul': {'labor': 2000, 'parts': 3000, 'total': 5000},
-    'Transmission Rebuild': {'labor': 1500, 'parts': 2000, 'total': 3500}
+from reference_data import (
+    msrp_data, vehicle_ratings, fuel_requirements, state_fuel_prices,
+    car_makes_and_models, state_electricity_rates, time_of_use_rates,
+    average_mpg, state_cost_multipliers
+)
+from estimator import (
+    get_vehicle_lifespan, get_max_forecast_years, is_electric_vehicle,
+    get_ev_charging_info, get_car_tier, get_fuel_price, model_fingerprint
+)
+from amortization import max_principal, monthly_payment
+from battery import battery_curves
+from charts import comparison_figure, cost_breakdown_figure, value_cost_figure
+from ev_costs import charging_scenarios
+from forecast_store import default_store, stored_forecast
+from household import forecast_household
+import metrics
+from profiling import record as record_span, span
+from tou_charging import CHARGING_PROFILES, PEAK_END, PEAK_START, PROFILE_LABELS, simulate_charging
+
+# ─── Caching ───────────────────────────────────────────────────────────────────
+# Forecasts are keyed on every input and on the fingerprint of the model and
+# reference tables that computed them, so a cached forecast always matches the
+# loaded model; the TTL only bounds memory. Misses fall through to the
+# persistent forecast store, which is shared with other worker processes and
+# survives restarts.
+FORECAST_CACHE_TTL = 60 * 60        # seconds
+FORECAST_CACHE_MAX_ENTRIES = 500
+FORECAST_KEYS_TRACKED = 10 * FORECAST_CACHE_MAX_ENTRIES
+
+metrics.start_from_env()
+
+@st.cache_resource
+def cache_stats():
+    """Process-wide call/miss counters for the cached functions, shared by all sessions"""
+    return {}
+
+@st.cache_resource
+def forecast_cache_entries():
+    """When each recently computed forecast cache key was last computed, oldest first"""
+    return OrderedDict()
+
+def _cache_counts(name):
+    return cache_stats().setdefault(name, {'calls': 0, 'misses': 0, 'evictions': 0})
+
+def record_cache_call(name):
+    _cache_counts(name)['calls'] += 1
+    metrics.CACHE_CALLS.inc(cache=name)
+
+def record_cache_miss(name):
+    _cache_counts(name)['misses'] += 1
+    metrics.CACHE_MISSES.inc(cache=name)
+
+def record_cache_eviction(name, reason, count=1):
+    _cache_counts(name)['evictions'] += count
+    metrics.CACHE_EVICTIONS.inc(count, cache=name, reason=reason)
+
+def track_forecast_entry(key):
+    """Record that the forecast cache computed ``key``, counting an eviction if it had computed it before.
+
+    The cache doesn't expose its contents, so an eviction is counted when it
+    shows: a key comes back as a miss. That covers every way an entry leaves
+    the cache (TTL, the LRU limit, a failed forecast, a clear from any
+    session). Entries that are dropped and never asked for again aren't
+    counted, nor are keys older than the last FORECAST_KEYS_TRACKED computed.
+    """
+    entries = forecast_cache_entries()
+    now = time.monotonic()
+    computed = entries.pop(key, None)
+    if computed is not None:
+        record_cache_eviction('forecast', 'expired' if now - computed > FORECAST_CACHE_TTL else 'dropped')
+    entries[key] = now
+    while len(entries) > FORECAST_KEYS_TRACKED:
+        entries.popitem(last=False)
+
+# ─── Background forecasts ──────────────────────────────────────────────────────
+# Forecasts are started as soon as their inputs are known and run on a shared
+# thread pool while the script keeps rendering; the page collects them with
+# Future.result() where they are shown. The cache memoizes the Future itself,
+# so workers never call into Streamlit and a forecast that is still running is
+# shared by every rerun and session that asks for it.
+FORECAST_WORKERS = 4
+
+@st.cache_resource
+def forecast_executor():
+    """Thread pool forecasts run on, shared by all sessions"""
+    return ThreadPoolExecutor(max_workers=FORECAST_WORKERS, thread_name_prefix='forecast')
+
+def _forecast_succeeded(future):
+    # Failed forecasts are retried on the next call instead of being served from cache
+    return not future.done() or future.exception() is None
+
+@st.cache_resource(ttl=FORECAST_CACHE_TTL, max_entries=FORECAST_CACHE_MAX_ENTRIES, show_spinner=False,
+                   validate=_forecast_succeeded)
+def _forecast_future(fingerprint, start_year, *args):
+    record_cache_miss('forecast')
+    track_forecast_entry((fingerprint, start_year) + args)
+    return forecast_executor().submit(stored_forecast, *args, start_year=start_year)
+
+def submit_forecast(*args):
+    """forecast_costs memoized across reruns, sessions and processes, running in the background; returns a Future.
+
+    The ForecastResult is shared between callers, so treat it as read-only.
+    """
+    record_cache_call('forecast')
+    # Forecasts start in the current calendar year, so it is part of the key: one cached
+    # last year would have every vehicle a year too young
+    fingerprint, start_year = model_fingerprint(), datetime.now().year
+    return _forecast_future(fingerprint, start_year, *args)
+
+def render_cache_stats():
+    """Sidebar panel showing how often the cached functions are served from cache"""
+    with st.sidebar.expander("🗄️ Cache Statistics"):
+        stats = cache_stats()
+        if not stats:
+            st.caption("No cached calls yet")
+        for name, counts in sorted(stats.items()):
+            calls, misses, evictions = counts['calls'], counts['misses'], counts['evictions']
+            hits = max(0, calls - misses)
+            hit_rate = (hits / calls * 100) if calls else 0.0
+            st.markdown(f"**{name}**: {calls:,} calls, {hits:,} hits, {misses:,} misses ({hit_rate:.0f}% hit rate), "
+                        f"{evictions:,} recomputed after eviction")
+        st.caption(f"Forecast cache: up to {FORECAST_CACHE_MAX_ENTRIES} entries, {FORECAST_CACHE_TTL // 60}-minute TTL")
+        st.caption(f"Model fingerprint: `{model_fingerprint()}`")
+        store = default_store()
+        if store is not None:
+            disk = store.stats()
+            st.caption(f"Persistent store: {disk['entries']:,} forecasts, {disk['bytes'] / 2**20:.1f} MB "
+                       f"of {store.max_bytes / 2**20:.0f} MB, {disk['hits']:,} hits")
+        if st.button("Clear forecast cache", key="clear_forecast_cache"):
+            _forecast_future.clear()
+            stats.pop('forecast', None)
+
+# ─── Charts ────────────────────────────────────────────────────────────────────
+vehicle_by_label = {f"{mk} {md}": (mk, md) for mk, models in car_makes_and_models.items() for md in models}
+
+def comparison_vehicles(make, model, electric, count=3):
+    """The ``count`` vehicles of the other powertrain with the closest MSRP"""
+    target = msrp_data.get((make, model), 0)
+    others = [vehicle for vehicle in vehicle_by_label.values()
+              if is_electric_vehicle(*vehicle) != electric and vehicle in msrp_data]
+    return sorted(others, key=lambda vehicle: abs(msrp_data[vehicle] - target))[:count]
+
+# ─── Tables ────────────────────────────────────────────────────────────────────
+TABLE_FORMATS = {
+    '${:,.0f}': 'dollars',
+    '{:,.0f}': 'count',
+    '{:.0%}': 'percent', '{:.1%}': 'percent',
 }
 
-# ─── State Cost Multipliers ────────────────────────────────────────────────────
-state_cost_multipliers = {
-    'Alabama':1.00,'Alaska':1.10,'Arizona':1.05,'Arkansas':0.95,
-    'California':1.25,'Colorado':1.10,'Connecticut':1.20,'Delaware':1.05,
-    'Florida':1.00,'Georgia':1.00,'Hawaii':1.30,'Idaho':0.95,
-    'Illinois':1.10,'Indiana':0.95,'Iowa':0.90,'Kansas':0.95,
-    'Kentucky':0.95,'Louisiana':1.00,'Maine':1.05,'Maryland':1.20,
-    'Massachusetts':1.25,'Michigan':1.00,'Minnesota':1.00,'Mississippi':0.90,
-    'Missouri':0.95,'Montana':0.95,'Nebraska':0.95,'Nevada':1.05,
-    'New Hampshire':1.10,'New Jersey':1.25,'New Mexico':0.95,'New York':1.30,
-    'North Carolina':1.00,'North Dakota':0.90,'Ohio':0.95,'Oklahoma':0.95,
-    'Oregon':1.10,'Pennsylvania':1.10,'Rhode Island':1.15,'South Carolina':0.95,
-    'South Dakota':0.90,'Tennessee':0.95,'Texas':1.00,'Utah':1.00,
-    'Vermont':1.10,'Virginia':1.10,'Washington':1.15,'West Virginia':0.90,
-    'Wisconsin':1.00,'Wyoming':0.90
-}
+def display_table(df, formats):
+    """``(table, column_config)`` for st.dataframe, showing each ``formats`` column as that str.format would.
 
-# ─── Electric Vehicle Functions ────────────────────────────────────────────────
+    Values stay numeric, so clicking a column header sorts by value, and the
+    frontend formats them instead of a pandas Styler shipping per-cell CSS on
+    every rerun. Whole dollars and counts are rounded to integers, which the
+    frontend shows with thousands separators; a printf NumberColumn format
+    can't group them. Dollar columns therefore carry the $ in their header.
+    Shares are scaled to percentages and shown with a printf format.
+    """
+    table = df.copy()
+    column_config = {}
+    for column, fmt in formats.items():
+        kind = TABLE_FORMATS[fmt]
+        if kind == 'percent':
+            decimals = int(fmt[3])
+            table[column] = (df[column] * 100).round(decimals)
+            column_config[column] = st.column_config.NumberColumn(format=f"%.{decimals}f%%")
+        else:
+            table[column] = df[column].round().astype('Int64')
+            column_config[column] = st.column_config.NumberColumn(f"{column} ($)" if kind == 'dollars' else None)
+    return table, column_config
 
-def is_electric_vehicle(make, model):
-    """Check if the vehicle is electric"""
-    return fuel_requirements.get(make, {}).get(model) == 'electric'
+# ─── Headline ──────────────────────────────────────────────────────────────────
+def render_headline(box, note, result, gross, forecast_years=None):
+    """The four headline metrics for ``result`` into the placeholder ``box``.
 
-def calculate_ev_electricity_cost(make, model, avg_mpy, state, charging_preference='mixed', custom_rates=None):
-    """
-    Calculate accurate electricity costs for EVs based on vehicle efficiency and state rates
-    
-    Args:
-        make, model: Vehicle identification
-        avg_mpy: Annual mileage
-        state: State for electricity rates
-        charging_preference: 'home', 'public', or 'mixed'
-        custom_rates: Optional dict with custom rates {'residential': rate, 'ev_rate': rate, 'public': rate, 'has_ev_rate': bool}
+    Pass ``forecast_years`` when ``result`` is a first-year preview of a longer
+    forecast that is still running; the metrics are labelled accordingly and
+    the placeholder ``note`` says so. Otherwise ``note`` is cleared.
     """
-    if not is_electric_vehicle(make, model):
-        return 0
-    
-    # Get vehicle-specific data
-    ev_data = ev_charging_data.get(make, {}).get(model)
-    if not ev_data:
-        # Fallback for EVs not in our database
-        ev_data = {
-            'efficiency_miles_per_kwh': 3.0,
-            'home_charging_loss': 0.12,
-            'public_charging_loss': 0.18
-        }
-    
-    # Calculate kWh needed per year (accounting for charging losses)
-    base_kwh_needed = avg_mpy / ev_data['efficiency_miles_per_kwh']
-    
-    # Use custom rates if provided, otherwise use default state rates
-    if custom_rates:
-        base_rate = custom_rates['residential']
-        ev_rate = custom_rates['ev_rate'] if custom_rates['has_ev_rate'] else custom_rates['residential']
-        public_rate = custom_rates['public']
+    frame = result.to_frame()
+    total = frame['Total Cost'].sum()
+    avg_annual = total / result.years
+    with box.container():
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("First-Year Cost" if forecast_years else "Total Cost Over Period", f"${total:,.0f}")
+        with col2:
+            st.metric("Average Annual Cost", f"${avg_annual:,.0f}")
+        with col3:
+            st.metric("% of Gross Income", f"{avg_annual / gross * 100:.1f}%")
+        with col4:
+            st.metric("Est. Annual Insurance", f"${frame['Insurance Premium'].mean():,.0f}")
+    if forecast_years:
+        note.caption(f"First-year figures; the {forecast_years}-year forecast is still running.")
     else:
-        # Get default electricity rates
-        base_rate = state_electricity_rates.get(state, 0.15)
-        tou_rates = time_of_use_rates.get(state, {'ev_rate': base_rate})
-        ev_rate = tou_rates.get('ev_rate', base_rate)
-        public_rate = 0.35  # Default public charging rate
-    
-    if charging_preference == 'home':
-        # Mostly home charging with EV rate or regular rate
-        rate = ev_rate
-        kwh_with_losses = base_kwh_needed * (1 + ev_data['home_charging_loss'])
-        annual_cost = kwh_with_losses * rate
-        
-    elif charging_preference == 'public':
-        # Mostly public charging (more expensive)
-        kwh_with_losses = base_kwh_needed * (1 + ev_data['public_charging_loss'])
-        annual_cost = kwh_with_losses * public_rate
-        
-    else:  # mixed
-        # 70% home, 30% public charging
-        home_kwh = base_kwh_needed * 0.7 * (1 + ev_data['home_charging_loss'])
-        public_kwh = base_kwh_needed * 0.3 * (1 + ev_data['public_charging_loss'])
-        
-        annual_cost = (home_kwh * ev_rate) + (public_kwh * public_rate)
-    
-    return annual_cost
-
-def get_ev_charging_info(make, model, state):
-    """Get detailed EV charging information for display"""
-    if not is_electric_vehicle(make, model):
-        return None
-    
-    ev_data = ev_charging_data.get(make, {}).get(model)
-    base_rate = state_electricity_rates.get(state, 0.15)
-    tou_rates = time_of_use_rates.get(state, {})
-    
-    info = {
-        'base_rate': base_rate,
-        'has_ev_rate': 'ev_rate' in tou_rates,
-        'ev_rate': tou_rates.get('ev_rate', base_rate),
-        'efficiency': ev_data.get('efficiency_miles_per_kwh', 3.0) if ev_data else 3.0,
-        'battery_size': ev_data.get('battery_kwh', 75) if ev_data else 75,
-        'range': ev_data.get('range_miles', 250) if ev_data else 250
-    }
-    
-    return info
-
-def get_scheduled_activities(start_mileage, end_mileage, is_ev=False, driving_style='normal', terrain='flat'):
-    """Get maintenance activities with adjustments for driving conditions"""
-    schedule = ev_maintenance_schedule if is_ev else maintenance_schedule
-    activities = []
-    
-    # Adjust intervals based on driving style and terrain
-    style_multiplier = {'gentle': 1.2, 'normal': 1.0, 'aggressive': 0.8}[driving_style]
-    terrain_multiplier = {'flat': 1.0, 'hilly': 0.85}[terrain]
-    
-    adjustment_factor = style_multiplier * terrain_multiplier
-    
-    for name, base_interval in schedule.items():
-        adjusted_interval = int(base_interval * adjustment_factor)
-        next_due = ((start_mileage // adjusted_interval) + 1) * adjusted_interval
-        if start_mileage < next_due <= end_mileage:
-            activities.append(name)
-    
-    return activities
-
-def safe_exp(x):
-    try:
-        return math.exp(x)
-    except OverflowError:
-        return 0.0
-
-def depreciation_fraction(t,V0,Vmin=2000.0,a=0.182):
-    return (1 - Vmin/V0)*(1 - safe_exp(-a*t))
-
-def residual_value(t,V0,Vmin=2000.0,a=0.182):
-    return V0*(1 - depreciation_fraction(t,V0,Vmin,a))
-
-def estimate_vehicle_value(msrp,model_year,current_year,Vmin=2000.0,a=0.182):
-    elapsed=max(0,current_year-model_year)
-    elapsed=min(elapsed,50)
-    return round(residual_value(elapsed,msrp,Vmin,a),2)
-
-def get_car_tier(make):
-    lux={'BMW','Mercedes-Benz','Audi','Lexus','Jaguar','Porsche','Volvo','Mini','McLaren','Acura','Cadillac','Lincoln','Infiniti'}
-    eco={'Toyota','Honda','Ford','Hyundai','Kia','Chevrolet','Subaru','Mazda','Nissan','Mitsubishi','Chrysler','Dodge'}
-    if make in lux: return 'Luxury'
-    if make in eco: return 'Economy'
-    return 'Midrange'
-
-def get_fuel_price(state, make, model, custom_price=None):
-    """Get appropriate fuel price based on vehicle requirements and state, with optional custom price"""
-    fuel_type = fuel_requirements.get(make, {}).get(model, 'regular')
-    if fuel_type == 'electric':
-        return 0  # No fuel cost for electric vehicles
-    
-    # Use custom price if provided, otherwise use state default
-    if custom_price is not None:
-        return custom_price
-    
-    state_prices = state_fuel_prices.get(state, {'regular': 3.50, 'premium': 4.20})
-    return state_prices.get(fuel_type, state_prices['regular'])
-
-def predict_5_years_cost(make, model, model_year, current_mileage, avg_mpy,
-                        mpg, purchase_price, state,
-                        years, loan_amount, irate, lt_years,
-                        user_age, start_age, msrp, driving_style, terrain):
-    
-    is_ev = is_electric_vehicle(make, model)
-    fuel_price = get_fuel_price(state, make, model)
-    
-    enc_make = le_make.transform([make])[0]
-    enc_model = le_model.transform([model])[0]
-    
-    # Enhanced tier multiplier for parts costs
-    tier = get_car_tier(make)
-    parts_multiplier = {'Luxury': 1.8, 'Midrange': 1.2, 'Economy': 1.0}[tier]
-    labor_multiplier = tier_multipliers[tier]
-    state_mult = state_cost_multipliers[state]
-    
-    # Get vehicle lifespan for aging calculations
-    expected_lifespan = get_vehicle_lifespan(make, model)
-    current_vehicle_age = datetime.now().year - model_year
-    
-    r = irate / 100 if irate > 0 else 0
-    loan_pay = (loan_amount * r / (1 - (1 + r) ** -lt_years)) if r > 0 and loan_amount > 0 else (loan_amount / lt_years if loan_amount > 0 else 0)
-    
-    prev_val = purchase_price
-    Y, M, F, L, D, T, V, Acts, Lines, Insurance = [], [], [], [], [], [], [], [], [], []
-    
-    for i in range(1, years + 1):
-        yr = model_year + i
-        fm = current_mileage + avg_mpy * i
-        vehicle_age_in_year = current_vehicle_age + i
-        
-        # Calculate aging multiplier for maintenance costs - enhanced for extreme aging
-        aging_multiplier = 1.0
-        if vehicle_age_in_year > expected_lifespan * 0.6:  # After 60% of expected lifespan
-            # Costs increase exponentially as vehicle ages
-            excess_years = vehicle_age_in_year - (expected_lifespan * 0.6)
-            aging_multiplier = 1.0 + (excess_years * 0.15)  # 15% increase per year after 60% of lifespan
-            
-        if vehicle_age_in_year > expected_lifespan * 0.8:  # After 80% of expected lifespan
-            excess_years = vehicle_age_in_year - (expected_lifespan * 0.8)
-            aging_multiplier += (excess_years * 0.25)  # Additional 25% increase per year after 80%
-            
-        if vehicle_age_in_year > expected_lifespan:  # Beyond expected lifespan
-            excess_years = vehicle_age_in_year - expected_lifespan
-            aging_multiplier += (excess_years * 0.50)  # Additional 50% increase per year beyond lifespan
-            
-        if vehicle_age_in_year > expected_lifespan + 5:  # Well beyond expected lifespan
-            excess_years = vehicle_age_in_year - (expected_lifespan + 5)
-            aging_multiplier += (excess_years * 0.75)  # Additional 75% increase for very old vehicles
-            
-        aging_multiplier = min(aging_multiplier, 8.0)  # Cap at 8x normal costs for extreme cases
-        
-        # Base maintenance prediction
-        if not is_ev:
-            df = pd.DataFrame([{
-                'Make_Encoded': enc_make, 'Model_Encoded': enc_model,
-                'Year': model_year, 'Mileage': fm, 'Avg_Miles_Per_Year': avg_mpy
-            }])
-            base = trained_model.predict(df)[0] * aging_multiplier
-        else:
-            # Simplified base cost for EVs (no oil changes, etc.)
-            base = 200 * (1 + (fm / 100000) * 0.5) * aging_multiplier
-        
-        # Get scheduled activities
-        acts = get_scheduled_activities(
-            current_mileage + avg_mpy * (i - 1), fm, is_ev, driving_style, terrain
-        )
-        
-        # Add age-related maintenance items - enhanced for extreme aging
-        if vehicle_age_in_year >= expected_lifespan * 0.7 and not is_ev:
-            # Add common high-mileage issues
-            if vehicle_age_in_year >= expected_lifespan * 0.7 and 'Transmission Service' not in acts:
-                acts.append('Transmission Service')
-            if vehicle_age_in_year >= expected_lifespan * 0.8 and 'Suspension Check' not in acts:
-                acts.append('Suspension Check')
-                
-        if vehicle_age_in_year > expected_lifespan and not is_ev:
-            # Beyond expected lifespan - major component issues
-            if 'Engine Mount Replacement' not in acts:
-                acts.append('Engine Mount Replacement')
-            if vehicle_age_in_year > expected_lifespan + 2 and 'CV Joint Replacement' not in acts:
-                acts.append('CV Joint Replacement')
-            if vehicle_age_in_year > expected_lifespan + 3 and 'Power Steering Service' not in acts:
-                acts.append('Power Steering Service')
-                
-        if vehicle_age_in_year > expected_lifespan + 5 and not is_ev:
-            # Very old vehicles - extreme maintenance
-            if 'Radiator Replacement' not in acts and vehicle_age_in_year % 3 == 0:
-                acts.append('Radiator Replacement')
-            if 'Catalytic Converter Replacement' not in acts and vehicle_age_in_year % 4 == 0:
-                acts.append('Catalytic Converter Replacement')
-                
-        # EV-specific extreme aging issues
-        if is_ev and vehicle_age_in_year > expected_lifespan:
-            if 'Battery Pack Degradation Service' not in acts:
-                acts.append('Battery Pack Degradation Service')
-            if vehicle_age_in_year > expected_lifespan + 3 and 'Drive Unit Overhaul' not in acts:
-                acts.append('Drive Unit Overhaul')
-        
-        # Calculate activity costs with enhanced breakdown
-        act_cost = 0
-        for activity in acts:
-            if activity in maintenance_costs:
-                labor_cost = maintenance_costs[activity]['labor'] * labor_multiplier * state_mult * aging_multiplier
-                parts_cost = maintenance_costs[activity]['parts'] * parts_multiplier * state_mult * aging_multiplier
-                act_cost += labor_cost + parts_cost
-            else:
-                # Handle new age-related activities
-                if activity == 'Transmission Service':
-                    act_cost += 300 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Suspension Check':
-                    act_cost += 150 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Engine Mount Replacement':
-                    act_cost += 800 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'CV Joint Replacement':
-                    act_cost += 550 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Power Steering Service':
-                    act_cost += 150 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Radiator Replacement':
-                    act_cost += 500 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Catalytic Converter Replacement':
-                    act_cost += 950 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Battery Pack Degradation Service':
-                    act_cost += 2000 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Drive Unit Overhaul':
-                    act_cost += 2000 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Engine Overhaul':
-                    act_cost += 5000 * labor_multiplier * state_mult * aging_multiplier
-                elif activity == 'Transmission Rebuild':
-                    act_cost += 3500 * labor_multiplier * state_mult * aging_multiplier
-        
-        maint = base + act_cost
-        
-        # Fuel/electricity cost
-        if is_ev:
-            # Use custom rates if available from the UI
-            if 'custom_rates_dict' in locals() and custom_rates_dict.get('use_custom', False):
-                custom_rates = {
-                    'residential': custom_rates_dict['residential'],
-                    'ev_rate': custom_rates_dict['ev_rate'],
-                    'public': custom_rates_dict['public'],
-                    'has_ev_rate': custom_rates_dict['has_ev_rate']
-                }
-            else:
-                custom_rates = None
-            
-            fuel = calculate_ev_electricity_cost(make, model, avg_mpy, state, 'mixed', custom_rates)
-            
-            # EVs may become less efficient as they age (battery degradation)
-            if vehicle_age_in_year > 8:  # After 8 years, some efficiency loss
-                battery_degradation = 1 + ((vehicle_age_in_year - 8) * 0.02)  # 2% per year after 8 years
-                fuel *= battery_degradation
-        else:
-            # Use custom fuel price if available
-            custom_price = custom_fuel_price if 'custom_fuel_price' in locals() else None
-            fuel_price = get_fuel_price(state, make, model, custom_price)
-            
-            # ICE vehicles may become less efficient as they age
-            efficiency_loss = 1.0
-            if vehicle_age_in_year > 10:
-                efficiency_loss = 1 + ((vehicle_age_in_year - 10) * 0.01)  # 1% loss per year after 10 years
-            
-            fuel = (avg_mpy / mpg) * fuel_price * efficiency_loss
-        
-        reg = 150
-        total = maint + fuel + reg + loan_pay
-        
-        # Enhanced depreciation for older vehicles
-        cur_val = estimate_vehicle_value(purchase_price, model_year, yr)
-        
-        # Accelerated depreciation near end of life
-        if vehicle_age_in_year > expected_lifespan * 0.9:
-            # Value drops more rapidly as vehicle approaches end of useful life
-            end_of_life_factor = (vehicle_age_in_year - expected_lifespan * 0.9) / (expected_lifespan * 0.1)
-            end_of_life_factor = min(end_of_life_factor, 1.0)
-            # Reduce value by up to 50% more than normal depreciation
-            additional_depreciation = cur_val * 0.3 * end_of_life_factor
-            cur_val = max(cur_val - additional_depreciation, 500)  # Minimum scrap value
-        
-        depr = round(prev_val - cur_val, 2)
-        prev_val = cur_val
-        
-        # Insurance calculation with age adjustments
-        this_year_age = user_age + i - 1
-        years_driving = this_year_age - start_age
-        premium = 1200  # base
-        if this_year_age < 25:
-            premium += 700
-        if this_year_age >= 25 and years_driving >= 10:
-            premium -= 200
-        if msrp and msrp > 50000:
-            premium += 400
-        if avg_mpy > 15000:
-            premium += 200
-        elif avg_mpy < 7000:
-            premium -= 100
-            
-        # Older vehicles may have lower insurance costs due to lower value
-        if vehicle_age_in_year > 10:
-            age_discount = min(0.3, (vehicle_age_in_year - 10) * 0.03)  # Up to 30% discount
-            premium *= (1 - age_discount)
-            
-        premium *= state_cost_multipliers.get(state, 1.0)
-        premium = max(700, round(premium))
-        
-        Y.append(f"Year {i}")
-        M.append(round(maint, 2))
-        F.append(round(fuel, 2))
-        L.append(round(loan_pay, 2))
-        D.append(depr)
-        T.append(round(total, 2))
-        V.append(cur_val)
-        Acts.append(', '.join(acts) or 'None')
-        Lines.append(f"Year {i}: Maintenance ${round(maint):,}, {'Electricity' if is_ev else 'Fuel'} ${round(fuel):,}, Loan ${round(loan_pay):,}, Depreciation ${depr:,}\\n")
-        Insurance.append(premium)
-    
-    df_out = pd.DataFrame({
-        'Year': Y,
-        'Maintenance Cost': M,
-        'Fuel/Electricity Cost': F,
-        'Loan Payment': L,
-        'Depreciation Cost': D,
-        'Total Cost': T,
-        'Car Value': V,
-        'Activities': Acts,
-        'Insurance Premium': Insurance
-    })
-    
-    inter = next((y for y, m, v in zip(Y, M, V) if m > v), None)
-    return ''.join(Lines), df_out, inter
+        note.empty()
+
+# ─── Rerun profiler ────────────────────────────────────────────────────────────
+# Opt-in developer panel: open the app with ?profile=1 to time every section of
+# this script on each rerun. profile_section() does nothing otherwise.
+PROFILE_RERUNS = st.query_params.get('profile') == '1'
+RERUN_HISTORY = 200                 # reruns kept per session
+_section_marks = []                 # (section, start time) for this rerun
+
+def profile_section(name):
+    """Start timing section ``name``; it runs until the next section starts"""
+    if PROFILE_RERUNS:
+        _section_marks.append((name, time.perf_counter()))
+
+def render_rerun_profiler():
+    """Sidebar panel with this rerun's section timings and which sections dominate the session"""
+    if not PROFILE_RERUNS or not _section_marks:
+        return
+    ends = [start for _, start in _section_marks[1:]] + [time.perf_counter()]
+    timings = {}
+    for (name, start), end in zip(_section_marks, ends):
+        timings[name] = timings.get(name, 0.0) + end - start
+    for name, seconds in timings.items():
+        record_span(f"ui.{name}", seconds)
+    history = st.session_state.setdefault('rerun_profile', [])
+    history.append(timings)
+    del history[:-RERUN_HISTORY]
+    st.session_state['rerun_count'] = st.session_state.get('rerun_count', 0) + 1
+
+    sections = list(dict.fromkeys(name for rerun in history for name in rerun))
+    runs = {name: [rerun[name] * 1000 for rerun in history if name in rerun] for name in sections}
+    session_total = sum(sum(ms) for ms in runs.values())
+    profile_df = pd.DataFrame({
+        'Section': sections,
+        'This Rerun (ms)': [timings.get(name, 0.0) * 1000 for name in sections],
+        'Mean (ms)': [sum(runs[name]) / len(runs[name]) for name in sections],
+        'Max (ms)': [max(runs[name]) for name in sections],
+        'Share': [sum(runs[name]) / session_total * 100 if session_total else 0.0 for name in sections],
+    }).sort_values('Share', ascending=False)
+
+    with st.sidebar.expander("⏱️ Rerun Profiler", expanded=True):
+        col1, col2 = st.columns(2)
+        col1.metric("Reruns", f"{st.session_state['rerun_count']:,}")
+        col2.metric("This Rerun", f"{sum(timings.values()) * 1000:,.0f} ms")
+        st.dataframe(profile_df, hide_index=True, use_container_width=True, column_config={
+            'This Rerun (ms)': st.column_config.NumberColumn(format="%.1f"),
+            'Mean (ms)': st.column_config.NumberColumn(format="%.1f"),
+            'Max (ms)': st.column_config.NumberColumn(format="%.1f"),
+            'Share': st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100),
+        })
+        st.caption(f"Share of time across the last {len(history)} reruns of this session")
 
 # ─── Streamlit UI ──────────────────────────────────────────────────────────────
+profile_section("Introduction")
 st.title("🚗 Car Ownership Cost Forecast")
 st.markdown("""
 **Protect your financial future with smart vehicle decisions.**
@@ -900,6 +284,7 @@ Whether you're shopping for a new or used vehicle, this tool goes beyond the sti
 """)
 
 # Vehicle Selection
+profile_section("Vehicle Information")
 st.header("🔧 Vehicle Information")
 col1, col2 = st.columns(2)
 
@@ -953,28 +338,11 @@ with col2:
 
 st.caption("⭐ Safety ratings from NHTSA (National Highway Traffic Safety Administration) and IIHS (Insurance Institute for Highway Safety) - free public data sources")
 
-# Vehicle Details
-st.header("📊 Vehicle Details")
-col1, col2 = st.columns(2)
-
-with col1:
-    mileage = st.number_input(
-        "Current Mileage",
-        0, 300000, 1000,
-        key="mileage"
-    )
-
-with col2:
-    your_price = st.number_input(
-        "Your Purchase Price ($)",
-        0, 2000000, 20000,
-        key="your_price"
-    )
-
 # Check if it's an electric vehicle
 is_ev = is_electric_vehicle(make, model)
 
-# Location and Forecast Period - Move this up before EV-specific sections
+# Location - selections that drive the defaults of the cost inputs stay outside the form
+profile_section("Location & Forecast")
 st.header("📍 Location & Forecast")
 
 state = st.selectbox(
@@ -991,38 +359,14 @@ if is_ev:
     if tou_info and 'ev_rate' in tou_info:
         st.caption(f"EV time-of-use rate available: ${tou_info['ev_rate']:.3f}/kWh")
 else:
-    # Gas price customization for non-EV vehicles
     fuel_type = fuel_requirements.get(make, {}).get(model, 'regular')
     state_prices = state_fuel_prices.get(state, {'regular': 3.50, 'premium': 4.20})
     default_fuel_price = state_prices.get(fuel_type, state_prices['regular'])
-    
-    st.subheader("⛽ Fuel Pricing")
-    fuel_emoji = "⛽" if fuel_type == "regular" else "🏎️"
-    st.markdown(f"{fuel_emoji} This vehicle requires **{fuel_type}** gasoline")
-    
-    # User input for fuel price with state default pre-filled
-    custom_fuel_price = st.number_input(
-        f"{fuel_type.title()} Gas Price ($/gallon)",
-        min_value=1.00,
-        max_value=10.00,
-        value=default_fuel_price,
-        step=0.01,
-        format="%.2f",
-        key="custom_fuel_price",
-        help=f"Default {fuel_type} gas price for {state} is ${default_fuel_price:.2f}/gallon. Adjust based on your local prices."
-    )
-    
-    # Show comparison to state average
-    if abs(custom_fuel_price - default_fuel_price) > 0.05:
-        price_diff = custom_fuel_price - default_fuel_price
-        if price_diff > 0:
-            st.caption(f"💰 ${price_diff:.2f}/gallon above {state} average")
-        else:
-            st.caption(f"💰 ${abs(price_diff):.2f}/gallon below {state} average")
-    else:
-        st.caption(f"📍 Close to {state} average price")
 
 # Enhanced EV information display
+use_custom_rates = False
+has_ev_tou = False
+ev_info = None
 if is_ev:
     st.info("🔋 **Electric Vehicle Detected** - Specialized calculations for electricity costs and EV maintenance will be applied.")
     
@@ -1048,6 +392,78 @@ if is_ev:
         )
         
         if use_custom_rates:
+            has_ev_tou = st.checkbox(
+                "I have a special EV time-of-use rate",
+                value=ev_info['has_ev_rate'],
+                key="has_custom_ev_rate"
+            )
+        else:
+            # Display default rates
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write(f"🏠 **Default Residential Rate:** ${ev_info['base_rate']:.3f}/kWh")
+                if ev_info['has_ev_rate']:
+                    st.write(f"⚡ **Default EV Time-of-Use Rate:** ${ev_info['ev_rate']:.3f}/kWh")
+                else:
+                    st.write("⚡ No special EV rate available in your state")
+            
+            with col2:
+                st.write(f"🚗 **Default Public Charging Rate:** $0.35/kWh")
+                st.caption("Based on national average for public charging")
+
+# Everything below is collected in one form so edits don't rerun the script;
+# the forecast only runs when the form is submitted.
+profile_section("Cost Inputs Form")
+with st.form("cost_inputs"):
+    # Vehicle Details
+    st.header("📊 Vehicle Details")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        mileage = st.number_input(
+            "Current Mileage",
+            0, 300000, 1000,
+            key="mileage"
+        )
+
+    with col2:
+        your_price = st.number_input(
+            "Your Purchase Price ($)",
+            0, 2000000, 20000,
+            key="your_price"
+        )
+
+    if not is_ev:
+        # Gas price customization for non-EV vehicles
+        st.subheader("⛽ Fuel Pricing")
+        fuel_emoji = "⛽" if fuel_type == "regular" else "🏎️"
+        st.markdown(f"{fuel_emoji} This vehicle requires **{fuel_type}** gasoline")
+        
+        # User input for fuel price with state default pre-filled
+        custom_fuel_price = st.number_input(
+            f"{fuel_type.title()} Gas Price ($/gallon)",
+            min_value=1.00,
+            max_value=10.00,
+            value=default_fuel_price,
+            step=0.01,
+            format="%.2f",
+            key="custom_fuel_price",
+            help=f"Default {fuel_type} gas price for {state} is ${default_fuel_price:.2f}/gallon. Adjust based on your local prices."
+        )
+        
+        # Show comparison to state average
+        if abs(custom_fuel_price - default_fuel_price) > 0.05:
+            price_diff = custom_fuel_price - default_fuel_price
+            if price_diff > 0:
+                st.caption(f"💰 ${price_diff:.2f}/gallon above {state} average")
+            else:
+                st.caption(f"💰 ${abs(price_diff):.2f}/gallon below {state} average")
+        else:
+            st.caption(f"📍 Close to {state} average price")
+
+    if ev_info:
+        if use_custom_rates:
+            st.subheader("⚡ Your Electricity Rates")
             col1, col2 = st.columns(2)
             
             with col1:
@@ -1066,12 +482,6 @@ if is_ev:
                 )
                 
                 # EV time-of-use rate input
-                has_ev_tou = st.checkbox(
-                    "I have a special EV time-of-use rate",
-                    value=ev_info['has_ev_rate'],
-                    key="has_custom_ev_rate"
-                )
-                
                 if has_ev_tou:
                     custom_ev_rate = st.number_input(
                         "EV Time-of-Use Rate ($/kWh)",
@@ -1115,21 +525,7 @@ if is_ev:
                 'has_ev_rate': has_ev_tou,
                 'use_custom': True
             }
-            
         else:
-            # Display default rates
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write(f"🏠 **Default Residential Rate:** ${ev_info['base_rate']:.3f}/kWh")
-                if ev_info['has_ev_rate']:
-                    st.write(f"⚡ **Default EV Time-of-Use Rate:** ${ev_info['ev_rate']:.3f}/kWh")
-                else:
-                    st.write("⚡ No special EV rate available in your state")
-            
-            with col2:
-                st.write(f"🚗 **Default Public Charging Rate:** $0.35/kWh")
-                st.caption("Based on national average for public charging")
-            
             # Set to use default rates
             custom_rates_dict = {'use_custom': False}
         
@@ -1148,162 +544,194 @@ if is_ev:
     else:
         charging_pref = "mixed"
         custom_rates_dict = {'use_custom': False}
-else:
-    charging_pref = "mixed"
-    custom_rates_dict = {'use_custom': False}
 
-default_mpg = average_mpg.get(make, {}).get(model, 25)
-if is_ev:
-    mpg_label = "Miles Per kWh Equivalent"
-    mpg_help = f"EPA avg: {default_mpg} MPGe"
-else:
-    mpg_label = "Miles Per Gallon"
-    mpg_help = f"EPA avg: {default_mpg} MPG"
-
-mpg = st.number_input(
-    mpg_label,
-    10, 150, value=default_mpg,
-    help=mpg_help,
-    key="mpg"
-)
-st.caption(f"EPA Average for {make} {model}: {default_mpg} {'MPGe' if is_ev else 'MPG'}")
+    default_mpg = average_mpg.get(make, {}).get(model, 25)
+    if is_ev:
+        mpg_label = "Miles Per kWh Equivalent"
+        mpg_help = f"EPA avg: {default_mpg} MPGe"
+    else:
+        mpg_label = "Miles Per Gallon"
+        mpg_help = f"EPA avg: {default_mpg} MPG"
+
+    mpg = st.number_input(
+        mpg_label,
+        10, 150, value=default_mpg,
+        help=mpg_help,
+        key="mpg"
+    )
+    st.caption(f"EPA Average for {make} {model}: {default_mpg} {'MPGe' if is_ev else 'MPG'}")
 
-# Financing
-st.header("💰 Financing Information")
-col1, col2, col3 = st.columns(3)
+    # Financing
+    st.header("💰 Financing Information")
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    loan_amount = st.number_input(
-        "Loan Amount ($)",
-        0.0, 2000000.0, 0.0,
-        key="loan_amount",
-        help="Enter 0 if paying cash"
-    )
+    with col1:
+        loan_amount = st.number_input(
+            "Loan Amount ($)",
+            0.0, 2000000.0, 0.0,
+            key="loan_amount",
+            help="Enter 0 if paying cash"
+        )
 
-with col2:
-    irate = st.number_input(
-        "Interest Rate (%)",
-        0.0, 25.0, 5.0,
-        key="irate"
-    )
+    with col2:
+        irate = st.number_input(
+            "Interest Rate (%)",
+            0.0, 25.0, 5.0,
+            key="irate"
+        )
 
-with col3:
-    lt_years = st.number_input(
-        "Loan Term (years)",
-        1, 8, 3,
-        key="lt_years"
-    )
+    with col3:
+        lt_years = st.number_input(
+            "Loan Term (years)",
+            1, 8, 3,
+            key="lt_years"
+        )
 
-# Personal Information
-st.header("👤 Personal Information")
-col1, col2 = st.columns(2)
+    # Personal Information
+    st.header("👤 Personal Information")
+    col1, col2 = st.columns(2)
 
-with col1:
-    gross = st.number_input(
-        "Gross Annual Income ($)",
-        0.0, 1000000.0, 60000.0,
-        key="gross"
-    )
+    with col1:
+        gross = st.number_input(
+            "Gross Annual Income ($)",
+            0.0, 1000000.0, 60000.0,
+            key="gross"
+        )
 
-with col2:
-    avg_mpy = st.number_input(
-        "Average Miles Per Year",
-        0, 100000, 10000,
-        key="avg_mpy",
-        help="The average American drives about 10,000-12,000 miles per year"
-    )
-st.caption("ℹ️ Average annual mileage in the US is approximately 10,000-12,000 miles")
+    with col2:
+        avg_mpy = st.number_input(
+            "Average Miles Per Year",
+            0, 100000, 10000,
+            key="avg_mpy",
+            help="The average American drives about 10,000-12,000 miles per year"
+        )
+    st.caption("ℹ️ Average annual mileage in the US is approximately 10,000-12,000 miles")
 
-# Driving conditions
-st.header("🛣️ Driving Conditions")
-st.markdown("*These factors affect maintenance schedules and costs*")
+    # Driving conditions
+    st.header("🛣️ Driving Conditions")
+    st.markdown("*These factors affect maintenance schedules and costs*")
 
-col1, col2 = st.columns(2)
-with col1:
-    driving_style = st.selectbox(
-        "Driving Style",
-        ["gentle", "normal", "aggressive"],
-        index=1,
-        key="driving_style",
-        help="Gentle: Easy acceleration/braking, Normal: Average driving, Aggressive: Hard acceleration/braking"
-    )
+    col1, col2 = st.columns(2)
+    with col1:
+        driving_style = st.selectbox(
+            "Driving Style",
+            ["gentle", "normal", "aggressive"],
+            index=1,
+            key="driving_style",
+            help="Gentle: Easy acceleration/braking, Normal: Average driving, Aggressive: Hard acceleration/braking"
+        )
 
-with col2:
-    terrain = st.selectbox(
-        "Terrain",
-        ["flat", "hilly"],
-        key="terrain",
-        help="Hilly terrain puts more strain on the vehicle"
-    )
+    with col2:
+        terrain = st.selectbox(
+            "Terrain",
+            ["flat", "hilly"],
+            key="terrain",
+            help="Hilly terrain puts more strain on the vehicle"
+        )
 
-# Insurance Information
-st.header("🛡️ Insurance Information")
-st.markdown("*We ask for your age to estimate insurance premiums, which vary significantly by age and driving experience*")
+    # Insurance Information
+    st.header("🛡️ Insurance Information")
+    st.markdown("*We ask for your age to estimate insurance premiums, which vary significantly by age and driving experience*")
 
-col1, col2 = st.columns(2)
-with col1:
-    user_age = st.number_input(
-        "Your Age",
-        min_value=16, max_value=100, value=30,
-        key="user_age"
-    )
+    col1, col2 = st.columns(2)
+    with col1:
+        user_age = st.number_input(
+            "Your Age",
+            min_value=16, max_value=100, value=30,
+            key="user_age"
+        )
 
-with col2:
-    start_age = st.number_input(
-        "Age When You Started Driving",
-        min_value=14, max_value=user_age, value=16,
-        key="start_age"
-    )
+    with col2:
+        # Form widgets only update on submit, so a max_value of user_age would lag
+        # behind the age field; the two are checked against each other on submit
+        start_age = st.number_input(
+            "Age When You Started Driving",
+            min_value=14, max_value=100, value=16,
+            key="start_age"
+        )
 
-# Final Configuration
-st.header("🔮 Forecast Configuration")
+    # Final Configuration
+    st.header("🔮 Forecast Configuration")
 
-# Calculate maximum forecast years based on vehicle lifespan
-max_years = get_max_forecast_years(make, model, datetime.now().year, model_year)
-expected_lifespan = get_vehicle_lifespan(make, model)
-vehicle_age = datetime.now().year - model_year
+    # Calculate maximum forecast years based on vehicle lifespan
+    max_years = get_max_forecast_years(make, model, datetime.now().year, model_year)
+    expected_lifespan = get_vehicle_lifespan(make, model)
+    vehicle_age = datetime.now().year - model_year
 
-# Display vehicle lifespan information
-col1, col2, col3 = st.columns(3)
-with col1:
-    st.metric("Vehicle Age", f"{vehicle_age} years")
-with col2:
-    st.metric("Expected Lifespan", f"{expected_lifespan} years")
-with col3:
-    st.metric("Max Forecast", f"{max_years} years")
-
-# Provide context about the lifespan estimate
-st.info(f"""
-**📊 Vehicle Lifespan Information:**
-- **{make} {model}** typically lasts **{expected_lifespan} years** based on reliability data
-- Your vehicle is **{vehicle_age} years old**
-- You can forecast up to **{max_years} years** (maximum 30 years total vehicle age)
-- Costs beyond expected lifespan include significantly higher maintenance and repair risks
-""")
+    # Display vehicle lifespan information
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Vehicle Age", f"{vehicle_age} years")
+    with col2:
+        st.metric("Expected Lifespan", f"{expected_lifespan} years")
+    with col3:
+        st.metric("Max Forecast", f"{max_years} years")
 
-# Show reliability context
-reliability_context = ""
-if expected_lifespan >= 20:
-    reliability_context = "🏆 **Excellent Reliability** - This vehicle is known for exceptional longevity"
-elif expected_lifespan >= 16:
-    reliability_context = "✅ **Above Average Reliability** - This vehicle typically outlasts most others"
-elif expected_lifespan >= 13:
-    reliability_context = "📊 **Average Reliability** - Typical lifespan for this vehicle class"
-elif expected_lifespan >= 10:
-    reliability_context = "⚠️ **Below Average Reliability** - Higher maintenance costs expected as it ages"
-else:
-    reliability_context = "🚨 **Lower Reliability** - Consider replacement planning due to shorter expected lifespan"
+    # Provide context about the lifespan estimate
+    st.info(f"""
+    **📊 Vehicle Lifespan Information:**
+    - **{make} {model}** typically lasts **{expected_lifespan} years** based on reliability data
+    - Your vehicle is **{vehicle_age} years old**
+    - You can forecast up to **{max_years} years** (maximum 30 years total vehicle age)
+    - Costs beyond expected lifespan include significantly higher maintenance and repair risks
+    """)
 
-st.markdown(reliability_context)
+    # Show reliability context
+    reliability_context = ""
+    if expected_lifespan >= 20:
+        reliability_context = "🏆 **Excellent Reliability** - This vehicle is known for exceptional longevity"
+    elif expected_lifespan >= 16:
+        reliability_context = "✅ **Above Average Reliability** - This vehicle typically outlasts most others"
+    elif expected_lifespan >= 13:
+        reliability_context = "📊 **Average Reliability** - Typical lifespan for this vehicle class"
+    elif expected_lifespan >= 10:
+        reliability_context = "⚠️ **Below Average Reliability** - Higher maintenance costs expected as it ages"
+    else:
+        reliability_context = "🚨 **Lower Reliability** - Consider replacement planning due to shorter expected lifespan"
 
-years = st.slider(
-    "Years to Forecast",
-    1, max_years, min(5, max_years),
-    key="years",
-    help=f"Select how many years to forecast. You can forecast up to {max_years} years, even beyond the vehicle's expected lifespan of {expected_lifespan} years."
-)
+    st.markdown(reliability_context)
+
+    years = st.slider(
+        "Years to Forecast",
+        1, max_years, min(5, max_years),
+        key="years",
+        help=f"Select how many years to forecast. You can forecast up to {max_years} years, even beyond the vehicle's expected lifespan of {expected_lifespan} years."
+    )
+
+    submitted = st.form_submit_button("🔮 Predict Ownership Costs", type="primary")
+
+# Results stay on screen across unrelated reruns (e.g. the 30-year toggle) as long
+# as the selections outside the form still match the ones that were submitted.
+profile_section("Forecast")
+forecast_selection = (make, model, model_year, state, use_custom_rates, has_ev_tou)
+if submitted and start_age > user_age:
+    st.error(f"You can't have started driving at {start_age} if you are {user_age}. "
+             "Check your age and the age you started driving, then submit again.")
+    st.session_state.pop('forecast_selection', None)
+elif submitted:
+    st.session_state['forecast_selection'] = forecast_selection
+elif st.session_state.get('forecast_selection') not in (None, forecast_selection):
+    del st.session_state['forecast_selection']
+
+show_results = st.session_state.get('forecast_selection') == forecast_selection
+first_year_future = None
+if show_results:
+    # Run while the warnings and the 30-year projection below are drawn. The
+    # one-year forecast finishes first and fills the headline until the full one is done.
+    if years > 1:
+        first_year_future = submit_forecast(
+            make, model, model_year, mileage, avg_mpy,
+            mpg, your_price, state, 1, loan_amount, irate, lt_years,
+            user_age, start_age, msrp, driving_style, terrain
+        )
+    forecast_future = submit_forecast(
+        make, model, model_year, mileage, avg_mpy,
+        mpg, your_price, state, years, loan_amount, irate, lt_years,
+        user_age, start_age, msrp, driving_style, terrain
+    )
 
 # Enhanced warnings based on forecast duration
+profile_section("Lifespan Warnings")
 final_vehicle_age = vehicle_age + years
 years_beyond_lifespan = max(0, final_vehicle_age - expected_lifespan)
 
@@ -1335,76 +763,72 @@ if years_beyond_lifespan > 0:
     - **Major repair risk**: Budget for potential engine/transmission replacement
     """)
 
-# Add lifetime cost estimate with extended forecasting
-if st.checkbox("📈 Show Full 30-Year Ownership Projection", help="See complete ownership costs if you kept this vehicle for 30 years total"):
+# Add lifetime cost estimate with extended forecasting. Expander contents are
+# built on every rerun whether or not they are open, so the projection sits
+# behind a toggle and is only computed once the user asks for it, from the
+# inputs of the submitted forecast. It starts in the background here and fills
+# its expander after the main results are drawn.
+profile_section("30-Year Projection")
+lifetime_future = None
+show_lifetime = st.toggle("📈 Show Full 30-Year Ownership Projection", key="show_lifetime", help="See complete ownership costs if you kept this vehicle for 30 years total")
+if show_lifetime and not show_results:
+    st.caption("Submit the cost inputs above to see the 30-year projection.")
+elif show_lifetime:
+    lifetime_box = st.expander("🔮 Full 30-Year Ownership Projection", expanded=True)
     max_possible_years = min(30 - vehicle_age, 30)
     if max_possible_years > 0:
-        lifetime_summary, lifetime_df, _ = predict_5_years_cost(
+        lifetime_future = submit_forecast(
             make, model, model_year, mileage, avg_mpy,
             mpg, your_price, state, max_possible_years, loan_amount, irate, lt_years,
             user_age, start_age, msrp, driving_style, terrain
         )
-        
-        if lifetime_summary:
-            lifetime_total = lifetime_df['Total Cost'].sum()
-            lifetime_avg = lifetime_total / max_possible_years
-            
-            # Split costs by normal vs extended periods
-            normal_years = min(max_possible_years, expected_lifespan - vehicle_age)
-            extended_years = max(0, max_possible_years - normal_years)
-            
-            if extended_years > 0:
-                normal_cost = lifetime_df['Total Cost'].iloc[:normal_years].sum() if normal_years > 0 else 0
-                extended_cost = lifetime_df['Total Cost'].iloc[normal_years:].sum() if extended_years > 0 else 0
-                
-                st.warning(f"""
-                **🔮 Full 30-Year Projection ({max_possible_years} years remaining):**
-                - **Total Cost:** ${lifetime_total:,.0f}
-                - **Normal Years (1-{normal_years}):** ${normal_cost:,.0f} (${normal_cost/normal_years:,.0f}/year)
-                - **Extended Years ({normal_years+1}-{max_possible_years}):** ${extended_cost:,.0f} (${extended_cost/extended_years:,.0f}/year)
-                - **Cost Per Mile:** ${(lifetime_total / (avg_mpy * max_possible_years)):.3f}
-                """)
-            else:
-                st.success(f"""
-                **🔮 Lifetime Ownership Estimate ({max_possible_years} years):**
-                - **Total Cost:** ${lifetime_total:,.0f}
-                - **Average Annual Cost:** ${lifetime_avg:,.0f}
-                - **Cost Per Mile:** ${(lifetime_total / (avg_mpy * max_possible_years)):.3f}
-                """)
-            
-            # Show major milestones including beyond-lifespan issues
-            major_milestones = []
-            for i, row in lifetime_df.iterrows():
-                year_num = i + 1
-                activities = row['Activities']
-                vehicle_age_at_year = vehicle_age + year_num
-                
-                if ('Major Overhaul' in activities or 'Timing Belt' in activities or 
-                    'Transmission' in activities or vehicle_age_at_year > expected_lifespan):
-                    milestone_warning = ""
-                    if vehicle_age_at_year > expected_lifespan:
-                        milestone_warning = " ⚠️ BEYOND EXPECTED LIFESPAN"
-                    major_milestones.append(f"Year {year_num}: {activities} (${row['Maintenance Cost']:,.0f}){milestone_warning}")
-            
-            if major_milestones:
-                st.warning("**🔧 Major Maintenance & Repair Milestones:**")
-                for milestone in major_milestones[:5]:  # Show first 5 major items
-                    st.markdown(f"• {milestone}")
-                if len(major_milestones) > 5:
-                    st.caption(f"...and {len(major_milestones) - 5} more major maintenance items")
 
-if st.button("🔮 Predict Ownership Costs", type="primary"):
-    # Run the prediction
-    summary, chart_df, intersection = predict_5_years_cost(
-        make, model, model_year, mileage, avg_mpy,
-        mpg, your_price, state, years, loan_amount, irate, lt_years,
-        user_age, start_age, msrp, driving_style, terrain
-    )
+if show_results:
+    # Headline figures go out first: from the first-year forecast if the full one
+    # is still running, then replaced in place by the full-period figures. The
+    # table, maintenance details and recommendations below wait for the full forecast.
+    profile_section("Financial Analysis")
+    st.header("💵 Financial Analysis")
+    headline, headline_note = st.empty(), st.empty()
+    if first_year_future is not None and not forecast_future.done():
+        with st.spinner("Forecasting first year..."):
+            first_year = first_year_future.result()
+        if first_year.years:
+            render_headline(headline, headline_note, first_year, gross, forecast_years=years)
+
+    with st.spinner("Forecasting costs..."):
+        result = forecast_future.result()
     
-    if not summary:
+    if not result.years:
+        headline.empty()
+        headline_note.empty()
         st.error("Prediction failed—check inputs.")
         st.stop()
 
+    chart_df = result.to_frame()
+    render_headline(headline, headline_note, result, gross)
+    total = chart_df['Total Cost'].sum()
+    avg_annual = total / years
+    pct_inc = (avg_annual / gross) * 100
+    avg_insurance = chart_df['Insurance Premium'].mean()
+
+    # Annual electricity cost of every charging scenario, in one batched call
+    charging_costs = {}
+    if is_ev:
+        if custom_rates_dict.get('use_custom', False):
+            custom_rates = {
+                'residential': custom_rates_dict['residential'],
+                'ev_rate': custom_rates_dict['ev_rate'],
+                'public': custom_rates_dict['public'],
+                'has_ev_rate': custom_rates_dict['has_ev_rate']
+            }
+        else:
+            custom_rates = None
+        charging_costs = {
+            name: float(cost[0])
+            for name, cost in charging_scenarios([make], [model], [state], avg_mpy, custom_rates).items()
+        }
+
     # Refresh mileage & scheduled activities
     chart_df['Mileage'] = [
         mileage + avg_mpy * i
@@ -1412,24 +836,10 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
     ]
     
     # Show forecast table
+    profile_section("Detailed Forecast Results")
     st.header("📊 Detailed Forecast Results")
     
-    # Configure pandas display options for better text wrapping
-    pd.set_option('display.max_colwidth', None)
-    
-    # Style the dataframe for better readability
-    styled_df = chart_df.style.set_properties(**{
-        'text-align': 'left',
-        'white-space': 'pre-wrap',
-        'word-wrap': 'break-word',
-        'max-width': '300px'
-    }, subset=['Activities'])
-    
-    styled_df = styled_df.set_properties(**{
-        'text-align': 'right'
-    }, subset=['Maintenance Cost', 'Fuel/Electricity Cost', 'Loan Payment', 'Depreciation Cost', 'Total Cost', 'Car Value', 'Insurance Premium'])
-    
-    styled_df = styled_df.format({
+    display_df, column_config = display_table(chart_df, {
         'Maintenance Cost': '${:,.0f}',
         'Fuel/Electricity Cost': '${:,.0f}',
         'Loan Payment': '${:,.0f}',
@@ -1440,10 +850,42 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
         'Mileage': '{:,.0f}'
     })
     
-    st.dataframe(styled_df, use_container_width=True, height=400)
+    with span('ui.forecast_table'):
+        st.dataframe(display_df, use_container_width=True, height=400, column_config={
+            **column_config, 'Activities': st.column_config.TextColumn(width="large")
+        })
     
     fuel_label = "electricity" if is_ev else "fuel"
     st.caption(f"Includes maintenance, {fuel_label}, registration, loan payments, and insurance premiums.")
+
+    # Charts are drawn from the forecast arrays; tabs, legend clicks and the view
+    # buttons all switch client-side without rerunning the script
+    profile_section("Charts")
+    this_year = datetime.now().year
+    breakdown_tab, value_tab, compare_tab = st.tabs(["📊 Cost Breakdown", "📉 Value vs Cost", "⚡ EV vs Gas"])
+    with breakdown_tab:
+        st.plotly_chart(cost_breakdown_figure(result, this_year), use_container_width=True)
+    with value_tab:
+        st.plotly_chart(value_cost_figure(result, this_year), use_container_width=True)
+        if result.intersection_label:
+            st.caption(f"Maintenance first exceeds the car's value in {result.intersection_label}.")
+    with compare_tab:
+        compared = st.multiselect(
+            "Compare with", list(vehicle_by_label), key="compare_vehicles",
+            default=[f"{mk} {md}" for mk, md in comparison_vehicles(make, model, is_ev)],
+            help="Other vehicles forecast with the same price, loan and driving inputs"
+        )
+        vehicles = [vehicle_by_label[label] for label in compared]
+        futures = [submit_forecast(
+            mk, md, model_year, mileage, avg_mpy, average_mpg.get(mk, {}).get(md, 25), your_price, state,
+            years, loan_amount, irate, lt_years, user_age, start_age, msrp_data.get((mk, md)), driving_style, terrain
+        ) for mk, md in vehicles]
+        with st.spinner("Forecasting comparisons..."):
+            comparisons = [future.result() for future in futures]
+        st.plotly_chart(comparison_figure(
+            [f"{make} {model} (yours)"] + compared, [result] + comparisons, this_year
+        ), use_container_width=True)
+        st.caption("Cumulative cost including insurance. EVs are solid green, gas vehicles dashed red.")
     
     # Add expandable section for detailed maintenance breakdown
     with st.expander("🔧 Detailed Maintenance Activities by Year"):
@@ -1452,13 +894,11 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
         
         for i, row in chart_df.iterrows():
             year_num = i + 1
-            activities = row['Activities']
+            activity_list = result.activity_list(i)
             cost = row['Maintenance Cost']
             vehicle_age_at_year = current_vehicle_age + year_num
             
-            if activities and activities != 'None':
-                # Split activities into a readable list
-                activity_list = [activity.strip() for activity in activities.split(',')]
+            if activity_list:
                 
                 # Create aging context
                 aging_context = ""
@@ -1512,26 +952,8 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
             (${early_years_avg:,.0f} early vs ${later_years_avg:,.0f} later) due to vehicle aging.
             """)
 
-    # Calculate totals & percentages
-    total = chart_df['Total Cost'].sum()
-    avg_annual = total / years
-    pct_inc = (avg_annual / gross) * 100
-    avg_insurance = chart_df['Insurance Premium'].mean()
-
-    # Financial Analysis
-    st.header("💵 Financial Analysis")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Total Cost Over Period", f"${total:,.0f}")
-    with col2:
-        st.metric("Average Annual Cost", f"${avg_annual:,.0f}")
-    with col3:
-        st.metric("% of Gross Income", f"{pct_inc:.1f}%")
-    with col4:
-        st.metric("Est. Annual Insurance", f"${avg_insurance:,.0f}")
-    
     # Additional aging-related metrics
+    profile_section("Financial Analysis")
     if years >= 5:
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -1591,24 +1013,18 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
                 st.info("📊 **Keeping current vehicle may be economical** - High replacement cost relative to ownership costs")
 
     # Financial recommendations
+    profile_section("Financial Recommendations")
     st.header("📈 Financial Recommendations")
     
     # Calculate loan payment for analysis
-    r = irate / 100 if irate > 0 else 0
-    if loan_amount > 0 and r > 0:
-        monthly_loan_payment = (loan_amount * (r/12)) / (1 - (1 + r/12) ** (-lt_years * 12))
-    elif loan_amount > 0:
-        monthly_loan_payment = loan_amount / (lt_years * 12)
-    else:
-        monthly_loan_payment = 0
-    
+    monthly_loan_payment = float(monthly_payment(loan_amount, irate, lt_years))
     annual_loan_payment = monthly_loan_payment * 12
     
     # Total transportation cost analysis (the real 10% rule)
     recommended_max_annual = gross * 0.10  # 10% of gross income for total transportation
     
     # Calculate costs without loan payments to see underlying vehicle costs
-    annual_without_loan = avg_annual - annual_loan_payment if loan_amount > 0 else avg_annual
+    annual_without_loan = avg_annual - chart_df['Loan Payment'].sum() / years if loan_amount > 0 else avg_annual
     
     # Format all numbers properly before display
     avg_annual_formatted = f"${avg_annual:,.0f}"
@@ -1789,10 +1205,7 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
             
             # Calculate target vehicle price
             target_annual_payment = recommended_max_annual * 0.4  # 40% of transport budget for payments
-            if r > 0:
-                target_loan_amount = target_annual_payment * (1 - (1 + r) ** -lt_years) / r
-            else:
-                target_loan_amount = target_annual_payment * lt_years
+            target_loan_amount = float(max_principal(target_annual_payment / 12, irate, lt_years))
             
             target_vehicle_price = target_loan_amount + (your_price - loan_amount)  # Add down payment back
             
@@ -1824,12 +1237,7 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
                 st.markdown("• Reduce daily driving or consider a more efficient EV")
                 
                 # Show potential savings from better charging
-                if custom_rates_dict.get('use_custom', False):
-                    current_rates = custom_rates_dict
-                else:
-                    current_rates = None
-                    
-                home_only_cost = calculate_ev_electricity_cost(make, model, avg_mpy, state, 'home', current_rates)
+                home_only_cost = charging_costs['home']
                 if avg_fuel > home_only_cost:
                     charging_savings = avg_fuel - home_only_cost
                     st.success(f"💡 **Home-only charging could save ${charging_savings:,.0f}/year**")
@@ -1958,21 +1366,11 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
     
     # Electric vehicle specific analysis
     if is_ev:
+        profile_section("EV Cost Analysis")
         st.header("🔋 Electric Vehicle Cost Analysis")
         
-        # Get custom rates if available from the UI
-        if custom_rates_dict.get('use_custom', False):
-            custom_rates = {
-                'residential': custom_rates_dict['residential'],
-                'ev_rate': custom_rates_dict['ev_rate'],
-                'public': custom_rates_dict['public'],
-                'has_ev_rate': custom_rates_dict['has_ev_rate']
-            }
-        else:
-            custom_rates = None
-        
         # Calculate detailed electricity costs
-        annual_electricity = calculate_ev_electricity_cost(make, model, avg_mpy, state, charging_pref, custom_rates)
+        annual_electricity = charging_costs.get(charging_pref, charging_costs['mixed'])
         
         # EV vs Gas comparison
         col1, col2 = st.columns(2)
@@ -2005,9 +1403,9 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
         st.subheader("📊 Charging Cost Breakdown")
         
         # Calculate costs for different charging methods using custom rates if available
-        home_cost = calculate_ev_electricity_cost(make, model, avg_mpy, state, 'home', custom_rates)
-        public_cost = calculate_ev_electricity_cost(make, model, avg_mpy, state, 'public', custom_rates)
-        mixed_cost = calculate_ev_electricity_cost(make, model, avg_mpy, state, 'mixed', custom_rates)
+        home_cost = charging_costs['home']
+        public_cost = charging_costs['public']
+        mixed_cost = charging_costs['mixed']
         
         charging_df = pd.DataFrame({
             'Charging Method': ['Home Only', 'Public Only', 'Mixed (70% Home)'],
@@ -2034,7 +1432,30 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
                 - EV Rate: ${default_rates['ev_rate']:.3f}/kWh
                 - Public Rate: $0.35/kWh (National Average)
                 """)
-        
+
+        # Home charging priced hour by hour against the state's time-of-use tariff
+        if state in time_of_use_rates:
+            st.subheader("⏰ Time-of-Use Charging Schedule")
+            tou = time_of_use_rates[state]
+            schedules = list(CHARGING_PROFILES)
+            simulation = simulate_charging(
+                [make] * len(schedules), [model] * len(schedules), [state] * len(schedules),
+                avg_mpy, schedules
+            )
+            tou_df = pd.DataFrame({
+                'Charging Schedule': [PROFILE_LABELS[name] for name in schedules],
+                'Annual Cost': simulation.annual_cost,
+                'Peak kWh': simulation.peak_kwh,
+                'Off-Peak kWh': simulation.off_peak_kwh,
+                'Peak Share': simulation.peak_share
+            })
+            tou_table, column_config = display_table(tou_df, {
+                'Annual Cost': '${:,.0f}', 'Peak kWh': '{:,.0f}', 'Off-Peak kWh': '{:,.0f}', 'Peak Share': '{:.0%}'
+            })
+            st.dataframe(tou_table, column_config=column_config, use_container_width=True, hide_index=True)
+            st.caption(f"Home charging on {state}'s TOU plan: ${tou['peak']:.2f}/kWh weekdays "
+                       f"{PEAK_START}:00-{PEAK_END}:00, ${tou['off_peak']:.2f}/kWh otherwise.")
+
         # EV efficiency details
         ev_info = get_ev_charging_info(make, model, state)
         if ev_info:
@@ -2052,6 +1473,11 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
             with col3:
                 full_charges_per_year = avg_mpy / ev_info['range']
                 st.metric("Full Charges/Year", f"{full_charges_per_year:.0f}")
+
+            soh, capacity, _ = battery_curves(ev_info['battery_size'], ev_info['range'],
+                                              datetime.now().year - model_year, mileage, avg_mpy, years)
+            st.caption(f"🔋 Projected battery health after {years} years: {soh[-1]:.0%} "
+                       f"({capacity[-1]:.0f} kWh usable, ~{ev_info['range'] * soh[-1]:.0f} miles of range)")
         
         st.caption("""
         **EV Cost Calculation Notes:**
@@ -2064,6 +1490,7 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
     
     else:
         # Gas vehicle fuel analysis
+        profile_section("Fuel Cost Analysis")
         total_fuel_cost = chart_df['Fuel/Electricity Cost'].sum()
         gallons_per_year = avg_mpy / mpg
         total_gallons = gallons_per_year * years
@@ -2090,4 +1517,149 @@ if st.button("🔮 Predict Ownership Costs", type="primary"):
     - Annual mileage and state cost factors
     
     Actual premiums vary significantly based on your driving record, coverage levels, and insurance provider.
-    """)
\ No newline at end of file
+    """)
+
+# ─── 30-year projection ────────────────────────────────────────────────────────
+if lifetime_future is not None:
+    profile_section("30-Year Projection")
+    with lifetime_box:
+        with st.spinner("Projecting lifetime costs..."):
+            lifetime = lifetime_future.result()
+    
+        if lifetime.years:
+            lifetime_df = lifetime.to_frame()
+            lifetime_total = lifetime_df['Total Cost'].sum()
+            lifetime_avg = lifetime_total / max_possible_years
+        
+            # Split costs by normal vs extended periods
+            normal_years = min(max_possible_years, expected_lifespan - vehicle_age)
+            extended_years = max(0, max_possible_years - normal_years)
+        
+            if extended_years > 0:
+                normal_cost = lifetime_df['Total Cost'].iloc[:normal_years].sum() if normal_years > 0 else 0
+                extended_cost = lifetime_df['Total Cost'].iloc[normal_years:].sum() if extended_years > 0 else 0
+            
+                st.warning(f"""
+                **🔮 Full 30-Year Projection ({max_possible_years} years remaining):**
+                - **Total Cost:** ${lifetime_total:,.0f}
+                - **Normal Years (1-{normal_years}):** ${normal_cost:,.0f} (${normal_cost/normal_years:,.0f}/year)
+                - **Extended Years ({normal_years+1}-{max_possible_years}):** ${extended_cost:,.0f} (${extended_cost/extended_years:,.0f}/year)
+                - **Cost Per Mile:** ${(lifetime_total / (avg_mpy * max_possible_years)):.3f}
+                """)
+            else:
+                st.success(f"""
+                **🔮 Lifetime Ownership Estimate ({max_possible_years} years):**
+                - **Total Cost:** ${lifetime_total:,.0f}
+                - **Average Annual Cost:** ${lifetime_avg:,.0f}
+                - **Cost Per Mile:** ${(lifetime_total / (avg_mpy * max_possible_years)):.3f}
+                """)
+        
+            # Show major milestones including beyond-lifespan issues
+            major_milestones = []
+            for i, row in lifetime_df.iterrows():
+                year_num = i + 1
+                activities = row['Activities']
+                vehicle_age_at_year = vehicle_age + year_num
+            
+                if ('Major Overhaul' in activities or 'Timing Belt' in activities or 
+                    'Transmission' in activities or vehicle_age_at_year > expected_lifespan):
+                    milestone_warning = ""
+                    if vehicle_age_at_year > expected_lifespan:
+                        milestone_warning = " ⚠️ BEYOND EXPECTED LIFESPAN"
+                    major_milestones.append(f"Year {year_num}: {activities} (${row['Maintenance Cost']:,.0f}){milestone_warning}")
+        
+            if major_milestones:
+                st.warning("**🔧 Major Maintenance & Repair Milestones:**")
+                for milestone in major_milestones[:5]:  # Show first 5 major items
+                    st.markdown(f"• {milestone}")
+                if len(major_milestones) > 5:
+                    st.caption(f"...and {len(major_milestones) - 5} more major maintenance items")
+
+# ─── Household portfolio ───────────────────────────────────────────────────────
+profile_section("Household Portfolio")
+st.header("🏠 Household Portfolio")
+st.markdown("*Forecast all of your household's vehicles together and check the combined cost against your income*")
+
+# Editor column -> forecast_household field
+HOUSEHOLD_FIELDS = {
+    'Make': 'make', 'Model': 'model', 'Model Year': 'model_year', 'Mileage': 'current_mileage',
+    'Miles/Year': 'avg_mpy', 'MPG': 'mpg', 'Price': 'purchase_price', 'Loan': 'loan_amount',
+    'Rate (%)': 'irate', 'Term (years)': 'lt_years', 'Driver Age': 'user_age',
+    'Driving Since Age': 'start_age', 'Buy in Year': 'purchase_year', 'Sell after Year': 'sell_year'
+}
+
+with st.expander("🚙 Household Vehicles", expanded=False):
+    if 'household_seed' not in st.session_state:
+        # Seed the table once with the vehicle above so later edits aren't reset
+        st.session_state['household_seed'] = pd.DataFrame([{
+            'Make': make, 'Model': model, 'Model Year': model_year, 'Mileage': mileage,
+            'Miles/Year': avg_mpy, 'MPG': mpg, 'Price': your_price, 'Loan': loan_amount,
+            'Rate (%)': irate, 'Term (years)': lt_years, 'Driver Age': user_age,
+            'Driving Since Age': start_age, 'Buy in Year': 1, 'Sell after Year': float('nan')
+        }])
+
+    household_vehicles = st.data_editor(
+        st.session_state['household_seed'],
+        num_rows="dynamic",
+        hide_index=True,
+        key="household_vehicles",
+        column_config={
+            'Make': st.column_config.SelectboxColumn(options=sorted(car_makes_and_models), required=True),
+            'Model': st.column_config.SelectboxColumn(
+                options=sorted({m for models in car_makes_and_models.values() for m in models}), required=True
+            ),
+            'Buy in Year': st.column_config.NumberColumn(min_value=1, max_value=30, step=1,
+                                                         help="Household year the vehicle is bought (1 = owned now)"),
+            'Sell after Year': st.column_config.NumberColumn(min_value=1, max_value=30, step=1,
+                                                             help="Leave empty to keep it for the whole forecast"),
+        }
+    )
+    household_years = st.slider("Household Forecast Years", 1, 30, 10, key="household_years")
+
+    if st.button("🏠 Forecast Household", key="forecast_household"):
+        vehicles = household_vehicles.dropna(subset=['Make', 'Model']).rename(columns=HOUSEHOLD_FIELDS)
+        mismatched = [f"{v['make']} {v['model']}" for v in vehicles.to_dict('records')
+                      if v['model'] not in car_makes_and_models.get(v['make'], [])]
+        required = [field for column, field in HOUSEHOLD_FIELDS.items() if column != 'Sell after Year']
+        if vehicles.empty:
+            st.warning("Add at least one vehicle to forecast.")
+        elif vehicles[required].isna().any(axis=None):
+            st.warning("Fill in every column except 'Sell after Year' for each vehicle.")
+        elif mismatched:
+            st.error(f"Unknown make/model combination: {', '.join(mismatched)}")
+        else:
+            try:
+                household = forecast_household(vehicles, state, household_years, gross)
+            except ValueError as e:
+                st.error(f"Household forecast failed—check inputs. ({e})")
+            else:
+                household_df = household.to_frame()
+                over_budget = int(household.over_budget.sum())
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Average Annual Cost", f"${household.annual_total.mean():,.0f}")
+                with col2:
+                    st.metric("Peak Share of Income", f"{household.income_share.max():.1%}")
+                with col3:
+                    st.metric("Years Over 10% Rule", f"{over_budget} of {household.years}")
+
+                st.bar_chart(household_df.set_index('Year')[household.labels])
+                household_table, column_config = display_table(household_df, {
+                    **{label: '${:,.0f}' for label in household.labels},
+                    'Insurance Premiums': '${:,.0f}', 'Household Total': '${:,.0f}',
+                    'Share of Income': '{:.1%}'
+                })
+                st.dataframe(household_table, column_config=column_config, use_container_width=True, hide_index=True)
+                st.caption(f"Vehicle totals include maintenance, fuel/electricity, registration and loan payments "
+                           f"in the years each vehicle is owned. The 10% rule allows ${household.budget:,.0f}/year.")
+                if over_budget:
+                    st.warning(f"⚠️ Combined vehicle costs exceed 10% of gross income in {over_budget} "
+                               f"of {household.years} years.")
+                else:
+                    st.success("✅ Combined vehicle costs stay within 10% of gross income every year.")
+
+# ─── Cache statistics ──────────────────────────────────────────────────────────
+profile_section("Cache Statistics")
+render_cache_stats()
+render_rerun_profiler()
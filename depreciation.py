@@ -0,0 +1,103 @@
+"""Vectorized vehicle depreciation.
+
+Values follow an exponential decay from the purchase price towards a floor:
+
+    value(t) = V0 * (1 - (1 - Vmin / V0) * (1 - exp(-a * t)))
+
+with ``t`` the elapsed years (clipped to 0..50). Near the end of a vehicle's
+expected lifespan the value is cut by up to a further 30%, never dropping below
+the scrap value. Every function broadcasts over its arguments, so a whole fleet
+can be revalued in one call, e.g. ``msrp[:, None]`` against ``years[None, :]``.
+
+``a`` and ``Vmin`` default to one global pair; when calibration.py has written
+``depreciation_params.json`` the per make/model, make or tier fit is used.
+"""
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+DECAY_RATE = 0.182          # a
+VALUE_FLOOR = 2000.0        # Vmin
+SCRAP_VALUE = 500
+MAX_ELAPSED_YEARS = 50
+
+PARAMS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'depreciation_params.json')
+
+# Largest argument np.exp can take without overflowing to inf
+_MAX_EXP_ARG = np.log(np.finfo(np.float64).max)
+
+
+@lru_cache(maxsize=None)
+def load_params(path=PARAMS_PATH):
+    """Calibrated lookup table, or None when calibration hasn't been run"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def depreciation_params(make, model, tier):
+    """``(a, Vmin)`` for a vehicle, from the most specific calibrated group available"""
+    table = load_params()
+    if table is None:
+        return DECAY_RATE, VALUE_FLOOR
+    for level, key in (('make_model', f"{make}|{model}"), ('make', make), ('tier', tier)):
+        fit = table.get(level, {}).get(key)
+        if fit:
+            return fit[0], fit[1]
+    return tuple(table.get('default', (DECAY_RATE, VALUE_FLOOR)))
+
+
+def decay_factor(t, a=DECAY_RATE):
+    """exp(-a * t), returning 0 where the exponent would overflow"""
+    x = -np.asarray(a, dtype=np.float64) * t
+    return np.where(x > _MAX_EXP_ARG, 0.0, np.exp(np.minimum(x, _MAX_EXP_ARG)))
+
+
+def residual_values(msrp, model_year, target_year, Vmin=VALUE_FLOOR, a=DECAY_RATE, decimals=2):
+    """Residual value of vehicles bought at ``msrp`` in ``target_year``.
+
+    Vehicles with a non-positive ``msrp`` are worth 0. Pass ``decimals=None``
+    to skip rounding.
+    """
+    V0 = np.asarray(msrp, dtype=np.float64)
+    elapsed = np.clip(np.asarray(target_year) - np.asarray(model_year), 0, MAX_ELAPSED_YEARS)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = V0 * (1 - (1 - Vmin / V0) * (1 - decay_factor(elapsed, a)))
+    values = np.where(V0 > 0, values, 0.0)
+    return values if decimals is None else np.round(values, decimals)
+
+
+def end_of_life_values(values, vehicle_age, lifespan):
+    """Apply the extra depreciation for vehicles past 90% of their expected lifespan"""
+    values = np.asarray(values, dtype=np.float64)
+    lifespan = np.asarray(lifespan, dtype=np.float64)
+    threshold = lifespan * 0.9
+    # Ramps from 0 at 90% of lifespan to 1 at the full lifespan
+    factor = np.minimum((vehicle_age - threshold) / (lifespan * 0.1), 1.0)
+    adjusted = np.maximum(values - values * 0.3 * factor, SCRAP_VALUE)
+    return np.where(vehicle_age > threshold, adjusted, values)
+
+
+def value_curve(purchase_price, model_year, current_vehicle_age, lifespan, years,
+                Vmin=VALUE_FLOOR, a=DECAY_RATE):
+    """Vehicle value at the end of forecast years 1..``years``.
+
+    Scalar arguments give a 1-D curve; arrays of shape ``(N,)`` (including
+    per-vehicle ``Vmin`` and ``a``) give an ``(N, years)`` matrix, one row per vehicle.
+    """
+    i = np.arange(1, years + 1)
+    model_year = np.asarray(model_year)[..., None]
+    values = residual_values(np.asarray(purchase_price)[..., None], model_year, model_year + i,
+                             np.asarray(Vmin)[..., None], np.asarray(a)[..., None])
+    return end_of_life_values(values, np.asarray(current_vehicle_age)[..., None] + i,
+                              np.asarray(lifespan)[..., None])
+
+
+def depreciation_costs(purchase_price, values):
+    """Year-over-year drop in value given the curve from value_curve"""
+    values = np.asarray(values, dtype=np.float64)
+    start = np.broadcast_to(np.asarray(purchase_price, dtype=np.float64)[..., None], values.shape[:-1] + (1,))
+    return np.concatenate([start, values[..., :-1]], axis=-1) - values
@@ -0,0 +1,392 @@
+"""Forecasting logic for the cost estimator, kept free of any Streamlit imports.
+
+Forecasts use the NumPy port of the maintenance model in linear_model.py when
+its exported coefficients are present, so scikit-learn is never imported. Set
+CAR_ESTIMATOR_MODEL_BACKEND=sklearn to use the original pickles instead. If the
+pickles have changed since the coefficients were exported, 'auto' uses the
+pickles (with a warning) and 'numpy' refuses to load.
+"""
+import os
+import pickle
+import time
+import warnings
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from aging import aging_lookup
+from amortization import annual_schedule
+from battery import SERVICE_STATE_OF_HEALTH, battery_curves, battery_specs
+from depreciation import (
+    DECAY_RATE, VALUE_FLOOR, depreciation_costs, depreciation_params, residual_values, value_curve
+)
+from ev_costs import CHARGING_SHARES, electricity_costs, rate_arrays, vehicle_charging_arrays
+from fingerprint import fingerprint
+from forecast_result import ACTIVITY_BITS, AGE_ACTIVITIES, ForecastBatch
+from insurance import rate_premiums, territory_factors
+from linear_model import COEFFICIENTS_PATH, FEATURES, coefficients_stale, load_linear_model
+from metrics import FORECAST_SECONDS, FORECASTS, MODEL_INFO, MODEL_LOAD_SECONDS
+from profiling import span, stages
+from reference_data import (
+    tier_multipliers, fuel_requirements, state_fuel_prices, vehicle_lifespan,
+    state_electricity_rates, ev_charging_data, time_of_use_rates,
+    maintenance_schedule, ev_maintenance_schedule, maintenance_costs,
+    state_cost_multipliers
+)
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 'numpy' (exported coefficients), 'sklearn' (pickles) or 'auto' (numpy if exported)
+MODEL_BACKEND = os.environ.get('CAR_ESTIMATOR_MODEL_BACKEND', 'auto')
+
+PARTS_MULTIPLIERS = {'Luxury': 1.8, 'Midrange': 1.2, 'Economy': 1.0}
+# Maintenance intervals are scaled by both of these
+DRIVING_STYLE_MULTIPLIERS = {'gentle': 1.2, 'normal': 1.0, 'aggressive': 0.8}
+TERRAIN_MULTIPLIERS = {'flat': 1.0, 'hilly': 0.85}
+REGISTRATION_FEE = 150
+
+# ─── Load model and encoders ────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def load_models():
+    """Unpickle the maintenance model and label encoders once per process"""
+    with open(os.path.join(MODEL_DIR, 'car_maintenance_model.pkl'), 'rb') as f:
+        trained_model = pickle.load(f)
+    with open(os.path.join(MODEL_DIR, 'le_make.pkl'), 'rb') as f:
+        le_make = pickle.load(f)
+    with open(os.path.join(MODEL_DIR, 'le_model.pkl'), 'rb') as f:
+        le_model = pickle.load(f)
+    return trained_model, le_make, le_model
+
+class PickledCostModel:
+    """Adapter giving the pickled model and encoders the LinearCostModel interface"""
+
+    def __init__(self, trained_model, le_make, le_model):
+        self.trained_model = trained_model
+        self.le_make = le_make
+        self.le_model = le_model
+
+    def encode(self, make, model):
+        return self.le_make.transform([make])[0], self.le_model.transform([model])[0]
+
+    def predict(self, X):
+        import pandas as pd
+        return self.trained_model.predict(pd.DataFrame(X, columns=FEATURES))
+
+@lru_cache(maxsize=None)
+def model_backend():
+    """'numpy' or 'sklearn', as MODEL_BACKEND resolves"""
+    if MODEL_BACKEND not in ('auto', 'numpy', 'sklearn'):
+        raise ValueError(f"Unknown model backend {MODEL_BACKEND!r}")
+    if MODEL_BACKEND == 'sklearn' or (MODEL_BACKEND == 'auto' and not os.path.exists(COEFFICIENTS_PATH)):
+        return 'sklearn'
+    stale = coefficients_stale()
+    if stale:
+        message = (f"{', '.join(stale)} changed since {os.path.basename(COEFFICIENTS_PATH)} was exported; "
+                   f"re-export it with `python linear_model.py`")
+        if MODEL_BACKEND == 'numpy':
+            raise ValueError(message)
+        warnings.warn(f"{message}. Using the pickled model meanwhile.")
+        return 'sklearn'
+    return 'numpy'
+
+@lru_cache(maxsize=None)
+def load_cost_model():
+    """Maintenance model used by forecasts, picked according to MODEL_BACKEND"""
+    backend = model_backend()
+    start = time.perf_counter()
+    model = PickledCostModel(*load_models()) if backend == 'sklearn' else load_linear_model()
+    MODEL_LOAD_SECONDS.set(time.perf_counter() - start, backend=backend)
+    MODEL_INFO.set(1, backend=backend, fingerprint=model_fingerprint())
+    return model
+
+def model_fingerprint():
+    """Fingerprint of the model and reference data forecasts are computed from; see fingerprint.py"""
+    return fingerprint(model_backend())
+
+def get_vehicle_lifespan(make, model):
+    """Get expected vehicle lifespan in years"""
+    make_data = vehicle_lifespan.get(make, {'default': 12})
+    return make_data.get(model, make_data.get('default', 12))
+
+def get_max_forecast_years(make, model, current_year, model_year):
+    """Calculate maximum realistic forecast years - now allows up to 30 years"""
+    vehicle_age = current_year - model_year
+    # Allow forecasting up to 30 years total, regardless of expected lifespan
+    max_possible_age = 30
+    remaining_years = max(1, max_possible_age - vehicle_age)
+    
+    return min(remaining_years, 30)
+
+# ─── Electric Vehicle Functions ────────────────────────────────────────────────
+
+def is_electric_vehicle(make, model):
+    """Check if the vehicle is electric"""
+    return fuel_requirements.get(make, {}).get(model) == 'electric'
+
+def calculate_ev_electricity_cost(make, model, avg_mpy, state, charging_preference='mixed', custom_rates=None):
+    """
+    Calculate accurate electricity costs for EVs based on vehicle efficiency and state rates
+    
+    Args:
+        make, model: Vehicle identification
+        avg_mpy: Annual mileage
+        state: State for electricity rates
+        charging_preference: 'home', 'public', or 'mixed'
+        custom_rates: Optional dict with custom rates {'residential': rate, 'ev_rate': rate, 'public': rate, 'has_ev_rate': bool}
+    """
+    if not is_electric_vehicle(make, model):
+        return 0
+    
+    shares = CHARGING_SHARES.get(charging_preference, CHARGING_SHARES['mixed'])
+    efficiency, home_loss, public_loss = vehicle_charging_arrays([make], [model])
+    home_rate, public_rate = rate_arrays([state], custom_rates)
+    return float(electricity_costs(avg_mpy, efficiency, home_loss, public_loss,
+                                   home_rate, public_rate, *shares)[0])
+
+def get_ev_charging_info(make, model, state):
+    """Get detailed EV charging information for display"""
+    if not is_electric_vehicle(make, model):
+        return None
+    
+    ev_data = ev_charging_data.get(make, {}).get(model)
+    base_rate = state_electricity_rates.get(state, 0.15)
+    tou_rates = time_of_use_rates.get(state, {})
+    
+    info = {
+        'base_rate': base_rate,
+        'has_ev_rate': 'ev_rate' in tou_rates,
+        'ev_rate': tou_rates.get('ev_rate', base_rate),
+        'efficiency': ev_data.get('efficiency_miles_per_kwh', 3.0) if ev_data else 3.0,
+        'battery_size': ev_data.get('battery_kwh', 75) if ev_data else 75,
+        'range': ev_data.get('range_miles', 250) if ev_data else 250
+    }
+    
+    return info
+
+def get_scheduled_activities(start_mileage, end_mileage, is_ev=False, driving_style='normal', terrain='flat'):
+    """Get maintenance activities with adjustments for driving conditions"""
+    schedule = ev_maintenance_schedule if is_ev else maintenance_schedule
+    activities = []
+    
+    # Adjust intervals based on driving style and terrain
+    style_multiplier = DRIVING_STYLE_MULTIPLIERS[driving_style]
+    terrain_multiplier = TERRAIN_MULTIPLIERS[terrain]
+    
+    adjustment_factor = style_multiplier * terrain_multiplier
+    
+    for name, base_interval in schedule.items():
+        adjusted_interval = int(base_interval * adjustment_factor)
+        next_due = ((start_mileage // adjusted_interval) + 1) * adjusted_interval
+        if start_mileage < next_due <= end_mileage:
+            activities.append(name)
+    
+    return activities
+
+def estimate_vehicle_value(msrp,model_year,current_year,Vmin=VALUE_FLOOR,a=DECAY_RATE):
+    return float(residual_values(msrp, model_year, current_year, Vmin, a))
+
+def get_car_tier(make):
+    lux={'BMW','Mercedes-Benz','Audi','Lexus','Jaguar','Porsche','Volvo','Mini','McLaren','Acura','Cadillac','Lincoln','Infiniti'}
+    eco={'Toyota','Honda','Ford','Hyundai','Kia','Chevrolet','Subaru','Mazda','Nissan','Mitsubishi','Chrysler','Dodge'}
+    if make in lux: return 'Luxury'
+    if make in eco: return 'Economy'
+    return 'Midrange'
+
+def get_fuel_price(state, make, model, custom_price=None):
+    """Get appropriate fuel price based on vehicle requirements and state, with optional custom price"""
+    fuel_type = fuel_requirements.get(make, {}).get(model, 'regular')
+    if fuel_type == 'electric':
+        return 0  # No fuel cost for electric vehicles
+    
+    # Use custom price if provided, otherwise use state default
+    if custom_price is not None:
+        return custom_price
+    
+    state_prices = state_fuel_prices.get(state, {'regular': 3.50, 'premium': 4.20})
+    return state_prices.get(fuel_type, state_prices['regular'])
+
+def _per_vehicle(values, n, dtype=None):
+    """Broadcast a scalar or length-``n`` sequence to an ``(n,)`` array"""
+    return np.broadcast_to(np.asarray(values, dtype=dtype), (n,))
+
+def fuel_costs(makes, models, states, avg_mpys, mpgs, vehicle_age, energy, chargings='mixed'):
+    """Annual fuel or electricity cost per vehicle and forecast year.
+
+    ``vehicle_age`` and ``energy`` (the battery energy factor from battery_curves)
+    are ``(N, years)``; ``chargings`` names each EV's CHARGING_SHARES preference.
+    A degraded pack draws more energy per mile, and ICE vehicles lose 1%
+    efficiency per year after 10 years.
+    """
+    n = len(makes)
+    is_ev = np.array([is_electric_vehicle(make, model) for make, model in zip(makes, models)], dtype=bool)
+    shares = np.array([CHARGING_SHARES[charging] for charging in _per_vehicle(np.asarray(chargings, dtype=object), n)],
+                      dtype=np.float64).reshape(n, 2)
+    efficiency, home_loss, public_loss = vehicle_charging_arrays(makes, models)
+    home_rate, public_rate = rate_arrays(states)
+    ev_annual_cost = electricity_costs(avg_mpys, efficiency, home_loss, public_loss,
+                                       home_rate, public_rate, shares[:, 0], shares[:, 1])
+    fuel_price = np.array([get_fuel_price(state, make, model) for make, model, state in zip(makes, models, states)])
+    efficiency_loss = np.where(vehicle_age > 10, 1 + ((vehicle_age - 10) * 0.01), 1.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ice_fuel = (avg_mpys / mpgs)[:, None] * fuel_price[:, None] * efficiency_loss
+    return np.where(is_ev[:, None], ev_annual_cost[:, None] * energy, ice_fuel)
+
+def value_curves(makes, models, purchase_prices, model_years, current_vehicle_age, years):
+    """``(value, depreciation)`` per vehicle and forecast year, including the end-of-life drop"""
+    n = len(makes)
+    tiers = [get_car_tier(make) for make in makes]
+    lifespan = np.array([get_vehicle_lifespan(make, model) for make, model in zip(makes, models)])
+    decay_rate, value_floor = np.array([depreciation_params(make, model, tier)
+                                        for make, model, tier in zip(makes, models, tiers)], dtype=np.float64).reshape(n, 2).T
+    V = value_curve(purchase_prices, model_years, current_vehicle_age, lifespan, years, value_floor, decay_rate)
+    return V, depreciation_costs(purchase_prices, V)
+
+def insurance_premiums(user_ages, start_ages, msrps, avg_mpys, vehicle_age, states):
+    """Annual premium per vehicle and forecast year; ``vehicle_age`` is ``(N, years)``"""
+    driver_age = user_ages[:, None] + np.arange(1, vehicle_age.shape[-1] + 1) - 1
+    return rate_premiums(driver_age, driver_age - start_ages[:, None], msrps[:, None], avg_mpys[:, None],
+                         vehicle_age, territory_factors(states)[:, None])
+
+def forecast_batch(makes, models, model_years, current_mileages, avg_mpys,
+                   mpgs, purchase_prices, states,
+                   years, loan_amounts, irates, lt_years,
+                   user_ages, start_ages, msrps, driving_styles, terrains, start_year=None, chargings='mixed'):
+    """Forecasts for N vehicles over the same ``years`` in one pass, as a ForecastBatch.
+
+    Arguments mirror forecast_costs with one entry per vehicle (numeric ones
+    may also be scalars). ``start_year`` is the calendar year before forecast
+    year 1, this year by default. ``chargings`` is each EV's home/public
+    charging preference, a CHARGING_SHARES key.
+    """
+    start = time.perf_counter()
+    timer = stages('forecast')
+    makes, models, states = list(makes), list(models), list(states)
+    n = len(makes)
+    model_years, current_mileages, avg_mpys, mpgs, purchase_prices, loan_amounts, irates, lt_years, \
+        user_ages, start_ages = (_per_vehicle(x, n) for x in (
+            model_years, current_mileages, avg_mpys, mpgs, purchase_prices, loan_amounts, irates, lt_years,
+            user_ages, start_ages))
+    msrps = np.array([np.nan if m is None else m for m in _per_vehicle(np.asarray(msrps, dtype=object), n)],
+                     dtype=np.float64)
+    driving_styles = _per_vehicle(np.asarray(driving_styles, dtype=object), n).tolist()
+    terrains = _per_vehicle(np.asarray(terrains, dtype=object), n).tolist()
+    start_year = datetime.now().year if start_year is None else start_year
+    current_vehicle_age = _per_vehicle(start_year, n) - model_years
+
+    is_ev = np.array([is_electric_vehicle(make, model) for make, model in zip(makes, models)], dtype=bool)
+    cost_model = load_cost_model()
+    encoded = np.array([cost_model.encode(make, model) for make, model in zip(makes, models)],
+                       dtype=np.float64).reshape(n, 2)
+    timer.mark('encode')
+
+    # Enhanced tier multiplier for parts costs
+    tiers = [get_car_tier(make) for make in makes]
+    parts_multiplier = np.array([PARTS_MULTIPLIERS[tier] for tier in tiers])[:, None]
+    labor_multiplier = np.array([tier_multipliers[tier] for tier in tiers])[:, None]
+    state_mult = np.array([state_cost_multipliers[state] for state in states])[:, None]
+
+    # Get vehicle lifespan for aging calculations
+    lifespan = np.array([get_vehicle_lifespan(make, model) for make, model in zip(makes, models)])
+    expected_lifespan = lifespan[:, None]
+
+    i = np.arange(1, years + 1)
+    vehicle_age = current_vehicle_age[:, None] + i
+    fm = current_mileages[:, None] + avg_mpys[:, None] * i
+    start_mileage = current_mileages[:, None] + avg_mpys[:, None] * (i - 1)
+    ev_rows, ice_rows = is_ev[:, None], ~is_ev[:, None]
+
+    # Aging multiplier for maintenance costs and the age-triggered activities due, from the aging tables
+    aging_multiplier, age_due = aging_lookup(vehicle_age, expected_lifespan)
+
+    # Base maintenance: the trained model for ICE vehicles, a simplified curve for EVs (no oil changes, etc.)
+    base = 200 * (1 + (fm / 100000) * 0.5) * aging_multiplier
+    if not is_ev.all():
+        X = np.stack(np.broadcast_arrays(encoded[:, :1], encoded[:, 1:], model_years[:, None], fm,
+                                         avg_mpys[:, None]), axis=-1)[~is_ev]
+        base[~is_ev] = cost_model.predict(X.reshape(-1, len(FEATURES))).reshape(-1, years) * aging_multiplier[~is_ev]
+    timer.mark('predict')
+
+    # Scheduled and age-related activities, costed in the order they are listed
+    adjustment_factor = np.array([DRIVING_STYLE_MULTIPLIERS[style] * TERRAIN_MULTIPLIERS[terrain]
+                                  for style, terrain in zip(driving_styles, terrains)])[:, None]
+    act_cost = np.zeros((n, years))
+    Acts = np.zeros((n, years), dtype=np.uint64)
+
+    def add_activity(name, due):
+        nonlocal act_cost
+        labor_cost = maintenance_costs[name]['labor'] * labor_multiplier * state_mult * aging_multiplier
+        parts_cost = maintenance_costs[name]['parts'] * parts_multiplier * state_mult * aging_multiplier
+        act_cost = act_cost + np.where(due, labor_cost + parts_cost, 0.0)
+        Acts[due] |= np.uint64(ACTIVITY_BITS[name])
+
+    def scheduled(base_interval):
+        adjusted_interval = np.trunc(base_interval * adjustment_factor).astype(np.int64)
+        next_due = ((start_mileage // adjusted_interval) + 1) * adjusted_interval
+        return (start_mileage < next_due) & (next_due <= fm)
+
+    for name, base_interval in maintenance_schedule.items():
+        add_activity(name, ice_rows & scheduled(base_interval))
+    def age_rule(name):
+        return (age_due & np.uint64(ACTIVITY_BITS[name])) != 0
+
+    for name in AGE_ACTIVITIES:
+        add_activity(name, ice_rows & age_rule(name))
+    timer.mark('activities')
+
+    # The battery's state of health each year, and how much more energy per mile it draws
+    battery_kwh, range_miles = battery_specs(makes, models)
+    soh, _, energy = battery_curves(battery_kwh, range_miles, current_vehicle_age, current_mileages, avg_mpys, years)
+    timer.mark('ev_energy')
+
+    for name, base_interval in ev_maintenance_schedule.items():
+        add_activity(name, ev_rows & scheduled(base_interval))
+    add_activity('Battery Pack Degradation Service',
+                 ev_rows & (age_rule('Battery Pack Degradation Service') | (soh < SERVICE_STATE_OF_HEALTH)))
+    add_activity('Drive Unit Overhaul', ev_rows & age_rule('Drive Unit Overhaul'))
+    timer.mark('ev_activities')
+
+    M = base + act_cost
+
+    F = fuel_costs(makes, models, states, avg_mpys, mpgs, vehicle_age, energy, chargings)
+    timer.mark('fuel')
+
+    # Monthly amortization summed per forecast year; nothing is owed once the term ends
+    L = annual_schedule(loan_amounts, irates, lt_years, years).payment
+    T = M + F + REGISTRATION_FEE + L
+    timer.mark('loan')
+
+    V, D = value_curves(makes, models, purchase_prices, model_years, current_vehicle_age, years)
+    timer.mark('depreciation')
+
+    Insurance = insurance_premiums(user_ages, start_ages, msrps, avg_mpys, vehicle_age, states)
+    timer.mark('insurance')
+
+    n_ev = int(is_ev.sum())
+    FORECASTS.inc(n_ev, kind='ev', horizon=years)
+    FORECASTS.inc(n - n_ev, kind='ice', horizon=years)
+    FORECAST_SECONDS.observe(time.perf_counter() - start, horizon=years)
+    return ForecastBatch(is_ev, M, F, L, D, T, V, Insurance, Acts, model_fingerprint())
+
+def forecast_costs(make, model, model_year, current_mileage, avg_mpy,
+                   mpg, purchase_price, state,
+                   years, loan_amount, irate, lt_years,
+                   user_age, start_age, msrp, driving_style, terrain, start_year=None):
+    """Year-by-year ownership cost forecast as a compact ForecastResult, starting in ``start_year`` (default: this year)"""
+    return forecast_batch(
+        [make], [model], model_year, current_mileage, avg_mpy, mpg, purchase_price, [state],
+        years, loan_amount, irate, lt_years, user_age, start_age, [msrp], [driving_style], [terrain],
+        start_year=start_year
+    )[0]
+
+def predict_5_years_cost(make, model, model_year, current_mileage, avg_mpy,
+                        mpg, purchase_price, state,
+                        years, loan_amount, irate, lt_years,
+                        user_age, start_age, msrp, driving_style, terrain):
+    """Forecast as ``(summary text, display DataFrame, intersection label)``"""
+    result = forecast_costs(
+        make, model, model_year, current_mileage, avg_mpy, mpg, purchase_price, state,
+        years, loan_amount, irate, lt_years, user_age, start_age, msrp, driving_style, terrain
+    )
+    with span('forecast.frame'):
+        return result.to_legacy()
@@ -0,0 +1,87 @@
+"""Batched EV electricity cost engine.
+
+Rates and vehicle efficiency are resolved once into arrays, after which the
+annual cost for any number of vehicles, states, mileages and home/public
+charging splits is a single broadcast expression:
+
+    kWh = miles / efficiency
+    cost = kWh * home_share * (1 + home_loss) * home_rate
+         + kWh * public_share * (1 + public_loss) * public_rate
+"""
+import numpy as np
+
+from reference_data import ev_charging_data, state_electricity_rates, time_of_use_rates
+
+DEFAULT_RESIDENTIAL_RATE = 0.15
+DEFAULT_PUBLIC_RATE = 0.35
+
+# Used for EVs missing from ev_charging_data
+FALLBACK_EV_DATA = {
+    'efficiency_miles_per_kwh': 3.0,
+    'home_charging_loss': 0.12,
+    'public_charging_loss': 0.18
+}
+
+# (home share, public share) of each named charging preference
+CHARGING_SHARES = {
+    'home': (1.0, 0.0),
+    'public': (0.0, 1.0),
+    'mixed': (0.7, 0.3),
+}
+
+
+def vehicle_charging_arrays(makes, models):
+    """Efficiency (mi/kWh), home loss and public loss arrays for each vehicle"""
+    data = [ev_charging_data.get(make, {}).get(model) or FALLBACK_EV_DATA for make, model in zip(makes, models)]
+    return (np.array([d['efficiency_miles_per_kwh'] for d in data], dtype=np.float64),
+            np.array([d['home_charging_loss'] for d in data], dtype=np.float64),
+            np.array([d['public_charging_loss'] for d in data], dtype=np.float64))
+
+
+def rate_arrays(states, custom_rates=None):
+    """Home (EV or residential) and public charging rates for each state.
+
+    ``custom_rates`` overrides the state defaults the same way for every entry:
+    ``{'residential', 'ev_rate', 'public', 'has_ev_rate'}``.
+    """
+    n = len(states)
+    if custom_rates:
+        home = custom_rates['ev_rate'] if custom_rates['has_ev_rate'] else custom_rates['residential']
+        return np.full(n, home, dtype=np.float64), np.full(n, custom_rates['public'], dtype=np.float64)
+    home = []
+    for state in states:
+        base_rate = state_electricity_rates.get(state, DEFAULT_RESIDENTIAL_RATE)
+        home.append(time_of_use_rates.get(state, {}).get('ev_rate', base_rate))
+    return np.array(home, dtype=np.float64), np.full(n, DEFAULT_PUBLIC_RATE, dtype=np.float64)
+
+
+def electricity_costs(annual_miles, efficiency, home_loss, public_loss, home_rate, public_rate,
+                      home_share, public_share=None):
+    """Annual charging cost; every argument broadcasts.
+
+    ``public_share`` defaults to ``1 - home_share``.
+    """
+    if public_share is None:
+        public_share = 1 - np.asarray(home_share, dtype=np.float64)
+    kwh = np.asarray(annual_miles, dtype=np.float64) / efficiency
+    return (kwh * home_share * (1 + home_loss) * home_rate
+            + kwh * public_share * (1 + public_loss) * public_rate)
+
+
+def batch_electricity_costs(makes, models, states, annual_miles, home_share, custom_rates=None):
+    """Annual charging cost per vehicle for a continuous home-charging share in [0, 1]"""
+    efficiency, home_loss, public_loss = vehicle_charging_arrays(makes, models)
+    home_rate, public_rate = rate_arrays(states, custom_rates)
+    return electricity_costs(annual_miles, efficiency, home_loss, public_loss, home_rate, public_rate,
+                             np.clip(home_share, 0.0, 1.0))
+
+
+def charging_scenarios(makes, models, states, annual_miles, custom_rates=None, scenarios=CHARGING_SHARES):
+    """Cost of every named charging scenario at once: ``{name: array over vehicles}``"""
+    efficiency, home_loss, public_loss = vehicle_charging_arrays(makes, models)
+    home_rate, public_rate = rate_arrays(states, custom_rates)
+    names = list(scenarios)
+    shares = np.array([scenarios[name] for name in names], dtype=np.float64)
+    costs = electricity_costs(annual_miles, efficiency, home_loss, public_loss, home_rate, public_rate,
+                              shares[:, :1], shares[:, 1:])
+    return dict(zip(names, costs))
@@ -0,0 +1,100 @@
+"""Content fingerprint of the model and data a forecast is computed from.
+
+The fingerprint hashes the contents of everything a forecast reads other than
+its inputs:
+
+- the model pickles, the label encoders and the exported coefficients
+- every table in reference_data (msrp_data, state_fuel_prices,
+  maintenance_costs, ...), serialized canonically, so reformatting the source
+  doesn't change it
+- the source of the modules a forecast runs through (FORECAST_MODULES). Their
+  constants live in code: the parts, driving-style and terrain multipliers and
+  the registration fee, the depreciation decay, floor and scrap values, battery
+  fade, aging thresholds, charging shares and public charging rate, and the
+  insurance rating table. Hashing the source covers all of them, and any
+  other change to the forecast code, without a list to keep up to date
+- the calibrated depreciation parameters, when calibration.py has written them
+- the model backend in use, since the pickles and the NumPy port can differ in
+  the last bits
+
+It is computed once, when the model is loaded, and stamped on every
+ForecastResult. Every forecast cache includes it in its keys, so a new model or
+a repriced table moves the caches onto fresh keys at once, instead of serving
+stale forecasts until they expire.
+
+    python fingerprint.py        # the fingerprint, and a digest per component
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+
+import reference_data
+from depreciation import PARAMS_PATH
+from linear_model import COEFFICIENTS_PATH, MODEL_DIR, file_digest
+
+MODEL_FILES = (
+    os.path.join(MODEL_DIR, 'car_maintenance_model.pkl'),
+    os.path.join(MODEL_DIR, 'le_make.pkl'),
+    os.path.join(MODEL_DIR, 'le_model.pkl'),
+    COEFFICIENTS_PATH,
+    PARAMS_PATH,
+)
+FORECAST_MODULES = (
+    'estimator', 'aging', 'amortization', 'battery', 'depreciation', 'ev_costs', 'forecast_result', 'insurance',
+    'linear_model',
+)
+DIGEST_CHARS = 16
+
+
+def reference_tables():
+    """``{name: table}`` for every public table in reference_data"""
+    return {name: value for name, value in vars(reference_data).items()
+            if not name.startswith('_') and isinstance(value, (dict, list, tuple))}
+
+
+def _canonical(value):
+    """JSON-ready form of a table: dicts become key-sorted ``[key, value]`` pairs, so any key type works"""
+    if isinstance(value, dict):
+        pairs = [[_canonical(k), _canonical(v)] for k, v in value.items()]
+        return sorted(pairs, key=lambda pair: json.dumps(pair[0], default=repr))
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def table_digest(table):
+    """SHA-256 of a table's canonical JSON form"""
+    text = json.dumps(_canonical(table), separators=(',', ':'), default=repr)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def components(backend):
+    """Digest of each part the fingerprint covers, by name"""
+    parts = {'backend': backend}
+    parts.update({os.path.basename(path): file_digest(path) for path in MODEL_FILES})
+    parts.update({f"reference_data.{name}": table_digest(table) for name, table in reference_tables().items()})
+    parts.update({f"{module}.py": file_digest(os.path.join(MODEL_DIR, f"{module}.py")) for module in FORECAST_MODULES})
+    return parts
+
+
+@lru_cache(maxsize=None)
+def fingerprint(backend):
+    """Short hex fingerprint of the model files, reference tables, forecast code and ``backend``"""
+    return table_digest(components(backend))[:DIGEST_CHARS]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Print the model and reference data fingerprint')
+    parser.parse_args(argv)
+    from estimator import model_backend, model_fingerprint
+    backend = model_backend()
+    print(model_fingerprint())
+    for name, digest in components(backend).items():
+        print(f"  {name:40} {(digest or 'missing')[:DIGEST_CHARS]}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
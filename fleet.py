@@ -0,0 +1,295 @@
+"""Fleet replacement planning.
+
+Every unit is forecast twice with forecast_batch: as it is today (the
+defender), and as a brand-new replacement of the same make and model bought
+at its replacement price (the challenger). Each year's cost of a unit is its
+operating cost (maintenance, fuel/electricity, registration and insurance) plus
+the value it loses that year.
+
+The defender is insured at its own MSRP. Its value follows its own depreciation
+curve from that MSRP, scaled to start at the unit's current value, so a
+used unit loses value at a used car's rate rather than a new one's. Every
+swap costs SWAP_COST in fees and downtime, and a unit is sold for
+RESALE_HAIRCUT less than it is worth.
+
+- A challenger's economic life is the number of years that minimizes its
+  equivalent annual cost (EAC), including the swap and resale loss at the end
+  of each cycle.
+- A defender is kept for as many years as minimizes its own costs plus the
+  challenger's minimum EAC for the remaining years, plus the swap and resale
+  loss if it is replaced within the horizon. It is then replaced, and
+  replacements repeat every economic life for the rest of the horizon.
+
+Everything is vectorized over units and years. Large fleets can also be split
+into chunks and planned across a process pool.
+
+The units CSV needs ``make``, ``model``, ``model_year``, ``current_mileage``,
+``avg_mpy``, ``mpg``, ``purchase_price`` (the unit's current value) and
+``state``. Optional columns are ``unit_id``, ``driving_style``, ``terrain``,
+``msrp`` (looked up by make and model), ``replacement_price`` (defaults to
+MSRP), ``user_age`` and ``start_age``.
+
+    python fleet.py units.csv [--years 30] [--discount-rate 0] [--swap-cost 1500] [--workers 1] [-o plan.csv]
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from depreciation import depreciation_costs, depreciation_params, end_of_life_values, residual_values
+from estimator import REGISTRATION_FEE, forecast_batch, get_car_tier, get_vehicle_lifespan, model_fingerprint
+from metrics import FLEET_JOB_SECONDS, FLEET_UNITS
+from reference_data import msrp_data
+
+CHUNK_SIZE = 5000
+SWAP_COST = 1500                # fees, prep and downtime per replacement
+RESALE_HAIRCUT = 0.10           # share of its value a unit loses when sold or traded in
+
+# Optional unit fields and their defaults; fleet drivers are rated as experienced adults
+UNIT_DEFAULTS = {
+    'driving_style': 'normal', 'terrain': 'flat', 'msrp': None, 'replacement_price': None,
+    'user_age': 40, 'start_age': 18,
+}
+REQUIRED_COLUMNS = ('make', 'model', 'model_year', 'current_mileage', 'avg_mpy', 'mpg', 'purchase_price', 'state')
+
+
+@dataclass(frozen=True)
+class FleetPlan:
+    """Per-unit replacement decisions and fleet-wide annual budgets"""
+    unit_ids: list
+    replacement_year: np.ndarray    # forecast year the unit is replaced in; 0 = kept past the horizon
+    economic_life: np.ndarray       # years each replacement is kept
+    replacement_eac: np.ndarray     # equivalent annual cost of a replacement over its economic life
+    capex: np.ndarray               # replacement purchases per year
+    resale: np.ndarray              # value recovered from the units replaced each year
+    opex: np.ndarray                # operating cost per year, including replacements
+    replacements: np.ndarray        # units replaced per year
+    fingerprint: str = None         # see fingerprint.py
+
+    @property
+    def years(self):
+        return len(self.opex)
+
+    @property
+    def net_capex(self):
+        return self.capex - self.resale
+
+    def units_frame(self):
+        """One row per unit with its replacement decision"""
+        import pandas as pd
+        return pd.DataFrame({
+            'Unit': self.unit_ids,
+            'Replace In Year': self.replacement_year,
+            'Replacement Life (years)': self.economic_life,
+            'Replacement EAC': self.replacement_eac,
+        })
+
+    def budget_frame(self, start_year=None):
+        """One row per forecast year with fleet capex, resale and opex"""
+        import pandas as pd
+        start_year = datetime.now().year if start_year is None else start_year
+        return pd.DataFrame({
+            'Year': np.arange(start_year + 1, start_year + self.years + 1),
+            'Capex': self.capex,
+            'Resale': self.resale,
+            'Net Capex': self.net_capex,
+            'Opex': self.opex,
+            'Total': self.net_capex + self.opex,
+            'Replacements': self.replacements,
+        })
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _unit_records(units):
+    """Unit mappings with defaults filled in; accepts a DataFrame too"""
+    if hasattr(units, 'to_dict'):
+        units = units.to_dict('records')
+    records = []
+    for n, unit in enumerate(units):
+        record = {**UNIT_DEFAULTS, **{k: v for k, v in dict(unit).items() if not _missing(v)}}
+        missing = [column for column in REQUIRED_COLUMNS if column not in record]
+        if missing:
+            raise ValueError(f"Unit {record.get('unit_id', n)} is missing {', '.join(missing)}")
+        if record['replacement_price'] is None:
+            record['replacement_price'] = msrp_data.get((record['make'], record['model']), record['purchase_price'])
+        if record['msrp'] is None:
+            record['msrp'] = msrp_data.get((record['make'], record['model']), record['replacement_price'])
+        record.setdefault('unit_id', n)
+        records.append(record)
+    return records
+
+
+def _discount(years, discount_rate):
+    """Present-value factor of a cost at the end of years 0..years"""
+    return (1 + discount_rate) ** -np.arange(years + 1)
+
+
+def equivalent_annual_cost(costs, discount_rate=0.0, terminal=0.0):
+    """EAC of keeping a vehicle 1..years years, given its cost in each year; same shape as ``costs``.
+
+    ``terminal`` is the one-off cost of getting rid of it at the end of each year, e.g. the swap cost.
+    """
+    t = np.arange(1, costs.shape[-1] + 1)
+    if discount_rate > 0:
+        v = _discount(costs.shape[-1], discount_rate)[1:]
+        present_value = np.cumsum(costs * v, axis=-1) + terminal * v
+        return present_value * discount_rate / (1 - v)
+    return (np.cumsum(costs, axis=-1) + terminal) / t
+
+
+def _defender_values(records, years, start_year):
+    """End-of-year values of each unit as it is today: its own MSRP depreciation curve,
+    scaled to start at its current value"""
+    n = len(records)
+    makes, models = [record['make'] for record in records], [record['model'] for record in records]
+    msrp = np.array([record['msrp'] for record in records], dtype=np.float64)[:, None]
+    model_year = np.array([record['model_year'] for record in records])[:, None]
+    current_value = np.array([record['purchase_price'] for record in records], dtype=np.float64)
+    lifespan = np.array([get_vehicle_lifespan(make, model) for make, model in zip(makes, models)])[:, None]
+    decay_rate, value_floor = np.array([depreciation_params(make, model, get_car_tier(make))
+                                        for make, model in zip(makes, models)], dtype=np.float64).reshape(n, 2).T
+    year = start_year + np.arange(years + 1)
+    curve = residual_values(msrp, model_year, year, value_floor[:, None], decay_rate[:, None], decimals=None)
+    curve = end_of_life_values(curve, year - model_year, lifespan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = np.where(curve[:, 0] > 0, current_value / curve[:, 0], 1.0)
+    values = curve[:, 1:] * scale[:, None]
+    return values, depreciation_costs(current_value, values)
+
+
+def _forecast(records, years, start_year, new):
+    """Operating cost, value lost and end-of-year value per unit, as it is today or bought new"""
+    def column(name):
+        return [record[name] for record in records]
+
+    batch = forecast_batch(
+        column('make'), column('model'), start_year if new else column('model_year'),
+        0 if new else column('current_mileage'), column('avg_mpy'), column('mpg'),
+        column('replacement_price' if new else 'purchase_price'), column('state'),
+        years, 0.0, 0.0, 1, column('user_age'), column('start_age'),
+        column('replacement_price' if new else 'msrp'), column('driving_style'), column('terrain'),
+        start_year=start_year
+    )
+    opex = batch.maintenance + batch.fuel + REGISTRATION_FEE + batch.insurance
+    if new:
+        return opex, batch.depreciation, batch.value
+    value, loss = _defender_values(records, years, start_year)
+    return opex, loss, value
+
+
+def _plan_chunk(records, years, start_year, discount_rate, swap_cost=SWAP_COST, resale_haircut=RESALE_HAIRCUT):
+    """Replacement decisions and per-year totals for one chunk of units"""
+    n = len(records)
+    keep_opex, keep_loss, keep_value = _forecast(records, years, start_year, new=False)
+    new_opex, new_loss, new_value = _forecast(records, years, start_year, new=True)
+    current_value = np.array([record['purchase_price'] for record in records], dtype=np.float64)
+
+    # Challenger: the EAC-minimizing life of a new unit, paying for the swap at the end of each cycle
+    eac = equivalent_annual_cost(new_opex + new_loss, discount_rate, swap_cost + resale_haircut * new_value)
+    life = np.argmin(eac, axis=-1) + 1
+    best_eac = eac[np.arange(n), life - 1]
+
+    # Defender: keep for the number of years k that minimizes the horizon cost, i.e. its
+    # first k years, the swap out of it (unless it is kept to the end of the horizon) and
+    # the challenger's EAC for the rest. One expensive year doesn't force a replacement if
+    # the years after it are cheap again.
+    v = _discount(years, discount_rate)
+    excess = np.concatenate([np.zeros((n, 1)), np.cumsum((keep_opex + keep_loss - best_eac[:, None]) * v[1:], axis=-1)],
+                            axis=-1)
+    value_at = np.concatenate([current_value[:, None], keep_value], axis=-1)
+    swap = np.where(np.arange(years + 1) < years, (swap_cost + resale_haircut * value_at) * v, 0.0)
+    kept = np.argmin(excess + swap, axis=-1)
+
+    # Calendar: the current unit for ``kept`` years, then replacement cycles of ``life`` years
+    y = np.arange(years)
+    in_service = y < kept[:, None]
+    cycle_year = np.maximum(y - kept[:, None], 0) % life[:, None]
+    rows = np.arange(n)[:, None]
+    opex = np.where(in_service, keep_opex, new_opex[rows, cycle_year])
+    bought = ~in_service & (cycle_year == 0)
+    first = y == kept[:, None]
+    price = np.array([record['replacement_price'] for record in records], dtype=np.float64)
+    # The unit handed over at each purchase: the original one first, then a replacement at the end of its life
+    outgoing = np.where(kept == 0, current_value, keep_value[np.arange(n), np.maximum(kept - 1, 0)])
+    resale = np.where(bought, np.where(first, outgoing[:, None], new_value[rows, life[:, None] - 1]), 0.0)
+    resale = resale * (1 - resale_haircut)
+
+    return {
+        'unit_ids': [record['unit_id'] for record in records],
+        'replacement_year': np.where(kept < years, kept + 1, 0),
+        'economic_life': life,
+        'replacement_eac': best_eac,
+        'capex': np.where(bought, price[:, None] + swap_cost, 0.0).sum(axis=0),
+        'resale': resale.sum(axis=0),
+        'opex': opex.sum(axis=0),
+        'replacements': bought.sum(axis=0),
+    }
+
+
+def plan_fleet(units, years=30, discount_rate=0.0, workers=1, chunk_size=CHUNK_SIZE, start_year=None,
+               swap_cost=SWAP_COST, resale_haircut=RESALE_HAIRCUT):
+    """Plan replacements for every unit and aggregate annual fleet budgets.
+
+    ``swap_cost`` is paid on every replacement, and ``resale_haircut`` is the
+    share of its value a unit loses when it is sold. Units are planned ``chunk_size`` at a time; with ``workers > 1`` the chunks
+    run in a process pool. One chunk of a few thousand units takes well under a
+    second on its own, so a pool only pays off for much larger fleets.
+    """
+    start = time.perf_counter()
+    records = _unit_records(units)
+    if not records:
+        raise ValueError("A fleet plan needs at least one unit")
+    start_year = datetime.now().year if start_year is None else start_year
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    args = [[value] * len(chunks) for value in (years, start_year, discount_rate, swap_cost, resale_haircut)]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_plan_chunk, chunks, *args))
+    else:
+        parts = list(map(_plan_chunk, chunks, *args))
+    FLEET_UNITS.inc(len(records))
+    FLEET_JOB_SECONDS.observe(time.perf_counter() - start)
+
+    return FleetPlan(
+        unit_ids=[unit_id for part in parts for unit_id in part['unit_ids']],
+        **{name: np.concatenate([part[name] for part in parts])
+           for name in ('replacement_year', 'economic_life', 'replacement_eac')},
+        **{name: np.sum([part[name] for part in parts], axis=0)
+           for name in ('capex', 'resale', 'opex', 'replacements')},
+        fingerprint=model_fingerprint(),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Plan fleet replacements and annual budgets')
+    parser.add_argument('units', help='CSV of fleet units')
+    parser.add_argument('--years', type=int, default=30, help='planning horizon')
+    parser.add_argument('--discount-rate', type=float, default=0.0, help='annual rate for equivalent annual cost')
+    parser.add_argument('--swap-cost', type=float, default=SWAP_COST, help='fees and downtime per replacement')
+    parser.add_argument('--resale-haircut', type=float, default=RESALE_HAIRCUT,
+                        help='share of its value a unit loses when sold')
+    parser.add_argument('--workers', type=int, default=1, help='processes to plan chunks of units in')
+    parser.add_argument('-o', '--output', help='write the per-unit plan here')
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+    start = time.perf_counter()
+    units = pd.read_csv(args.units)
+    plan = plan_fleet(units, args.years, args.discount_rate, args.workers,
+                      swap_cost=args.swap_cost, resale_haircut=args.resale_haircut)
+    elapsed = time.perf_counter() - start
+    if args.output:
+        plan.units_frame().to_csv(args.output, index=False)
+    print(plan.budget_frame().to_string(index=False, float_format='{:,.0f}'.format))
+    print(f"Planned {len(plan.unit_ids):,} units over {args.years} years in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
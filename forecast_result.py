@@ -0,0 +1,147 @@
+"""Compact, array-backed forecast results.
+
+A forecast is stored as one unrounded numeric array per cost component plus an
+integer bitmask of the maintenance activities due each year. Rounding, labels,
+the per-year summary text and the display DataFrame are only produced when
+something is shown.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from reference_data import maintenance_costs, maintenance_schedule, ev_maintenance_schedule
+
+# Bit i of an activity mask stands for ACTIVITY_NAMES[i]
+ACTIVITY_NAMES = tuple(maintenance_costs)
+ACTIVITY_BITS = {name: 1 << i for i, name in enumerate(ACTIVITY_NAMES)}
+
+# Age-related items added on top of the mileage schedule, in the order they are listed
+AGE_ACTIVITIES = (
+    'Transmission Service', 'Suspension Check', 'Engine Mount Replacement', 'CV Joint Replacement',
+    'Power Steering Service', 'Radiator Replacement', 'Catalytic Converter Replacement'
+)
+EV_AGE_ACTIVITIES = ('Battery Pack Degradation Service', 'Drive Unit Overhaul')
+
+# Display order of activities within a year
+ICE_ACTIVITY_ORDER = tuple(maintenance_schedule) + AGE_ACTIVITIES
+EV_ACTIVITY_ORDER = tuple(ev_maintenance_schedule) + EV_AGE_ACTIVITIES
+
+
+def encode_activities(names):
+    """Fold a list of activity names into a bitmask"""
+    mask = 0
+    for name in names:
+        mask |= ACTIVITY_BITS[name]
+    return mask
+
+
+def round_cents(values):
+    """Round an array to cents the way the display always has (Python round, not np.round)"""
+    return [round(v, 2) for v in values.tolist()]
+
+
+def decode_activities(mask, is_ev=False):
+    """Activity names set in ``mask``, in display order"""
+    mask = int(mask)
+    order = EV_ACTIVITY_ORDER if is_ev else ICE_ACTIVITY_ORDER
+    return [name for name in order if mask & ACTIVITY_BITS[name]]
+
+
+@dataclass(frozen=True)
+class ForecastResult:
+    """Per-year forecast for one vehicle; index 0 is forecast year 1"""
+    is_ev: bool
+    maintenance: np.ndarray
+    fuel: np.ndarray
+    loan: np.ndarray
+    depreciation: np.ndarray
+    total: np.ndarray
+    value: np.ndarray
+    insurance: np.ndarray
+    activities: np.ndarray      # uint64 activity bitmask per year
+    fingerprint: str = None     # model and reference data the forecast came from; see fingerprint.py
+
+    @property
+    def years(self):
+        return len(self.total)
+
+    @property
+    def intersection(self):
+        """0-based index of the first year maintenance exceeds the car's value, or None"""
+        crossed = np.flatnonzero(np.array(round_cents(self.maintenance)) > self.value)
+        return int(crossed[0]) if len(crossed) else None
+
+    @property
+    def intersection_label(self):
+        return None if self.intersection is None else f"Year {self.intersection + 1}"
+
+    def activity_list(self, i):
+        """Activity names due in forecast year ``i + 1``"""
+        return decode_activities(self.activities[i], self.is_ev)
+
+    def activity_text(self, i):
+        return ', '.join(self.activity_list(i)) or 'None'
+
+    def summary(self):
+        """One line per year describing the main cost components"""
+        energy = 'Electricity' if self.is_ev else 'Fuel'
+        return ''.join(
+            f"Year {i + 1}: Maintenance ${round(m):,}, {energy} ${round(f):,}, Loan ${round(l):,}, Depreciation ${d:,}\\n"
+            for i, (m, f, l, d) in enumerate(zip(self.maintenance.tolist(), self.fuel.tolist(),
+                                                 self.loan.tolist(), round_cents(self.depreciation)))
+        )
+
+    def to_frame(self):
+        """Display table with the column layout the UI has always used"""
+        import pandas as pd
+        return pd.DataFrame({
+            'Year': [f"Year {i}" for i in range(1, self.years + 1)],
+            'Maintenance Cost': round_cents(self.maintenance),
+            'Fuel/Electricity Cost': round_cents(self.fuel),
+            'Loan Payment': round_cents(self.loan),
+            'Depreciation Cost': round_cents(self.depreciation),
+            'Total Cost': round_cents(self.total),
+            'Car Value': self.value,
+            'Activities': [self.activity_text(i) for i in range(self.years)],
+            'Insurance Premium': self.insurance
+        })
+
+    def to_legacy(self):
+        """The ``(summary, DataFrame, intersection label)`` tuple predict_5_years_cost returns"""
+        return self.summary(), self.to_frame(), self.intersection_label
+
+    def astype(self, dtype):
+        """Copy with the cost arrays cast to ``dtype`` (e.g. float32 for large fleet runs)"""
+        cast = {name: getattr(self, name).astype(dtype)
+                for name in ('maintenance', 'fuel', 'loan', 'depreciation', 'total', 'value')}
+        return ForecastResult(is_ev=self.is_ev, insurance=self.insurance, activities=self.activities,
+                              fingerprint=self.fingerprint, **cast)
+
+
+@dataclass(frozen=True)
+class ForecastBatch:
+    """Forecasts for N vehicles over the same horizon; every array is ``(N, years)`` except ``is_ev``"""
+    is_ev: np.ndarray
+    maintenance: np.ndarray
+    fuel: np.ndarray
+    loan: np.ndarray
+    depreciation: np.ndarray
+    total: np.ndarray
+    value: np.ndarray
+    insurance: np.ndarray
+    activities: np.ndarray
+    fingerprint: str = None
+
+    @property
+    def years(self):
+        return self.total.shape[-1]
+
+    def __len__(self):
+        return len(self.is_ev)
+
+    def __getitem__(self, i):
+        """ForecastResult for vehicle ``i``"""
+        return ForecastResult(
+            bool(self.is_ev[i]), self.maintenance[i], self.fuel[i], self.loan[i], self.depreciation[i],
+            self.total[i], self.value[i], self.insurance[i], self.activities[i], self.fingerprint
+        )
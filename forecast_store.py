@@ -0,0 +1,274 @@
+"""Persistent forecast cache in a local SQLite file.
+
+Forecasts are stored under a SHA-256 of their normalized inputs, the calendar
+year they start in and the model fingerprint (see fingerprint.py). Retraining
+the model or changing a reference table therefore starts a fresh set of keys
+instead of serving stale numbers, and so does the new year, which moves
+vehicle ages, insurance bands and the loan schedule.
+Numeric inputs are normalized to floats, so ``20000`` and ``20000.0`` share an
+entry.
+
+The database runs in WAL mode. Any number of processes (Streamlit workers,
+CLI runs) can read it while one of them writes, and each thread gets its own
+connection. It outlives the process: after a restart, forecasts that were
+in use are read back from disk instead of recomputed.
+
+The file is kept under a size limit. When a write takes it past the limit, the
+least recently used forecasts are deleted until it is back under
+EVICT_TO of the limit.
+
+    CAR_ESTIMATOR_FORECAST_CACHE=/var/cache/car-estimator/forecasts.sqlite   # '' disables it
+    CAR_ESTIMATOR_FORECAST_CACHE_MB=256
+
+Hits don't write to the file on every read. Their ``used`` times and hit
+counts are collected in memory and written in one batch at most every
+TOUCH_INTERVAL seconds, or with the next forecast stored. A batch that finds
+the file locked is kept for the next attempt instead of waiting.
+
+A cache that can't be opened or written to is treated as a miss, so forecasts
+never fail because of it. So is a stored payload that can't be read (written
+by an older format, or corrupted); its row is deleted.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+import metrics
+from estimator import MODEL_DIR, forecast_costs, model_fingerprint
+from forecast_result import ForecastResult
+
+STORE_PATH = os.environ.get('CAR_ESTIMATOR_FORECAST_CACHE', os.path.join(MODEL_DIR, 'forecast_cache.sqlite'))
+MAX_MB = float(os.environ.get('CAR_ESTIMATOR_FORECAST_CACHE_MB', 256))
+EVICT_TO = 0.9                  # share of the size limit eviction brings the file back down to
+BUSY_TIMEOUT = 5.0              # seconds to wait on another process's write lock
+TOUCH_INTERVAL = 5.0            # seconds between batched writes of cache hits
+FORMAT_VERSION = 1              # bump when the stored payload changes; the fingerprint covers the forecast code
+
+# What np.load and _load raise on a payload that isn't a readable forecast
+PAYLOAD_ERRORS = (ValueError, KeyError, OSError, EOFError, zipfile.BadZipFile)
+
+RESULT_FIELDS = ('maintenance', 'fuel', 'loan', 'depreciation', 'total', 'value', 'insurance', 'activities')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    key TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS forecasts_used ON forecasts (used);
+"""
+
+
+def _normalize(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value) + 0.0      # + 0.0 folds -0.0 into 0.0
+    return value
+
+
+def forecast_key(args, fingerprint, start_year):
+    """Stable key for forecast_costs(*args, start_year=start_year) computed with the model and data ``fingerprint``"""
+    text = json.dumps([FORMAT_VERSION, fingerprint, start_year] + [_normalize(arg) for arg in args])
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _dump(result):
+    buffer = io.BytesIO()
+    np.savez(buffer, is_ev=np.bool_(result.is_ev), **{name: getattr(result, name) for name in RESULT_FIELDS})
+    return buffer.getvalue()
+
+
+def _load(payload, fingerprint):
+    with np.load(io.BytesIO(payload), allow_pickle=False) as arrays:
+        return ForecastResult(is_ev=bool(arrays['is_ev']), fingerprint=fingerprint,
+                              **{name: arrays[name] for name in RESULT_FIELDS})
+
+
+class ForecastStore:
+    """ForecastResults in a SQLite file, keyed by forecast_key and evicted least recently used first"""
+
+    def __init__(self, path=STORE_PATH, max_bytes=int(MAX_MB * 2**20)):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._touches = {}          # key -> (last used, hits) not yet written
+        self._touch_lock = threading.Lock()
+        self._flushed = time.time()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, fingerprint=None):
+        """The stored ForecastResult for ``key``, stamped with ``fingerprint``, or None.
+
+        A payload that can't be read is deleted and reported as missing.
+        """
+        conn = self._connection()
+        row = conn.execute('SELECT payload FROM forecasts WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            result = _load(row[0], fingerprint)
+        except PAYLOAD_ERRORS:
+            self._discard(conn, key)
+            return None
+        now = time.time()
+        with self._touch_lock:
+            _, hits = self._touches.get(key, (now, 0))
+            self._touches[key] = (now, hits + 1)
+            due = now - self._flushed >= TOUCH_INTERVAL
+        if due:
+            self.flush_touches(conn, wait=False)
+        return result
+
+    def _discard(self, conn, key):
+        try:
+            deleted = conn.execute('DELETE FROM forecasts WHERE key = ?', (key,)).rowcount
+        except sqlite3.Error:
+            return
+        if deleted:
+            metrics.CACHE_EVICTIONS.inc(deleted, cache='disk', reason='unreadable')
+
+    def flush_touches(self, conn=None, wait=True):
+        """Write the batched hits; returns whether they were written.
+
+        With ``wait=False`` a file locked by another writer leaves them batched
+        for the next flush instead of waiting on the lock.
+        """
+        conn = conn or self._connection()
+        with self._touch_lock:
+            touches, self._touches = self._touches, {}
+            self._flushed = time.time()
+        if not touches:
+            return True
+        rows = [(used, hits, key) for key, (used, hits) in touches.items()]
+        own_transaction = not conn.in_transaction
+        if not wait:
+            conn.execute('PRAGMA busy_timeout = 0')
+        try:
+            if own_transaction:
+                conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('UPDATE forecasts SET used = max(used, ?), hits = hits + ? WHERE key = ?', rows)
+            if own_transaction:
+                conn.execute('COMMIT')
+            return True
+        except sqlite3.OperationalError:
+            if own_transaction and conn.in_transaction:
+                conn.execute('ROLLBACK')
+            with self._touch_lock:
+                for key, (used, hits) in touches.items():
+                    later_used, later_hits = self._touches.get(key, (used, 0))
+                    self._touches[key] = (max(used, later_used), hits + later_hits)
+            return False
+        finally:
+            if not wait:
+                conn.execute(f'PRAGMA busy_timeout = {int(BUSY_TIMEOUT * 1000)}')
+
+    def put(self, key, result):
+        """Store ``result`` under ``key``, evicting old forecasts if the file outgrows its limit"""
+        conn = self._connection()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Batched hits go in first, so eviction sees which forecasts are in use
+            self.flush_touches(conn)
+            conn.execute('INSERT OR REPLACE INTO forecasts (key, payload, created, used) VALUES (?, ?, ?, ?)',
+                         (key, _dump(result), now, now))
+            evicted = self._evict(conn) if self.size(conn) > self.max_bytes else 0
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        if evicted:
+            metrics.CACHE_EVICTIONS.inc(evicted, cache='disk', reason='capacity')
+        return evicted
+
+    def _evict(self, conn):
+        evicted = 0
+        target = self.max_bytes * EVICT_TO
+        while (size := self.size(conn)) > target:
+            # Delete as many forecasts as the average entry size says it takes to get under the target
+            entries = conn.execute('SELECT count(*) FROM forecasts').fetchone()[0]
+            batch = max(1, math.ceil((size - target) / size * entries))
+            deleted = conn.execute(
+                'DELETE FROM forecasts WHERE key IN (SELECT key FROM forecasts ORDER BY used LIMIT ?)', (batch,)
+            ).rowcount
+            if not deleted:
+                break
+            evicted += deleted
+        return evicted
+
+    def size(self, conn=None):
+        """Bytes of the database in use; pages freed by deletes are reused rather than counted"""
+        conn = conn or self._connection()
+        pages = conn.execute('PRAGMA page_count').fetchone()[0] - conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return pages * conn.execute('PRAGMA page_size').fetchone()[0]
+
+    def stats(self):
+        """``{'entries', 'bytes', 'hits'}`` for the whole file, across every process using it"""
+        self.flush_touches(wait=False)
+        entries, hits = self._connection().execute('SELECT count(*), total(hits) FROM forecasts').fetchone()
+        return {'entries': entries, 'bytes': self.size(), 'hits': int(hits)}
+
+    def clear(self):
+        """Drop every stored forecast; returns how many there were"""
+        with self._touch_lock:
+            self._touches.clear()
+        return self._connection().execute('DELETE FROM forecasts').rowcount
+
+
+@lru_cache(maxsize=None)
+def default_store():
+    """The ForecastStore at STORE_PATH, or None when the persistent cache is disabled or can't be opened"""
+    if not STORE_PATH:
+        return None
+    store = ForecastStore()
+    try:
+        store._connection()
+    except sqlite3.Error:
+        return None
+    return store
+
+
+def stored_forecast(*args, start_year=None):
+    """forecast_costs(*args, start_year=start_year), served from the persistent cache when it has been computed before"""
+    start_year = datetime.now().year if start_year is None else int(start_year)
+    store = default_store()
+    if store is None:
+        return forecast_costs(*args, start_year=start_year)
+    metrics.CACHE_CALLS.inc(cache='disk')
+    fingerprint = model_fingerprint()
+    key = forecast_key(args, fingerprint, start_year)
+    try:
+        result = store.get(key, fingerprint)
+    except sqlite3.Error:
+        result = None
+    if result is not None:
+        return result
+    metrics.CACHE_MISSES.inc(cache='disk')
+    result = forecast_costs(*args, start_year=start_year)
+    try:
+        store.put(key, result)
+    except sqlite3.Error:
+        pass
+    return result
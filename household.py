@@ -0,0 +1,139 @@
+"""Household portfolio forecasts.
+
+A household owns several vehicles, each with its own primary driver, and may
+buy or sell some of them part way through the horizon. All vehicles are
+forecast in one forecast_batch call, each starting in the year it is bought,
+then shifted onto the household's calendar and zeroed outside the years it is
+owned. The combined annual cost is checked against the same 10%-of-gross-income
+rule the single-vehicle analysis uses.
+
+Each vehicle is a mapping with the forecast_costs argument names (``state`` and
+``years`` come from the household), plus optional:
+
+- ``purchase_year``: household year the vehicle is acquired (1 = owned now)
+- ``sell_year``: last household year it is owned (None = kept to the end)
+- ``label``: display name, ``"<model_year> <make> <model>"`` by default
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from estimator import forecast_batch
+from reference_data import msrp_data
+
+BUDGET_SHARE = 0.10             # of gross income, for all transportation
+
+# Optional vehicle fields and their defaults
+VEHICLE_DEFAULTS = {
+    'msrp': None, 'driving_style': 'normal', 'terrain': 'flat',
+    'loan_amount': 0.0, 'irate': 0.0, 'lt_years': 1,
+    'purchase_year': 1, 'sell_year': None, 'label': None,
+}
+
+
+@dataclass(frozen=True)
+class HouseholdForecast:
+    """Per-vehicle costs on the household calendar; ``(N, years)`` arrays, 0 where not owned"""
+    labels: list
+    owned: np.ndarray
+    maintenance: np.ndarray
+    fuel: np.ndarray
+    loan: np.ndarray
+    depreciation: np.ndarray
+    total: np.ndarray
+    insurance: np.ndarray
+    gross_income: float
+    fingerprint: str = None         # see fingerprint.py
+
+    @property
+    def years(self):
+        return self.total.shape[-1]
+
+    @property
+    def annual_total(self):
+        """Combined ownership cost per household year"""
+        return self.total.sum(axis=0)
+
+    @property
+    def budget(self):
+        return self.gross_income * BUDGET_SHARE
+
+    @property
+    def income_share(self):
+        """Combined annual cost as a fraction of gross income"""
+        return self.annual_total / self.gross_income if self.gross_income else np.full(self.years, np.inf)
+
+    @property
+    def over_budget(self):
+        """Household years whose combined cost breaks the 10% rule"""
+        return self.annual_total > self.budget
+
+    def to_frame(self):
+        """One row per household year: each vehicle's total, insurance and the combined figures"""
+        import pandas as pd
+        frame = pd.DataFrame({'Year': [f"Year {i}" for i in range(1, self.years + 1)]})
+        for label, total in zip(self.labels, self.total):
+            frame[label] = total
+        frame['Insurance Premiums'] = self.insurance.sum(axis=0)
+        frame['Household Total'] = self.annual_total
+        frame['Share of Income'] = self.income_share
+        frame['Vehicles Owned'] = self.owned.sum(axis=0)
+        return frame
+
+
+def _missing(value):
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _vehicle_records(vehicles):
+    """Vehicle mappings with defaults filled in; accepts a DataFrame too"""
+    if hasattr(vehicles, 'to_dict'):
+        vehicles = vehicles.to_dict('records')
+    records, seen = [], {}
+    for vehicle in vehicles:
+        record = {**VEHICLE_DEFAULTS, **{k: v for k, v in dict(vehicle).items() if not _missing(v)}}
+        if record['msrp'] is None:
+            record['msrp'] = msrp_data.get((record['make'], record['model']))
+        label = record['label'] or f"{record['model_year']} {record['make']} {record['model']}"
+        # Labels become column names, so repeats get a counter
+        seen[label] = seen.get(label, 0) + 1
+        record['label'] = label if seen[label] == 1 else f"{label} ({seen[label]})"
+        records.append(record)
+    return records
+
+
+def _on_calendar(values, offset, owned):
+    """Shift each row right by its ``offset`` years and zero the years it isn't owned"""
+    index = np.arange(values.shape[-1]) - offset[:, None]
+    shifted = np.take_along_axis(values, np.clip(index, 0, None), axis=-1)
+    return np.where(owned, shifted, 0)
+
+
+def forecast_household(vehicles, state, years, gross_income, start_year=None):
+    """Forecast every vehicle in one batch and combine them on the household calendar"""
+    records = _vehicle_records(vehicles)
+    if not records:
+        raise ValueError("A household forecast needs at least one vehicle")
+    start_year = datetime.now().year if start_year is None else start_year
+
+    def column(name, dtype=None):
+        return np.array([record[name] for record in records], dtype=dtype)
+
+    offset = np.maximum(column('purchase_year', np.int64), 1) - 1
+    sell_year = np.array([years if r['sell_year'] is None else r['sell_year'] for r in records], dtype=np.int64)
+    calendar = np.arange(1, years + 1)
+    owned = (calendar > offset[:, None]) & (calendar <= sell_year[:, None])
+
+    # Vehicles bought later start their own forecast (and their driver is older) at purchase
+    batch = forecast_batch(
+        column('make'), column('model'), column('model_year'), column('current_mileage'), column('avg_mpy'),
+        column('mpg'), column('purchase_price'), [state] * len(records),
+        years, column('loan_amount'), column('irate'), column('lt_years'),
+        column('user_age') + offset, column('start_age'), column('msrp', object),
+        column('driving_style'), column('terrain'), start_year=start_year + offset
+    )
+    shifted = {name: _on_calendar(getattr(batch, name), offset, owned)
+               for name in ('maintenance', 'fuel', 'loan', 'depreciation', 'total', 'insurance')}
+    return HouseholdForecast(labels=column('label').tolist(), owned=owned, gross_income=gross_income,
+                             fingerprint=batch.fingerprint, **shifted)
@@ -0,0 +1,127 @@
+"""Insurance premium rating engine.
+
+A premium is rated from a declarative RatingTable:
+
+    premium = (base + matching surcharges) * each discount factor * territory factor
+
+rounded to whole dollars and floored at the table minimum. Surcharges apply a
+flat amount (negative for credits) when all their conditions hold; discounts
+grow by ``rate`` per unit of a variable above ``start``, up to ``cap``.
+
+Every rating variable may be an array, and they broadcast against each other,
+so quote_book rates drivers x vehicles x years in one pass. The default table
+reproduces the premiums the forecast has always produced.
+"""
+import operator
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from reference_data import state_cost_multipliers
+
+_COMPARISONS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge, '==': operator.eq,
+}
+
+# Variables the rules below can refer to
+RATING_VARIABLES = ('driver_age', 'years_driving', 'msrp', 'annual_miles', 'vehicle_age')
+
+
+@dataclass(frozen=True)
+class Surcharge:
+    """Flat amount added when every ``(variable, comparison, value)`` condition holds"""
+    name: str
+    when: tuple
+    amount: float
+
+
+@dataclass(frozen=True)
+class Discount:
+    """Multiply by ``1 - min(cap, (variable - start) * rate)`` where ``variable > start``"""
+    name: str
+    variable: str
+    start: float
+    rate: float
+    cap: float
+
+
+@dataclass(frozen=True)
+class RatingTable:
+    base: float
+    minimum: float
+    surcharges: tuple = ()
+    discounts: tuple = ()
+    territory: dict = field(default_factory=dict)   # state -> multiplier, 1.0 when missing
+
+
+DEFAULT_RATING_TABLE = RatingTable(
+    base=1200,
+    minimum=700,
+    surcharges=(
+        Surcharge('Young driver', (('driver_age', '<', 25),), 700),
+        Surcharge('Experienced driver', (('driver_age', '>=', 25), ('years_driving', '>=', 10)), -200),
+        Surcharge('High-value vehicle', (('msrp', '>', 50000),), 400),
+        Surcharge('High mileage', (('annual_miles', '>', 15000),), 200),
+        Surcharge('Low mileage', (('annual_miles', '<', 7000),), -100),
+    ),
+    discounts=(
+        # Older vehicles are cheaper to insure as their value drops
+        Discount('Vehicle age', 'vehicle_age', start=10, rate=0.03, cap=0.3),
+    ),
+    territory=state_cost_multipliers,
+)
+
+
+def territory_factors(states, table=DEFAULT_RATING_TABLE):
+    """Territory multiplier for each state"""
+    return np.array([table.territory.get(state, 1.0) for state in np.atleast_1d(states).tolist()],
+                    dtype=np.float64).reshape(np.shape(states))
+
+
+def rate_premiums(driver_age, years_driving, msrp, annual_miles, vehicle_age, territory,
+                  table=DEFAULT_RATING_TABLE):
+    """Annual premium for every broadcast combination of the rating variables.
+
+    ``msrp`` may be None or NaN when unknown; ``territory`` is a multiplier
+    (see territory_factors).
+    """
+    variables = {
+        'driver_age': np.asarray(driver_age),
+        'years_driving': np.asarray(years_driving),
+        'msrp': np.asarray(np.nan if msrp is None else msrp, dtype=np.float64),
+        'annual_miles': np.asarray(annual_miles),
+        'vehicle_age': np.asarray(vehicle_age),
+    }
+    shape = np.broadcast_shapes(*(v.shape for v in variables.values()), np.shape(territory))
+
+    premium = np.full(shape, table.base, dtype=np.float64)
+    for rule in table.surcharges:
+        applies = np.ones(shape, dtype=bool)
+        for variable, comparison, value in rule.when:
+            applies &= _COMPARISONS[comparison](variables[variable], value)
+        premium += np.where(applies, rule.amount, 0)
+    for rule in table.discounts:
+        x = variables[rule.variable]
+        discount = np.minimum(rule.cap, (x - rule.start) * rule.rate)
+        premium = np.where(x > rule.start, premium * (1 - discount), premium)
+    premium = premium * territory
+    return np.maximum(table.minimum, np.round(premium)).astype(np.int64)
+
+
+def quote_book(user_ages, start_ages, annual_miles, msrps, vehicle_ages, states, years,
+               table=DEFAULT_RATING_TABLE):
+    """Premiums for D driver profiles x V vehicles over forecast years 1..``years``.
+
+    Drivers are ``(user_ages, start_ages, annual_miles)`` arrays of length D;
+    vehicles are ``(msrps, vehicle_ages, states)`` of length V, with
+    ``vehicle_ages`` their age today. Returns an int64 ``(D, V, years)`` array.
+    """
+    i = np.arange(1, years + 1)
+    user_ages = np.asarray(user_ages)[:, None, None]
+    driver_age = user_ages + i - 1
+    years_driving = driver_age - np.asarray(start_ages)[:, None, None]
+    msrps = np.array([np.nan if m is None else m for m in msrps], dtype=np.float64)[None, :, None]
+    vehicle_age = np.asarray(vehicle_ages)[None, :, None] + i
+    territory = territory_factors(list(states), table)[None, :, None]
+    return rate_premiums(driver_age, years_driving, msrps, np.asarray(annual_miles)[:, None, None],
+                         vehicle_age, territory, table)
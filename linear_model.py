@@ -0,0 +1,144 @@
+"""Pure-NumPy stand-in for the pickled maintenance model.
+
+``car_maintenance_model.pkl`` is a scikit-learn ``LinearRegression`` and the two
+``le_*.pkl`` files are ``LabelEncoder``s, so everything a forecast needs from
+them is a coefficient vector, an intercept and two sorted label lists. Those
+are exported once to ``car_maintenance_model.json`` and served from here, which
+keeps scikit-learn (and its version-pinned pickles) out of the forecast path.
+
+Regenerate the JSON after retraining the model:
+
+    python linear_model.py
+
+The export records a SHA-256 of each pickle it was taken from.
+coefficients_stale() compares those with the pickles on disk, so a retrained
+model whose JSON wasn't regenerated is caught when the model is loaded.
+"""
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+COEFFICIENTS_PATH = os.path.join(MODEL_DIR, 'car_maintenance_model.json')
+PICKLE_FILES = ('car_maintenance_model.pkl', 'le_make.pkl', 'le_model.pkl')
+
+FEATURES = ['Make_Encoded', 'Model_Encoded', 'Year', 'Mileage', 'Avg_Miles_Per_Year']
+
+
+class LinearCostModel:
+    """Linear maintenance-cost model with label encoding for make and model"""
+
+    def __init__(self, coef, intercept, make_classes, model_classes):
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.make_classes = list(make_classes)
+        self.model_classes = list(model_classes)
+        self._make_index = {label: i for i, label in enumerate(self.make_classes)}
+        self._model_index = {label: i for i, label in enumerate(self.model_classes)}
+
+    @classmethod
+    def from_json(cls, path=COEFFICIENTS_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        if data['features'] != FEATURES:
+            raise ValueError(f"Unexpected feature order in {path}: {data['features']}")
+        return cls(data['coef'], data['intercept'], data['make_classes'], data['model_classes'])
+
+    def encode(self, make, model):
+        """Label-encode a make/model pair the same way the fitted LabelEncoders do"""
+        try:
+            return self._make_index[make], self._model_index[model]
+        except KeyError as e:
+            raise ValueError(f"y contains previously unseen labels: {e.args[0]!r}") from None
+
+    def predict(self, X):
+        """Predict base maintenance cost for rows of ``FEATURES``"""
+        X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef + self.intercept
+
+
+@lru_cache(maxsize=None)
+def load_linear_model(path=COEFFICIENTS_PATH):
+    return LinearCostModel.from_json(path)
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, or None if it doesn't exist"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def pickle_digests(model_dir=MODEL_DIR):
+    return {name: file_digest(os.path.join(model_dir, name)) for name in PICKLE_FILES}
+
+
+@lru_cache(maxsize=None)
+def coefficients_stale(path=COEFFICIENTS_PATH, model_dir=MODEL_DIR):
+    """Names of the pickles that changed since ``path`` was exported from them.
+
+    Pickles that aren't deployed are skipped, and so is a JSON exported before
+    digests were recorded.
+    """
+    with open(path) as f:
+        recorded = json.load(f).get('pickle_digests', {})
+    return [name for name, digest in pickle_digests(model_dir).items()
+            if digest is not None and name in recorded and recorded[name] != digest]
+
+
+def export_coefficients(path=COEFFICIENTS_PATH):
+    """Write the pickled model's coefficients to ``path`` and check predictions match"""
+    from estimator import load_models
+    import sklearn
+
+    trained_model, le_make, le_model = load_models()
+    features = [str(name) for name in trained_model.feature_names_in_]
+    if features != FEATURES:
+        raise ValueError(f"Pickled model uses features {features}, expected {FEATURES}")
+
+    data = {
+        'features': FEATURES,
+        'coef': [float(c) for c in trained_model.coef_],
+        'intercept': float(trained_model.intercept_),
+        'make_classes': [str(label) for label in le_make.classes_],
+        'model_classes': [str(label) for label in le_model.classes_],
+        'sklearn_version': sklearn.__version__,
+        'pickle_digests': pickle_digests(os.path.dirname(os.path.abspath(path))),
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=1)
+        f.write('\n')
+
+    # Parity check against the pickle over random encodings, years and mileages
+    import pandas as pd
+    exported = LinearCostModel.from_json(path)
+    rng = np.random.default_rng(0)
+    n = 10000
+    X = pd.DataFrame({
+        'Make_Encoded': rng.integers(0, len(exported.make_classes), n),
+        'Model_Encoded': rng.integers(0, len(exported.model_classes), n),
+        'Year': rng.integers(1990, 2031, n),
+        'Mileage': rng.integers(0, 600000, n),
+        'Avg_Miles_Per_Year': rng.integers(0, 100001, n),
+    })
+    expected = trained_model.predict(X)
+    actual = exported.predict(X.to_numpy())
+    if not np.allclose(actual, expected, rtol=1e-12, atol=1e-9):
+        raise AssertionError(f"Exported model diverges from pickle by up to {np.abs(actual - expected).max()}")
+    assert list(le_make.transform(exported.make_classes)) == list(range(len(exported.make_classes)))
+    assert list(le_model.transform(exported.model_classes)) == list(range(len(exported.model_classes)))
+    return data
+
+
+if __name__ == '__main__':
+    data = export_coefficients(sys.argv[1] if len(sys.argv) > 1 else COEFFICIENTS_PATH)
+    print(f"Exported {len(data['coef'])} coefficients, {len(data['make_classes'])} makes, "
+          f"{len(data['model_classes'])} models")
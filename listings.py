@@ -0,0 +1,134 @@
+"""Rank used-car listings by true cost of ownership per mile.
+
+Listings are streamed from a CSV in chunks. Each chunk is forecast with
+forecast_batch, using the asking price as the purchase price, over the
+holding period. Only the best ``top`` listings are kept, in a bounded heap, so
+memory stays flat however large the file is.
+
+A listing's cost over the holding period is:
+
+- the forecast's total cost (maintenance, fuel/electricity and registration;
+  purchases are cash, so there are no loan payments)
+- insurance premiums, rated on the model's MSRP so that the high-value
+  surcharge applies to expensive models
+- depreciation (asking price minus the value at the end)
+
+That cost is divided by the miles driven over the period.
+
+The CSV needs ``make``, ``model``, ``year``, ``mileage``, ``price`` and
+``location`` (state) columns. Any other columns, such as a listing id or URL,
+are carried through to the output. Listings the model doesn't know, or that
+are in an unknown state, are skipped.
+
+    python listings.py listings.csv [--years 5] [--top 20] [--miles-per-year 12000] [-o top.csv]
+"""
+import argparse
+import heapq
+import itertools
+import sys
+import time
+
+import numpy as np
+
+from estimator import forecast_batch, load_cost_model
+from reference_data import average_mpg, msrp_data, state_cost_multipliers
+
+CHUNK_SIZE = 10000
+HOLDING_YEARS = 5
+TOP_K = 20
+MILES_PER_YEAR = 12000
+REQUIRED_COLUMNS = ('make', 'model', 'year', 'mileage', 'price', 'location')
+
+
+def _known(make, model, state):
+    if state not in state_cost_multipliers:
+        return False
+    try:
+        load_cost_model().encode(make, model)
+    except ValueError:
+        return False
+    return True
+
+
+def score_chunk(chunk, years=HOLDING_YEARS, miles_per_year=MILES_PER_YEAR, user_age=30, start_age=16,
+                driving_style='normal', terrain='flat'):
+    """Forecast a DataFrame of listings; returns the scorable rows with cost columns added"""
+    if miles_per_year <= 0 or years <= 0:
+        raise ValueError("Cost per mile needs a positive holding period and annual mileage")
+    chunk = chunk[chunk[list(REQUIRED_COLUMNS)].notna().all(axis=1) & (chunk['price'] > 0)]
+    known = [_known(*row) for row in zip(chunk['make'], chunk['model'], chunk['location'])]
+    chunk = chunk[np.array(known, dtype=bool)].copy()
+    if chunk.empty:
+        return chunk
+
+    makes, models = chunk['make'].tolist(), chunk['model'].tolist()
+    mpg = [average_mpg.get(make, {}).get(model, 25) for make, model in zip(makes, models)]
+    msrps = [msrp_data.get((make, model)) for make, model in zip(makes, models)]
+    batch = forecast_batch(
+        makes, models, chunk['year'].to_numpy(), chunk['mileage'].to_numpy(), miles_per_year, mpg,
+        chunk['price'].to_numpy(dtype=np.float64), chunk['location'].tolist(),
+        years, 0.0, 0.0, 1, user_age, start_age, msrps, driving_style, terrain
+    )
+    chunk['Operating Cost'] = batch.total.sum(axis=1)
+    chunk['Insurance'] = batch.insurance.sum(axis=1)
+    chunk['Depreciation'] = batch.depreciation.sum(axis=1)
+    chunk['Total Cost'] = chunk['Operating Cost'] + chunk['Insurance'] + chunk['Depreciation']
+    chunk['Cost per Mile'] = chunk['Total Cost'] / (miles_per_year * years)
+    return chunk
+
+
+def rank_listings(chunks, top=TOP_K, **forecast_args):
+    """Lowest cost-per-mile listings across an iterable of DataFrame chunks, best first.
+
+    Returns ``(rows, scored, skipped)``; ``rows`` are dicts.
+    """
+    heap = []                       # (-cost per mile, -order, row): the worst kept listing is on top
+    order = itertools.count()
+    scored = skipped = 0
+    for chunk in chunks:
+        missing = set(REQUIRED_COLUMNS) - set(chunk.columns)
+        if missing:
+            raise ValueError(f"Listings are missing columns: {', '.join(sorted(missing))}")
+        result = score_chunk(chunk, **forecast_args)
+        scored += len(result)
+        skipped += len(chunk) - len(result)
+        # Only a chunk's own best ``top`` rows can make it into the heap
+        for row in result.nsmallest(top, 'Cost per Mile', keep='first').to_dict('records'):
+            item = (-row['Cost per Mile'], -next(order), row)
+            if len(heap) < top:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+    rows = [row for _, _, row in sorted(heap, reverse=True)]
+    return rows, scored, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rank used-car listings by ownership cost per mile')
+    parser.add_argument('listings', help='CSV of listings')
+    parser.add_argument('--years', type=int, default=HOLDING_YEARS, help='holding period')
+    parser.add_argument('--top', type=int, default=TOP_K, help='listings to keep')
+    parser.add_argument('--miles-per-year', type=int, default=MILES_PER_YEAR)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='listings forecast per batch')
+    parser.add_argument('-o', '--output', help='write the ranked listings here')
+    args = parser.parse_args(argv)
+    if args.miles_per_year <= 0 or args.years <= 0:
+        parser.error('--years and --miles-per-year must be positive')
+
+    import pandas as pd
+    start = time.perf_counter()
+    chunks = pd.read_csv(args.listings, chunksize=args.chunk_size)
+    rows, scored, skipped = rank_listings(chunks, args.top, years=args.years, miles_per_year=args.miles_per_year)
+    elapsed = time.perf_counter() - start
+
+    ranked = pd.DataFrame(rows)
+    if not ranked.empty:
+        ranked.insert(0, 'Rank', range(1, len(ranked) + 1))
+    if args.output:
+        ranked.to_csv(args.output, index=False)
+    print(ranked.to_string(index=False, float_format='{:,.2f}'.format))
+    print(f"Scored {scored:,} listings ({skipped:,} skipped) in {elapsed:.1f}s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
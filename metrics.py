@@ -0,0 +1,170 @@
+"""Operational metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms are defined here, next to each other, and
+updated from the code they describe: forecasts served, forecast latency, model
+load time and fingerprint, forecast cache hits, misses and evictions, and
+fleet-planning throughput. Per-stage latency comes from the profiling spans,
+which serving metrics turns on.
+
+Set CAR_ESTIMATOR_METRICS_PORT to serve ``/metrics`` from the app's process:
+
+    CAR_ESTIMATOR_METRICS_PORT=9100 streamlit run costapp.py
+    curl localhost:9100/metrics
+
+Any other process can call start_server(port) itself, or print render().
+"""
+import os
+import threading
+from bisect import bisect_left
+
+import profiling
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_registry = []
+_server = None
+_server_lock = threading.Lock()
+
+
+def _label_text(names, values, extra=()):
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)] + list(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _samples(self):
+        with self._lock:
+            return sorted((key, self._value_copy(value)) for key, value in self._values.items())
+
+    def _value_copy(self, value):
+        return value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in self._samples():
+            lines.append(f"{self.name}{_label_text(self.labels, key)} {value:.9g}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; each label set keeps its bucket counts, sum and count"""
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+    def _value_copy(self, value):
+        return list(value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, counts in self._samples():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == '+Inf' else f'le="{bound:g}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, [le])} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {counts[-1]:.9g}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+
+# ─── Metrics ───────────────────────────────────────────────────────────────────
+FORECASTS = Counter('car_estimator_forecasts_total', 'Vehicle forecasts served',
+                    ('kind', 'horizon'))
+FORECAST_SECONDS = Histogram('car_estimator_forecast_batch_seconds', 'Time per forecast_batch call',
+                             ('horizon',))
+MODEL_LOAD_SECONDS = Gauge('car_estimator_model_load_seconds', 'Time taken to load the maintenance model',
+                           ('backend',))
+MODEL_INFO = Gauge('car_estimator_model_info', 'Fingerprint of the loaded model and reference data',
+                   ('backend', 'fingerprint'))
+CACHE_CALLS = Counter('car_estimator_cache_calls_total', 'Calls to cached functions', ('cache',))
+CACHE_MISSES = Counter('car_estimator_cache_misses_total', 'Cached calls that had to be computed', ('cache',))
+CACHE_EVICTIONS = Counter('car_estimator_cache_evictions_total', 'Entries dropped from a cache',
+                          ('cache', 'reason'))
+FLEET_UNITS = Counter('car_estimator_fleet_units_total', 'Fleet units planned')
+FLEET_JOB_SECONDS = Histogram('car_estimator_fleet_job_seconds', 'Time per fleet plan',
+                              buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0))
+
+
+def render():
+    """Every metric, plus the profiling spans, in the text exposition format"""
+    lines = [line for metric in _registry for line in metric.render()]
+    return '\n'.join(lines) + '\n' + profiling.prometheus_text()
+
+
+def start_server(port, addr=''):
+    """Serve ``/metrics`` from a daemon thread; returns the server, started once per process"""
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((addr, port), Handler)
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+            profiling.enable()
+    return _server
+
+
+def start_from_env():
+    """start_server on CAR_ESTIMATOR_METRICS_PORT if it is set; None otherwise"""
+    port = os.environ.get('CAR_ESTIMATOR_METRICS_PORT')
+    return start_server(int(port)) if port else None
+
@@ -0,0 +1,158 @@
+"""Named timing spans for the forecast pipeline.
+
+Profiling is off unless CAR_ESTIMATOR_PROFILE=1 is set or enable() is called.
+When it is off, span() and stages() return shared no-op objects, so the
+instrumented code pays a no-op call per stage.
+
+    with span('forecast.frame'):
+        frame = result.to_frame()
+
+    timer = stages('forecast')          # times consecutive stages of one function
+    ...
+    timer.mark('encode')                # records 'forecast.encode' since the previous mark
+
+Every span keeps an exact count and total plus its most recent MAX_SAMPLES
+durations, which the p50/p95/p99 figures are taken from. Stats can be written
+to a JSON file with export() or rendered in the Prometheus text format with
+prometheus_text(). benchmarks/forecast_stages.py runs a sample of forecasts
+with profiling on and prints the per-stage table.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+import numpy as np
+
+MAX_SAMPLES = 10000
+QUANTILES = (0.5, 0.95, 0.99)
+
+_enabled = os.environ.get('CAR_ESTIMATOR_PROFILE', '') not in ('', '0')
+_lock = threading.Lock()
+_spans = {}                     # name -> [count, total seconds, recent durations]
+
+
+def enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Drop every recorded span"""
+    with _lock:
+        _spans.clear()
+
+
+def record(name, seconds):
+    """Add one duration to span ``name``"""
+    with _lock:
+        entry = _spans.get(name)
+        if entry is None:
+            entry = _spans[name] = [0, 0.0, deque(maxlen=MAX_SAMPLES)]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2].append(seconds)
+
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+
+class _Stages:
+    """Records the time between consecutive mark() calls as ``<prefix>.<stage>`` spans"""
+    __slots__ = ('prefix', 'last')
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        record(f"{self.prefix}.{stage}", now - self.last)
+        self.last = now
+
+
+class _NoStages:
+    __slots__ = ()
+
+    def mark(self, stage):
+        pass
+
+
+_NO_SPAN = nullcontext()
+_NO_STAGES = _NoStages()
+
+
+def span(name):
+    """Context manager timing its block as span ``name`` while profiling is on"""
+    return _Span(name) if _enabled else _NO_SPAN
+
+
+def stages(prefix):
+    """Stage timer for one pass through a function; see the module docstring"""
+    return _Stages(prefix) if _enabled else _NO_STAGES
+
+
+def stats():
+    """``{name: {count, total, mean, max, p50, p95, p99}}`` in seconds, sorted by total time"""
+    with _lock:
+        snapshot = {name: (count, total, np.array(samples)) for name, (count, total, samples) in _spans.items()}
+    result = {}
+    for name, (count, total, samples) in sorted(snapshot.items(), key=lambda kv: -kv[1][1]):
+        quantiles = np.quantile(samples, QUANTILES)
+        result[name] = {
+            'count': count, 'total': total, 'mean': total / count, 'max': float(samples.max()),
+            **{f"p{round(q * 100)}": float(v) for q, v in zip(QUANTILES, quantiles)},
+        }
+    return result
+
+
+def stats_frame():
+    """stats() as a DataFrame with times in milliseconds"""
+    import pandas as pd
+    frame = pd.DataFrame.from_dict(stats(), orient='index')
+    if frame.empty:
+        return frame
+    times = [column for column in frame.columns if column != 'count']
+    frame[times] = frame[times] * 1000
+    frame.index.name = 'span'
+    return frame.rename(columns={column: f"{column} (ms)" for column in times})
+
+
+def export(path):
+    """Write stats() to ``path`` as JSON"""
+    with open(path, 'w') as f:
+        json.dump({'exported_at': time.time(), 'spans': stats()}, f, indent=2)
+
+
+def prometheus_text(metric='car_estimator_span_seconds'):
+    """Span stats as a Prometheus summary in the text exposition format"""
+    lines = [f"# HELP {metric} Time spent in each profiled stage", f"# TYPE {metric} summary"]
+    for name, s in stats().items():
+        for q in QUANTILES:
+            lines.append(f'{metric}{{span="{name}",quantile="{q}"}} {s[f"p{round(q * 100)}"]:.9g}')
+        lines.append(f'{metric}_sum{{span="{name}"}} {s["total"]:.9g}')
+        lines.append(f'{metric}_count{{span="{name}"}} {s["count"]}')
+    return '\n'.join(lines) + '\n'
+
@@ -0,0 +1,475 @@
+"""Reference tables used by the cost forecast.
+
+These are plain module-level literals so they are built once per process and
+shared by every Streamlit session and rerun instead of being rebuilt each time
+the script executes.
+"""
+
+# ─── Tier multipliers ──────────────────────────────────────────────────────────
+tier_multipliers = {
+    'Luxury':   1.2,
+    'Midrange': 1.0,
+    'Economy':  0.8
+}
+
+# ─── MSRP and Edmunds ratings ──────────────────────────────────────────────────
+msrp_data = {
+    ('Acura','MDX'):51000,('Acura','RDX'):41000,('Acura','TLX'):39000,('Acura','ILX'):31000,('Acura','NSX'):157000,
+    ('BMW','X1'):39000,('BMW','X3'):46000,('BMW','X5'):61000,('BMW','X7'):74000,
+    ('Chevrolet','Malibu'):26000,('Chevrolet','Tahoe'):54000,('Chevrolet','Silverado'):47000,
+    ('Ford','F-150'):35000,('Ford','Mustang'):31000,('Ford','Escape'):27000,
+    ('Honda','Civic'):23000,('Honda','Accord'):28000,('Honda','CR-V'):29000,
+    ('Hyundai','Elantra'):20000,('Hyundai','Sonata'):25000,('Hyundai','Tucson'):27000,
+    ('Kia','Optima'):24000,('Kia','Soul'):21000,('Kia','Sportage'):26000,
+    ('Lexus','ES'):42000,('Lexus','RX'):50000,('Lexus','NX'):42000,
+    ('Mazda','3'):22000,('Mazda','6'):25000,('Mazda','CX-5'):28000,
+    ('Mercedes-Benz','C-Class'):44000,('Mercedes-Benz','E-Class'):56000,('Mercedes-Benz','GLC'):49000,
+    ('Mini','Cooper'):25000,('Mini','Countryman'):32000,
+    ('Nissan','Altima'):25000,('Nissan','Sentra'):21000,('Nissan','Rogue'):28000,
+    ('Porsche','911'):105000,('Porsche','Cayenne'):79000,
+    ('Subaru','Impreza'):21000,('Subaru','Outback'):28000,('Subaru','Forester'):27000,
+    ('Toyota','Camry'):27000,('Toyota','Corolla'):21000,('Toyota','RAV4'):29000,
+    ('Volvo','XC60'):48000,('Volvo','XC90'):56000
+}
+
+# Vehicle ratings from accessible free sources (NHTSA, IIHS, Consumer Reports public data)
+vehicle_ratings = {
+    ('Acura','MDX'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA safety, IIHS Top Safety Pick, reliable luxury SUV'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Maintained excellent safety ratings, refreshed design'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced to Top Safety Pick+, improved LED headlights'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued safety excellence, technology updates'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained top-tier safety performance'}
+    },
+    ('BMW','X1'):{
+        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating, solid IIHS performance'},
+        2021:{'nhtsa':5,'iihs':'Good','desc':'Consistent safety performance, tech updates'},
+        2022:{'nhtsa':5,'iihs':'Good','desc':'Final year of generation, maintained quality'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'All-new generation, improved to TSP status'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Refined safety systems, enhanced features'}
+    },
+    ('BMW','X3'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Excellent safety across all categories'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced headlight performance for TSP+'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained premium safety standards'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued excellence in luxury SUV safety'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Industry-leading safety performance'}
+    },
+    ('Honda','Civic'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA, TSP award, excellent reliability'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced Honda Sensing safety suite'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'All-new generation achieves TSP+ status'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained top safety performance'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued compact car safety leadership'}
+    },
+    ('Honda','Accord'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA rating, TSP award'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Consistent midsize sedan safety excellence'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced to TSP+ with improved lighting'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Refreshed design maintains TSP+ status'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Industry-leading midsize sedan safety'}
+    },
+    ('Honda','CR-V'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Popular compact SUV with excellent safety'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Maintained TSP status with special editions'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Updated styling retains safety excellence'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'All-new generation achieves TSP+ award'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced safety tech and efficiency'}
+    },
+    ('Toyota','Camry'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'5-star NHTSA rating, reliable midsize sedan'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced Toyota Safety Sense 2.0'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Improved to TSP+ with lighting upgrades'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Maintained TSP+ with consistent quality'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced safety tech and reliability'}
+    },
+    ('Toyota','Corolla'):{
+        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating, excellent reliability'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced to TSP with improved safety tech'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Maintained TSP status with updates'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Continued compact car safety leadership'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Refined Toyota Safety Sense features'}
+    },
+    ('Toyota','RAV4'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Popular compact SUV with standard AWD'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Prime PHEV variant maintains TSP status'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced to TSP+ with improved lighting'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued compact SUV safety leadership'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Refreshed design maintains TSP+ award'}
+    },
+    ('Ford','F-150'):{
+        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating, America\'s best-selling truck'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'All-new generation with enhanced safety tech'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Lightning EV variant maintains safety excellence'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Continued truck safety leadership'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Advanced driver assistance systems'}
+    },
+    ('Chevrolet','Malibu'):{
+        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star overall NHTSA rating, good IIHS scores'},
+        2021:{'nhtsa':5,'iihs':'Good','desc':'Maintained safety performance, updated features'},
+        2022:{'nhtsa':5,'iihs':'Good','desc':'Consistent midsize sedan safety'},
+        2023:{'nhtsa':5,'iihs':'Good','desc':'Final production year, maintained standards'},
+        2024:{'nhtsa':None,'iihs':None,'desc':'Model discontinued'}
+    },
+    ('Nissan','Altima'):{
+        2020:{'nhtsa':5,'iihs':'Good','desc':'5-star NHTSA rating with ProPILOT Assist'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced to TSP with improved safety tech'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Refreshed design maintains TSP status'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Enhanced Safety Shield 360 technology'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick','desc':'Continued midsize sedan safety leadership'}
+    },
+    ('Subaru','Outback'):{
+        2020:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'All-new generation with TSP+ award'},
+        2021:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Enhanced EyeSight driver assistance'},
+        2022:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Wilderness variant maintains TSP+ status'},
+        2023:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Continued adventure vehicle safety excellence'},
+        2024:{'nhtsa':5,'iihs':'Top Safety Pick+','desc':'Refined EyeSight and safety systems'}
+    }
+}
+
+# ─── Fuel requirements by make/model ────────────────────────────────────────────
+fuel_requirements = {
+    'Acura': {'MDX': 'premium', 'RDX': 'premium', 'TLX': 'premium', 'ILX': 'regular', 'NSX': 'premium'},
+    'BMW': {'X1': 'premium', 'X3': 'premium', 'X5': 'premium', 'X7': 'premium', 
+            'M3': 'premium', 'M4': 'premium', 'M5': 'premium', 'M8': 'premium',
+            '328i': 'premium', '530i': 'premium', '750i': 'premium', 'i4': 'electric', 'iX': 'electric'},
+    'Chevrolet': {'Malibu': 'regular', 'Tahoe': 'regular', 'Silverado': 'regular', 'Equinox': 'regular'},
+    'Ford': {'F-150': 'regular', 'Mustang': 'premium', 'Escape': 'regular'},
+    'Honda': {'Civic': 'regular', 'Accord': 'regular', 'CR-V': 'regular'},
+    'Hyundai': {'Elantra': 'regular', 'Sonata': 'regular', 'Tucson': 'regular'},
+    'Kia': {'Optima': 'regular', 'Soul': 'regular', 'Sportage': 'regular'},
+    'Lexus': {'ES': 'premium', 'RX': 'premium', 'NX': 'premium'},
+    'Mazda': {'3': 'regular', '6': 'regular', 'CX-5': 'regular'},
+    'Mercedes-Benz': {'C-Class': 'premium', 'E-Class': 'premium', 'GLC': 'premium'},
+    'Mini': {'Cooper': 'premium', 'Countryman': 'premium'},
+    'Nissan': {'Altima': 'regular', 'Sentra': 'regular', 'Rogue': 'regular'},
+    'Porsche': {'911': 'premium', 'Cayenne': 'premium'},
+    'Subaru': {'Impreza': 'regular', 'Outback': 'regular', 'Forester': 'regular'},
+    'Toyota': {'Camry': 'regular', 'Corolla': 'regular', 'RAV4': 'regular'},
+    'Volvo': {'XC60': 'premium', 'XC90': 'premium'},
+    'Tesla': {'Model 3': 'electric', 'Model S': 'electric', 'Model X': 'electric', 'Model Y': 'electric'}
+}
+
+# ─── State fuel prices (regular/premium) ───────────────────────────────────────
+state_fuel_prices = {
+    'Alabama': {'regular': 3.20, 'premium': 3.90}, 'Alaska': {'regular': 3.80, 'premium': 4.50},
+    'Arizona': {'regular': 3.45, 'premium': 4.15}, 'Arkansas': {'regular': 3.15, 'premium': 3.85},
+    'California': {'regular': 4.85, 'premium': 5.55}, 'Colorado': {'regular': 3.40, 'premium': 4.10},
+    'Connecticut': {'regular': 3.65, 'premium': 4.35}, 'Delaware': {'regular': 3.35, 'premium': 4.05},
+    'Florida': {'regular': 3.30, 'premium': 4.00}, 'Georgia': {'regular': 3.25, 'premium': 3.95},
+    'Hawaii': {'regular': 4.20, 'premium': 4.90}, 'Idaho': {'regular': 3.55, 'premium': 4.25},
+    'Illinois': {'regular': 3.75, 'premium': 4.45}, 'Indiana': {'regular': 3.35, 'premium': 4.05},
+    'Iowa': {'regular': 3.25, 'premium': 3.95}, 'Kansas': {'regular': 3.20, 'premium': 3.90},
+    'Kentucky': {'regular': 3.30, 'premium': 4.00}, 'Louisiana': {'regular': 3.10, 'premium': 3.80},
+    'Maine': {'regular': 3.50, 'premium': 4.20}, 'Maryland': {'regular': 3.55, 'premium': 4.25},
+    'Massachusetts': {'regular': 3.70, 'premium': 4.40}, 'Michigan': {'regular': 3.45, 'premium': 4.15},
+    'Minnesota': {'regular': 3.40, 'premium': 4.10}, 'Mississippi': {'regular': 3.05, 'premium': 3.75},
+    'Missouri': {'regular': 3.15, 'premium': 3.85}, 'Montana': {'regular': 3.60, 'premium': 4.30},
+    'Nebraska': {'regular': 3.25, 'premium': 3.95}, 'Nevada': {'regular': 3.85, 'premium': 4.55},
+    'New Hampshire': {'regular': 3.45, 'premium': 4.15}, 'New Jersey': {'regular': 3.50, 'premium': 4.20},
+    'New Mexico': {'regular': 3.35, 'premium': 4.05}, 'New York': {'regular': 3.75, 'premium': 4.45},
+    'North Carolina': {'regular': 3.25, 'premium': 3.95}, 'North Dakota': {'regular': 3.30, 'premium': 4.00},
+    'Ohio': {'regular': 3.40, 'premium': 4.10}, 'Oklahoma': {'regular': 3.10, 'premium': 3.80},
+    'Oregon': {'regular': 3.85, 'premium': 4.55}, 'Pennsylvania': {'regular': 3.65, 'premium': 4.35},
+    'Rhode Island': {'regular': 3.60, 'premium': 4.30}, 'South Carolina': {'regular': 3.20, 'premium': 3.90},
+    'South Dakota': {'regular': 3.25, 'premium': 3.95}, 'Tennessee': {'regular': 3.15, 'premium': 3.85},
+    'Texas': {'regular': 3.00, 'premium': 3.70}, 'Utah': {'regular': 3.55, 'premium': 4.25},
+    'Vermont': {'regular': 3.65, 'premium': 4.35}, 'Virginia': {'regular': 3.35, 'premium': 4.05},
+    'Washington': {'regular': 4.10, 'premium': 4.80}, 'West Virginia': {'regular': 3.40, 'premium': 4.10},
+    'Wisconsin': {'regular': 3.35, 'premium': 4.05}, 'Wyoming': {'regular': 3.45, 'premium': 4.15}
+}
+
+# ─── Lookup tables ─────────────────────────────────────────────────────────────
+car_makes_and_models = {
+    'Acura': ['MDX', 'RDX', 'TLX', 'ILX', 'NSX'],
+    'Alfa Romeo': ['Giulia', 'Stelvio', '4C'],
+    'Audi': ['A3', 'A4', 'A5', 'A6', 'A7', 'A8', 'Q3', 'Q5', 'Q7', 'Q8', 'Q5 Sportback', 'S4', 'RS7'],
+    'BMW': ['X1', 'X3', 'X5', 'X7', 'M3', 'M4', 'M5', 'M8', '328i', '530i', '750i', 'i4', 'iX'],
+    'Buick': ['Enclave', 'Encore', 'LaCrosse', 'Regal', 'Envision'],
+    'Cadillac': ['Escalade', 'XT5', 'CTS', 'ATS', 'CT4', 'CT5', 'XT4', 'SRX'],
+    'Chevrolet': ['Equinox', 'Malibu', 'Silverado 1500', 'Traverse', 'Tahoe', 'Impala', 'Colorado', 'Suburban', 'Spark', 'Silverado'],
+    'Chrysler': ['Pacifica', 'Voyager', '300'],
+    'Dodge': ['Charger', 'Durango', 'Ram 1500', 'Challenger', 'Grand Caravan'],
+    'Fiat': ['500', '500X', '124 Spider'],
+    'Ford': ['F-150', 'Mustang', 'Explorer', 'Escape', 'Bronco', 'Edge', 'Ranger', 'Fusion', 'Expedition'],
+    'GMC': ['Sierra 1500', 'Yukon', 'Canyon', 'Acadia', 'Terrain'],
+    'Honda': ['Civic', 'Accord', 'CR-V', 'Pilot', 'Odyssey', 'Ridgeline', 'Insight'],
+    'Hyundai': ['Elantra', 'Sonata', 'Tucson', 'Santa Fe', 'Kona', 'Palisade', 'Veloster'],
+    'Infiniti': ['Q50', 'Q60', 'QX60', 'QX80', 'QX50'],
+    'Jaguar': ['F-PACE', 'XE', 'XJ', 'F-TYPE'],
+    'Jeep': ['Grand Cherokee', 'Wrangler', 'Cherokee', 'Compass', 'Renegade'],
+    'Kia': ['Sorento', 'Optima', 'Stinger', 'Sportage', 'Telluride', 'Seltos', 'Niro', 'Soul'],
+    'Lexus': ['RX', 'ES', 'NX', 'GX', 'LX', 'IS', 'LS', 'UX'],
+    'Lincoln': ['Navigator', 'MKX', 'Corsair', 'MKZ'],
+    'Mazda': ['CX-5', 'Mazda 3', 'Mazda 6', 'MX-5 Miata', 'CX-9'],
+    'McLaren': ['720S', '570S', 'GT', '765LT'],
+    'Mercedes-Benz': ['C-Class', 'E-Class', 'GLC', 'S-Class', 'GLS', 'A-Class', 'CLA', 'G-Class', 'AMG GT'],
+    'Mini': ['Cooper', 'Countryman', 'Clubman'],
+    'Mitsubishi': ['Outlander', 'Eclipse Cross', 'Mirage'],
+    'Nissan': ['Altima', 'Maxima', 'Sentra', 'Murano', 'Rogue', 'Titan', '370Z'],
+    'Porsche': ['911', 'Macan', 'Cayenne', 'Panamera', 'Taycan'],
+    'Ram': ['1500', '2500', '3500', 'ProMaster'],
+    'Subaru': ['Outback', 'Forester', 'Impreza', 'Crosstrek', 'Legacy'],
+    'Tesla': ['Model 3', 'Model S', 'Model X', 'Model Y'],
+    'Toyota': ['Camry', 'Corolla', 'RAV4', 'Highlander', 'Tacoma', 'Tundra', 'Land Cruiser', 'Sequoia'],
+    'Volkswagen': ['Passat', 'Jetta', 'Tiguan', 'Atlas', 'Golf'],
+    'Volvo': ['XC90', 'XC60', 'S60', 'V90', 'XC40']
+}
+
+# ─── Vehicle Lifespan Data ─────────────────────────────────────────────────────
+# Expected vehicle lifespan in years based on make/model reliability data
+vehicle_lifespan = {
+    'Toyota': {'default': 20, 'Camry': 22, 'Corolla': 25, 'RAV4': 20, 'Highlander': 18, 'Tacoma': 25, 'Tundra': 22, 'Land Cruiser': 30, 'Sequoia': 20},
+    'Honda': {'default': 20, 'Civic': 22, 'Accord': 20, 'CR-V': 18, 'Pilot': 17, 'Odyssey': 16, 'Ridgeline': 20, 'Insight': 18},
+    'Lexus': {'default': 18, 'ES': 20, 'RX': 18, 'NX': 16, 'GX': 22, 'LX': 25, 'IS': 18, 'LS': 20, 'UX': 16},
+    'Acura': {'default': 16, 'MDX': 16, 'RDX': 15, 'TLX': 16, 'ILX': 16, 'NSX': 12},
+    'Subaru': {'default': 18, 'Outback': 20, 'Forester': 18, 'Impreza': 18, 'Crosstrek': 17, 'Legacy': 18},
+    'Mazda': {'default': 16, '3': 16, '6': 16, 'CX-5': 15, 'Mazda3': 16, 'Mazda6': 16, 'MX-5 Miata': 18, 'CX-9': 15},
+    'Nissan': {'default': 15, 'Altima': 15, 'Sentra': 14, 'Rogue': 14, 'Maxima': 16, 'Murano': 15, 'Titan': 18, '370Z': 14},
+    'Hyundai': {'default': 14, 'Elantra': 14, 'Sonata': 15, 'Tucson': 13, 'Santa Fe': 14, 'Kona': 12, 'Palisade': 14, 'Veloster': 12},
+    'Kia': {'default': 14, 'Optima': 14, 'Soul': 13, 'Sportage': 13, 'Sorento': 14, 'Stinger': 12, 'Telluride': 14, 'Seltos': 12, 'Niro': 14},
+    'Ford': {'default': 14, 'F-150': 18, 'Mustang': 15, 'Escape': 13, 'Explorer': 14, 'Bronco': 16, 'Edge': 13, 'Ranger': 16, 'Fusion': 14, 'Expedition': 16},
+    'Chevrolet': {'default': 13, 'Malibu': 13, 'Tahoe': 16, 'Silverado': 18, 'Equinox': 12, 'Silverado 1500': 18, 'Traverse': 13, 'Impala': 14, 'Colorado': 16, 'Suburban': 18, 'Spark': 10},
+    'GMC': {'default': 14, 'Sierra 1500': 18, 'Yukon': 16, 'Canyon': 16, 'Acadia': 13, 'Terrain': 12},
+    'BMW': {'default': 12, 'X1': 12, 'X3': 13, 'X5': 14, 'X7': 12, 'M3': 10, 'M4': 10, 'M5': 10, 'M8': 10, '328i': 12, '530i': 13, '750i': 12, 'i4': 15, 'iX': 15},
+    'Mercedes-Benz': {'default': 12, 'C-Class': 12, 'E-Class': 13, 'GLC': 12, 'S-Class': 14, 'GLS': 13, 'A-Class': 11, 'CLA': 11, 'G-Class': 20, 'AMG GT': 10},
+    'Audi': {'default': 12, 'A3': 11, 'A4': 12, 'A5': 12, 'A6': 13, 'A7': 12, 'A8': 13, 'Q3': 11, 'Q5': 12, 'Q7': 13, 'Q8': 12, 'Q5 Sportback': 12, 'S4': 10, 'RS7': 10},
+    'Volvo': {'default': 14, 'XC90': 15, 'XC60': 14, 'S60': 13, 'V90': 14, 'XC40': 12},
+    'Mini': {'default': 11, 'Cooper': 11, 'Countryman': 12, 'Clubman': 11},
+    'Porsche': {'default': 12, '911': 15, 'Cayenne': 12, 'Macan': 11, 'Panamera': 12, 'Taycan': 15},
+    'Jaguar': {'default': 10, 'F-PACE': 10, 'XE': 9, 'XJ': 11, 'F-TYPE': 10},
+    'Tesla': {'default': 15, 'Model 3': 15, 'Model S': 16, 'Model X': 14, 'Model Y': 15},
+    'Jeep': {'default': 12, 'Grand Cherokee': 13, 'Wrangler': 15, 'Cherokee': 12, 'Compass': 11, 'Renegade': 10},
+    'Ram': {'default': 16, '1500': 16, '2500': 18, '3500': 20, 'ProMaster': 14},
+    'Cadillac': {'default': 11, 'Escalade': 13, 'XT5': 11, 'CTS': 12, 'ATS': 10, 'CT4': 11, 'CT5': 12, 'XT4': 10, 'SRX': 11},
+    'Lincoln': {'default': 12, 'Navigator': 13, 'MKX': 12, 'Corsair': 11, 'MKZ': 12},
+    'Infiniti': {'default': 12, 'Q50': 12, 'Q60': 11, 'QX60': 13, 'QX80': 14, 'QX50': 11},
+    'Buick': {'default': 13, 'Enclave': 13, 'Encore': 12, 'LaCrosse': 14, 'Regal': 13, 'Envision': 12},
+    'Chrysler': {'default': 11, 'Pacifica': 11, 'Voyager': 10, '300': 12},
+    'Dodge': {'default': 11, 'Charger': 12, 'Durango': 12, 'Ram 1500': 16, 'Challenger': 13, 'Grand Caravan': 10},
+    'Mitsubishi': {'default': 12, 'Outlander': 12, 'Eclipse Cross': 11, 'Mirage': 10},
+    'Volkswagen': {'default': 11, 'Passat': 11, 'Jetta': 12, 'Tiguan': 11, 'Atlas': 11, 'Golf': 12},
+    'Fiat': {'default': 8, '500': 8, '500X': 9, '124 Spider': 10},
+    'McLaren': {'default': 8, '720S': 8, '570S': 8, 'GT': 9, '765LT': 7},
+    'Alfa Romeo': {'default': 9, 'Giulia': 9, 'Stelvio': 10, '4C': 8}
+}
+
+# State electricity rates ($/kWh) for residential use
+state_electricity_rates = {
+    'Alabama': 0.1421, 'Alaska': 0.2298, 'Arizona': 0.1378, 'Arkansas': 0.1140,
+    'California': 0.2855, 'Colorado': 0.1378, 'Connecticut': 0.2406, 'Delaware': 0.1355,
+    'Florida': 0.1302, 'Georgia': 0.1268, 'Hawaii': 0.4018, 'Idaho': 0.1089,
+    'Illinois': 0.1371, 'Indiana': 0.1465, 'Iowa': 0.1421, 'Kansas': 0.1418,
+    'Kentucky': 0.1198, 'Louisiana': 0.1089, 'Maine': 0.1640, 'Maryland': 0.1421,
+    'Massachusetts': 0.2298, 'Michigan': 0.1640, 'Minnesota': 0.1421, 'Mississippi': 0.1235,
+    'Missouri': 0.1198, 'Montana': 0.1140, 'Nebraska': 0.1089, 'Nevada': 0.1235,
+    'New Hampshire': 0.1888, 'New Jersey': 0.1640, 'New Mexico': 0.1355, 'New York': 0.2051,
+    'North Carolina': 0.1198, 'North Dakota': 0.1089, 'Ohio': 0.1355, 'Oklahoma': 0.1235,
+    'Oregon': 0.1140, 'Pennsylvania': 0.1465, 'Rhode Island': 0.2051, 'South Carolina': 0.1355,
+    'South Dakota': 0.1198, 'Tennessee': 0.1198, 'Texas': 0.1235, 'Utah': 0.1140,
+    'Vermont': 0.1888, 'Virginia': 0.1235, 'Washington': 0.1037, 'West Virginia': 0.1198,
+    'Wisconsin': 0.1421, 'Wyoming': 0.1140
+}
+
+# EV charging efficiency and consumption data
+ev_charging_data = {
+    'Tesla': {
+        'Model 3': {
+            'battery_kwh': 75, 'efficiency_miles_per_kwh': 4.0, 'range_miles': 300,
+            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
+        },
+        'Model S': {
+            'battery_kwh': 100, 'efficiency_miles_per_kwh': 3.4, 'range_miles': 340,
+            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
+        },
+        'Model X': {
+            'battery_kwh': 100, 'efficiency_miles_per_kwh': 3.0, 'range_miles': 300,
+            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
+        },
+        'Model Y': {
+            'battery_kwh': 75, 'efficiency_miles_per_kwh': 3.7, 'range_miles': 280,
+            'home_charging_loss': 0.10, 'public_charging_loss': 0.15
+        }
+    },
+    'BMW': {
+        'i4': {
+            'battery_kwh': 84, 'efficiency_miles_per_kwh': 3.5, 'range_miles': 294,
+            'home_charging_loss': 0.12, 'public_charging_loss': 0.18
+        },
+        'iX': {
+            'battery_kwh': 106, 'efficiency_miles_per_kwh': 2.8, 'range_miles': 297,
+            'home_charging_loss': 0.12, 'public_charging_loss': 0.18
+        }
+    },
+    'Porsche': {
+        'Taycan': {
+            'battery_kwh': 93, 'efficiency_miles_per_kwh': 2.4, 'range_miles': 223,
+            'home_charging_loss': 0.12, 'public_charging_loss': 0.18
+        }
+    }
+}
+
+# Time-of-use electricity rates for EV optimization ($/kWh)
+time_of_use_rates = {
+    'California': {'peak': 0.52, 'off_peak': 0.16, 'ev_rate': 0.13},
+    'Texas': {'peak': 0.18, 'off_peak': 0.08, 'ev_rate': 0.10},
+    'Florida': {'peak': 0.16, 'off_peak': 0.09, 'ev_rate': 0.11},
+    'New York': {'peak': 0.28, 'off_peak': 0.12, 'ev_rate': 0.14},
+    'Illinois': {'peak': 0.19, 'off_peak': 0.08, 'ev_rate': 0.10},
+    'Arizona': {'peak': 0.20, 'off_peak': 0.08, 'ev_rate': 0.09},
+    'Washington': {'peak': 0.14, 'off_peak': 0.06, 'ev_rate': 0.07},
+    'Massachusetts': {'peak': 0.32, 'off_peak': 0.14, 'ev_rate': 0.16},
+    'Colorado': {'peak': 0.18, 'off_peak': 0.08, 'ev_rate': 0.10},
+    'Georgia': {'peak': 0.16, 'off_peak': 0.08, 'ev_rate': 0.09}
+}
+
+# ─── Vehicle MPG/Efficiency Data ───────────────────────────────────────────────
+average_mpg = {
+    'Acura': {
+        'MDX': 22, 'RDX': 23, 'TLX': 24, 'ILX': 25, 'NSX': 21
+    },
+    'BMW': {
+        'X1': 28, 'X3': 25, 'X5': 22, 'X7': 21,
+        'M3': 20, 'M4': 19, 'M5': 18, 'M8': 17,
+        '328i': 30, '530i': 29, '750i': 22,
+        'i4': 103, 'iX': 80
+    },
+    'Chevrolet': {
+        'Malibu': 29, 'Tahoe': 20, 'Silverado': 23,
+        'Equinox': 26, 'Silverado 1500': 20, 'Traverse': 22,
+        'Impala': 19, 'Colorado': 20, 'Suburban': 19, 'Spark': 30
+    },
+    'Ford': {
+        'F-150': 20, 'Mustang': 24, 'Escape': 27,
+        'Explorer': 24, 'Bronco': 21, 'Edge': 24,
+        'Ranger': 23, 'Fusion': 25, 'Expedition': 17
+    },
+    'Honda': {
+        'Civic': 32, 'Accord': 30, 'CR-V': 29,
+        'Pilot': 22, 'Odyssey': 28, 'Ridgeline': 21, 'Insight': 52
+    },
+    'Hyundai': {
+        'Elantra': 33, 'Sonata': 31, 'Tucson': 26,
+        'Santa Fe': 25, 'Kona': 28, 'Palisade': 22, 'Veloster': 28
+    },
+    'Kia': {
+        'Optima': 27, 'Soul': 28, 'Sportage': 26,
+        'Sorento': 25, 'Stinger': 22, 'Telluride': 21, 'Seltos': 29, 'Niro': 50
+    },
+    'Lexus': {
+        'ES': 26, 'RX': 23, 'NX': 25,
+        'GX': 16, 'LX': 16, 'IS': 26, 'LS': 23, 'UX': 29
+    },
+    'Mazda': {
+        '3': 28, '6': 26, 'CX-5': 25,
+        'Mazda3': 28, 'Mazda6': 26, 'MX-5 Miata': 26, 'CX-9': 22
+    },
+    'Mercedes-Benz': {
+        'C-Class': 25, 'E-Class': 24, 'GLC': 24,
+        'S-Class': 21, 'GLS': 19, 'A-Class': 30, 'CLA': 27, 'G-Class': 13, 'AMG GT': 18
+    },
+    'Mini': {
+        'Cooper': 29, 'Countryman': 27, 'Clubman': 27
+    },
+    'Nissan': {
+        'Altima': 32, 'Sentra': 29, 'Rogue': 28,
+        'Maxima': 23, 'Murano': 25, 'Titan': 18, '370Z': 19
+    },
+    'Porsche': {
+        '911': 22, 'Cayenne': 22,
+        'Macan': 21, 'Panamera': 22, 'Taycan': 72
+    },
+    'Subaru': {
+        'Impreza': 31, 'Outback': 29, 'Forester': 28,
+        'Crosstrek': 28, 'Legacy': 29
+    },
+    'Toyota': {
+        'Camry': 32, 'Corolla': 33, 'RAV4': 28,
+        'Highlander': 24, 'Tacoma': 20, 'Tundra': 17, 'Land Cruiser': 14, 'Sequoia': 17
+    },
+    'Volvo': {
+        'XC60': 24, 'XC90': 21, 'S60': 26, 'V90': 25, 'XC40': 28
+    },
+    'Tesla': {'Model 3': 120, 'Model S': 102, 'Model X': 90, 'Model Y': 112},
+}
+
+# ─── Maintenance Schedules & Costs ─────────────────────────────────────────────
+
+# Regular ICE maintenance schedule
+maintenance_schedule = {
+    'Oil Change':5000,'Tire Rotation':7500,'Cabin Air Filter Replacement':15000,
+    'Brake Inspection':20000,'Coolant Flush':30000,'Battery Check':30000,
+    'Brake Pad Replacement':40000,'Transmission Fluid Replacement':60000,
+    'Spark Plug Replacement':80000,'Alternator Inspection':90000,
+    'Timing Belt Replacement':100000,'Wheel Bearings Check':110000,
+    'AC System Service':120000,'Head Gasket Inspection':130000,
+    'Major Overhaul Recommended':150000
+}
+
+# Electric vehicle maintenance schedule
+ev_maintenance_schedule = {
+    'Tire Rotation':7500,'Cabin Air Filter Replacement':15000,
+    'Brake Inspection':25000,'Battery Coolant Check':30000,'12V Battery Check':30000,
+    'Brake Pad Replacement':60000,'Drive Unit Service':60000,
+    'HVAC Filter Replacement':24000,'Wheel Bearings Check':100000,
+    'AC System Service':120000,'Battery Health Check':100000
+}
+
+# Enhanced maintenance costs with labor/parts breakdown
+maintenance_costs = {
+    # Regular maintenance
+    'Oil Change': {'labor': 25, 'parts': 35, 'total': 60},
+    'Tire Rotation': {'labor': 25, 'parts': 0, 'total': 25},
+    'Cabin Air Filter Replacement': {'labor': 20, 'parts': 25, 'total': 45},
+    'Brake Inspection': {'labor': 40, 'parts': 0, 'total': 40},
+    'Coolant Flush': {'labor': 60, 'parts': 40, 'total': 100},
+    '12V Battery Check': {'labor': 20, 'parts': 0, 'total': 20},
+    'Battery Check': {'labor': 30, 'parts': 0, 'total': 30},
+    'Brake Pad Replacement': {'labor': 80, 'parts': 120, 'total': 200},
+    'Transmission Fluid Replacement': {'labor': 75, 'parts': 85, 'total': 160},
+    'Spark Plug Replacement': {'labor': 60, 'parts': 80, 'total': 140},
+    'Alternator Inspection': {'labor': 60, 'parts': 0, 'total': 60},
+    'Timing Belt Replacement': {'labor': 450, 'parts': 350, 'total': 800},
+    'Wheel Bearings Check': {'labor': 100, 'parts': 0, 'total': 100},
+    'AC System Service': {'labor': 90, 'parts': 60, 'total': 150},
+    'Head Gasket Inspection': {'labor': 200, 'parts': 0, 'total': 200},
+    'Major Overhaul Recommended': {'labor': 2000, 'parts': 1500, 'total': 3500},
+    
+    # EV-specific maintenance
+    'Battery Coolant Check': {'labor': 40, 'parts': 20, 'total': 60},
+    'Drive Unit Service': {'labor': 120, 'parts': 80, 'total': 200},
+    'HVAC Filter Replacement': {'labor': 30, 'parts': 40, 'total': 70},
+    'Battery Health Check': {'labor': 80, 'parts': 0, 'total': 80},
+    
+    # Age-related maintenance (appears in older vehicles)
+    'Transmission Service': {'labor': 150, 'parts': 150, 'total': 300},
+    'Suspension Check': {'labor': 100, 'parts': 50, 'total': 150},
+    'Engine Mount Replacement': {'labor': 400, 'parts': 400, 'total': 800},
+    'CV Joint Replacement': {'labor': 300, 'parts': 250, 'total': 550},
+    'Power Steering Service': {'labor': 80, 'parts': 70, 'total': 150},
+    'Radiator Replacement': {'labor': 200, 'parts': 300, 'total': 500},
+    'Catalytic Converter Replacement': {'labor': 150, 'parts': 800, 'total': 950},
+    
+    # Extreme aging maintenance (beyond expected lifespan)
+    'Battery Pack Degradation Service': {'labor': 500, 'parts': 1500, 'total': 2000},
+    'Drive Unit Overhaul': {'labor': 800, 'parts': 1200, 'total': 2000},
+    'Engine Overhaul': {'labor': 2000, 'parts': 3000, 'total': 5000},
+    'Transmission Rebuild': {'labor': 1500, 'parts': 2000, 'total': 3500}
+}
+
+# ─── State Cost Multipliers ────────────────────────────────────────────────────
+state_cost_multipliers = {
+    'Alabama':1.00,'Alaska':1.10,'Arizona':1.05,'Arkansas':0.95,
+    'California':1.25,'Colorado':1.10,'Connecticut':1.20,'Delaware':1.05,
+    'Florida':1.00,'Georgia':1.00,'Hawaii':1.30,'Idaho':0.95,
+    'Illinois':1.10,'Indiana':0.95,'Iowa':0.90,'Kansas':0.95,
+    'Kentucky':0.95,'Louisiana':1.00,'Maine':1.05,'Maryland':1.20,
+    'Massachusetts':1.25,'Michigan':1.00,'Minnesota':1.00,'Mississippi':0.90,
+    'Missouri':0.95,'Montana':0.95,'Nebraska':0.95,'Nevada':1.05,
+    'New Hampshire':1.10,'New Jersey':1.25,'New Mexico':0.95,'New York':1.30,
+    'North Carolina':1.00,'North Dakota':0.90,'Ohio':0.95,'Oklahoma':0.95,
+    'Oregon':1.10,'Pennsylvania':1.10,'Rhode Island':1.15,'South Carolina':0.95,
+    'South Dakota':0.90,'Tennessee':0.95,'Texas':1.00,'Utah':1.00,
+    'Vermont':1.10,'Virginia':1.10,'Washington':1.15,'West Virginia':0.90,
+    'Wisconsin':1.00,'Wyoming':0.90
+}
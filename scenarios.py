@@ -0,0 +1,200 @@
+"""Compare variants of one forecast by recomputing only what each one changes.
+
+A scenario is a base set of forecast_costs inputs plus overrides, e.g.
+``{'loan_amount': 0}`` to pay cash, ``{'charging': 'home'}`` to charge an EV
+at home only, or ``{'driving_style': 'aggressive'}``. ``charging`` is a
+CHARGING_SHARES preference and defaults to 'mixed', which is what forecasts
+use.
+
+Most inputs only reach one or two forecast components:
+
+- loan payments: ``loan_amount``, ``irate``, ``lt_years``
+- insurance: ``user_age``, ``start_age``, ``msrp``
+- value and depreciation: ``purchase_price``
+- fuel/electricity: ``mpg``, ``charging``
+
+A scenario that only overrides these keeps every other component of the base
+forecast. Only the components it reaches are recomputed, for all such
+scenarios together, one vectorized call per component. The remaining inputs
+(``make``, ``model``, ``model_year``, ``current_mileage``, ``avg_mpy``,
+``state``, ``driving_style``, ``terrain``) feed maintenance, which everything
+else builds on. Scenarios that override any of them are forecast in full, in
+a single forecast_batch call.
+
+Incrementally updated scenarios match forecasting them on their own bit for
+bit. Scenarios forecast in full match up to the last-bit rounding that any
+forecast_batch row can show between batch sizes.
+
+    comparison = compare_scenarios(base, {'Cash': {'loan_amount': 0}, 'Home charging': {'charging': 'home'}})
+    comparison.delta('total')           # (scenarios, years) change against the base
+    comparison.delta_frame()            # per-year deltas, one column per scenario
+
+The base forecast is read through the persistent forecast cache
+(forecast_store), so when the app has already forecast the base, the
+comparison costs only the incremental updates. It is always looked up by the
+base's own inputs and start year, so deltas can't be taken against a forecast
+of something else.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from amortization import annual_schedule
+from battery import battery_curves, battery_specs
+from estimator import (
+    REGISTRATION_FEE, forecast_batch, fuel_costs, insurance_premiums, model_fingerprint, value_curves
+)
+from forecast_result import ForecastBatch, ForecastResult
+from forecast_store import stored_forecast
+
+# forecast_costs arguments, in order, plus the EV charging preference
+INPUTS = (
+    'make', 'model', 'model_year', 'current_mileage', 'avg_mpy', 'mpg', 'purchase_price', 'state',
+    'years', 'loan_amount', 'irate', 'lt_years', 'user_age', 'start_age', 'msrp', 'driving_style', 'terrain',
+)
+DEFAULTS = {'charging': 'mixed'}
+
+# Inputs each separately recomputable component depends on
+COMPONENT_INPUTS = {
+    'loan': ('loan_amount', 'irate', 'lt_years'),
+    'insurance': ('user_age', 'start_age', 'msrp'),
+    'value': ('purchase_price',),
+    'fuel': ('mpg', 'charging'),
+}
+INCREMENTAL_INPUTS = frozenset(name for names in COMPONENT_INPUTS.values() for name in names)
+RESULT_FIELDS = ('maintenance', 'fuel', 'loan', 'depreciation', 'total', 'value', 'insurance', 'activities')
+
+
+@dataclass(frozen=True)
+class ScenarioComparison:
+    """A base forecast and its scenarios; ``scenarios`` holds one row per label"""
+    labels: list
+    base: ForecastResult
+    scenarios: ForecastBatch
+    recomputed: list            # per scenario: the components recomputed, or ('forecast',) if forecast in full
+
+    @property
+    def years(self):
+        return self.base.years
+
+    def delta(self, component='total'):
+        """``(scenarios, years)`` change in a ForecastResult field against the base"""
+        return getattr(self.scenarios, component) - getattr(self.base, component)
+
+    def delta_frame(self, component='total'):
+        """Per-year change in ``component``, one column per scenario"""
+        import pandas as pd
+        return pd.DataFrame(self.delta(component).T, columns=self.labels,
+                            index=pd.Index([f"Year {i}" for i in range(1, self.years + 1)], name='Year'))
+
+    def summary_frame(self):
+        """Change in each cost component over the whole horizon, one row per scenario"""
+        import pandas as pd
+        components = ('maintenance', 'fuel', 'loan', 'insurance', 'depreciation', 'total')
+        return pd.DataFrame({component: self.delta(component).sum(axis=1) for component in components},
+                            index=pd.Index(self.labels, name='Scenario'))
+
+
+def _label(overrides):
+    return ', '.join(f"{name}={value}" for name, value in overrides.items()) or 'base'
+
+
+def _column(inputs, name, dtype=None):
+    return np.array([row[name] for row in inputs], dtype=dtype)
+
+
+def _batch(inputs, start_year):
+    """forecast_batch over a list of complete input dicts with the same horizon"""
+    columns = {name: _column(inputs, name, object if name == 'msrp' else None) for name in INPUTS}
+    columns['years'] = inputs[0]['years']
+    return forecast_batch(*columns.values(), start_year=start_year, chargings=_column(inputs, 'charging', object))
+
+
+def _base_forecast(base, start_year):
+    """The base's ForecastResult, from the persistent cache when it holds one"""
+    if base['charging'] == DEFAULTS['charging']:
+        return stored_forecast(*(base[name] for name in INPUTS), start_year=start_year)
+    return _batch([base], start_year)[0]
+
+
+def compare_scenarios(base, scenarios, start_year=None):
+    """Forecast ``base`` and each scenario's overrides of it, sharing the base's unaffected components.
+
+    ``base`` maps every forecast_costs argument name to a value (``charging`` is
+    optional). ``scenarios`` maps labels to override dicts, or is a list of
+    override dicts labelled by what they change. Forecasts start in
+    ``start_year``, this year by default.
+    """
+    if not isinstance(scenarios, dict):
+        scenarios = {_label(overrides): overrides for overrides in scenarios}
+    base = {**DEFAULTS, **base}
+    missing = set(INPUTS) - set(base)
+    if missing:
+        raise ValueError(f"Base inputs are missing {', '.join(sorted(missing))}")
+    for label, overrides in scenarios.items():
+        unknown = set(overrides) - set(base)
+        if unknown:
+            raise ValueError(f"Scenario {label!r} overrides unknown inputs: {', '.join(sorted(unknown))}")
+        if 'years' in overrides:
+            raise ValueError(f"Scenario {label!r} changes the horizon; deltas need the base's years")
+    start_year = datetime.now().year if start_year is None else start_year
+    labels = list(scenarios)
+    inputs = [{**base, **scenarios[label]} for label in labels]
+    changed = [{name for name in scenarios[label] if scenarios[label][name] != base[name]} for label in labels]
+
+    base_result = _base_forecast(base, start_year)
+    n, years = len(labels), base_result.years
+    arrays = {name: np.repeat(getattr(base_result, name)[None, :], n, axis=0) for name in RESULT_FIELDS}
+    recomputed = [() for _ in labels]
+
+    # Scenarios that change maintenance inputs are forecast in full, together
+    full = [k for k in range(n) if changed[k] - INCREMENTAL_INPUTS]
+    if full:
+        batch = _batch([inputs[k] for k in full], start_year)
+        for name in RESULT_FIELDS:
+            arrays[name][full] = getattr(batch, name)
+        for k in full:
+            recomputed[k] = ('forecast',)
+
+    # The rest only recompute the components their overrides reach
+    vehicle_age = start_year - base['model_year'] + np.arange(1, years + 1)[None, :]
+    for component, names in COMPONENT_INPUTS.items():
+        rows = [k for k in range(n) if k not in full and changed[k] & set(names)]
+        if not rows:
+            continue
+        part = [inputs[k] for k in rows]
+        m = len(rows)
+        makes, models = [base['make']] * m, [base['model']] * m
+        if component == 'loan':
+            arrays['loan'][rows] = annual_schedule(_column(part, 'loan_amount'), _column(part, 'irate'),
+                                                   _column(part, 'lt_years'), years).payment
+        elif component == 'insurance':
+            msrps = np.array([np.nan if row['msrp'] is None else row['msrp'] for row in part], dtype=np.float64)
+            arrays['insurance'][rows] = insurance_premiums(
+                _column(part, 'user_age'), _column(part, 'start_age'), msrps, np.full(m, base['avg_mpy']),
+                np.repeat(vehicle_age, m, axis=0), [base['state']] * m
+            )
+        elif component == 'value':
+            arrays['value'][rows], arrays['depreciation'][rows] = value_curves(
+                makes, models, _column(part, 'purchase_price'), np.full(m, base['model_year']),
+                np.full(m, start_year - base['model_year']), years
+            )
+        elif component == 'fuel':
+            battery_kwh, range_miles = battery_specs(makes, models)
+            _, _, energy = battery_curves(battery_kwh, range_miles, np.full(m, start_year - base['model_year']),
+                                          np.full(m, base['current_mileage']), np.full(m, base['avg_mpy']), years)
+            arrays['fuel'][rows] = fuel_costs(makes, models, [base['state']] * m, np.full(m, base['avg_mpy']),
+                                              _column(part, 'mpg'), np.repeat(vehicle_age, m, axis=0), energy,
+                                              _column(part, 'charging', object))
+        for k in rows:
+            recomputed[k] += (component,)
+
+    # Totals follow whichever of their parts were recomputed
+    retotal = [k for k in range(n) if {'loan', 'fuel'} & set(recomputed[k])]
+    if retotal:
+        arrays['total'][retotal] = (arrays['maintenance'][retotal] + arrays['fuel'][retotal] + REGISTRATION_FEE
+                                    + arrays['loan'][retotal])
+
+    batch = ForecastBatch(is_ev=np.full(n, base_result.is_ev), fingerprint=model_fingerprint(), **arrays)
+    return ScenarioComparison(labels=labels, base=base_result, scenarios=batch, recomputed=recomputed)
@@ -0,0 +1,75 @@
+"""Tabulated aging multipliers and activities against the rules applied one age at a time."""
+import numpy as np
+import pytest
+
+from aging import AGE_PERIOD, MAX_AGE, MAX_LIFESPAN, aging_lookup
+from forecast_result import ACTIVITY_BITS
+
+LIFESPANS = np.arange(1, MAX_LIFESPAN + 1)
+AGES = np.arange(-3, MAX_AGE + 5 * AGE_PERIOD + 1)
+
+
+def reference_multiplier(age, lifespan):
+    """The maintenance cost multiplier, written out as the forecast loop had it"""
+    multiplier = 1.0
+    if age > lifespan * 0.6:
+        multiplier = 1.0 + (age - lifespan * 0.6) * 0.15
+    if age > lifespan * 0.8:
+        multiplier += (age - lifespan * 0.8) * 0.25
+    if age > lifespan:
+        multiplier += (age - lifespan) * 0.50
+    if age > lifespan + 5:
+        multiplier += (age - (lifespan + 5)) * 0.75
+    return min(multiplier, 8.0)
+
+
+def reference_activities(age, lifespan):
+    """Names of the age-triggered activities due, written out as the forecast loop had them"""
+    due = {
+        'Transmission Service': age >= lifespan * 0.7,
+        'Suspension Check': age >= lifespan * 0.8,
+        'Engine Mount Replacement': age > lifespan,
+        'CV Joint Replacement': age > lifespan + 2,
+        'Power Steering Service': age > lifespan + 3,
+        'Radiator Replacement': age > lifespan + 5 and age % 3 == 0,
+        'Catalytic Converter Replacement': age > lifespan + 5 and age % 4 == 0,
+        'Battery Pack Degradation Service': age > lifespan,
+        'Drive Unit Overhaul': age > lifespan + 3,
+    }
+    return {name for name, on in due.items() if on}
+
+
+def decode(mask):
+    return {name for name, bit in ACTIVITY_BITS.items() if int(mask) & bit}
+
+
+@pytest.fixture(scope='module')
+def lookup():
+    return aging_lookup(AGES[None, :], LIFESPANS[:, None])
+
+
+def test_tables_cover_ages_past_max_age():
+    assert AGES.max() > MAX_AGE + AGE_PERIOD
+
+
+def test_multiplier_matches_rules(lookup):
+    multipliers, _ = lookup
+    for i, lifespan in enumerate(LIFESPANS.tolist()):
+        for j, age in enumerate(AGES.tolist()):
+            assert multipliers[i, j] == pytest.approx(reference_multiplier(age, lifespan), rel=1e-12), (lifespan, age)
+
+
+def test_activities_match_rules(lookup):
+    _, masks = lookup
+    for i, lifespan in enumerate(LIFESPANS.tolist()):
+        for j, age in enumerate(AGES.tolist()):
+            assert decode(masks[i, j]) == reference_activities(age, lifespan), (lifespan, age)
+
+
+def test_fallback_for_values_outside_the_table():
+    ages = np.array([2.5, 7.0, 70.0])
+    for lifespan in (12.5, MAX_LIFESPAN + 5):
+        multipliers, masks = aging_lookup(ages, lifespan)
+        for age, multiplier, mask in zip(ages.tolist(), multipliers.tolist(), masks.tolist()):
+            assert multiplier == pytest.approx(reference_multiplier(age, lifespan), rel=1e-12)
+            assert decode(mask) == reference_activities(age, lifespan)
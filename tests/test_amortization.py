@@ -0,0 +1,82 @@
+"""Closed-form amortization against stepping a loan month by month."""
+import numpy as np
+import pytest
+
+from amortization import amortization_schedule, annual_schedule, max_principal, monthly_payment
+
+
+def stepped_schedule(principal, annual_rate, term_years, months):
+    """Month-by-month payment, principal, interest and balance, the way a loan statement runs"""
+    r = annual_rate / 100 / 12
+    n = round(term_years * 12)
+    payment = principal * r / (1 - (1 + r) ** -n) if r > 0 else principal / n
+    balance, rows = principal, []
+    for month in range(1, months + 1):
+        if month > n:
+            rows.append((0.0, 0.0, 0.0, 0.0))
+            continue
+        interest = balance * r
+        principal_paid = payment - interest
+        balance = 0.0 if month == n else balance - principal_paid
+        rows.append((payment, principal_paid, interest, balance))
+    return np.array(rows).T
+
+
+@pytest.mark.parametrize('principal, annual_rate, term_years', [
+    (20000, 0.0, 5), (20000, 4.9, 5), (35000, 7.0, 6), (1000, 24.0, 1), (50000, 0.5, 8),
+])
+def test_monthly_schedule_matches_stepping(principal, annual_rate, term_years):
+    months = term_years * 12 + 6
+    schedule = amortization_schedule(principal, annual_rate, term_years, months)
+    expected = stepped_schedule(principal, annual_rate, term_years, months)
+    for actual, wanted in zip((schedule.payment, schedule.principal, schedule.interest, schedule.balance), expected):
+        np.testing.assert_allclose(actual, wanted, rtol=1e-9, atol=1e-6)
+
+
+def test_zero_rate_pays_equal_principal():
+    assert monthly_payment(24000, 0.0, 4) == pytest.approx(500.0)
+    schedule = annual_schedule(24000, 0.0, 4, 6)
+    np.testing.assert_allclose(schedule.payment, [6000, 6000, 6000, 6000, 0, 0])
+    assert schedule.total_interest == pytest.approx(0.0)
+    np.testing.assert_allclose(schedule.balance, [18000, 12000, 6000, 0, 0, 0])
+
+
+def test_term_shorter_than_horizon_stops_paying():
+    schedule = annual_schedule(30000, 6.0, 3, 10)
+    assert (schedule.payment[:3] > 0).all()
+    assert (schedule.payment[3:] == 0).all()
+    assert (schedule.balance[2:] == 0).all()
+    assert schedule.total_paid == pytest.approx(float(monthly_payment(30000, 6.0, 3)) * 36)
+
+
+def test_horizon_shorter_than_term_leaves_a_balance():
+    schedule = annual_schedule(30000, 6.0, 6, 2)
+    assert schedule.balance[-1] > 0
+    assert schedule.principal.sum() + schedule.balance[-1] == pytest.approx(30000)
+
+
+@pytest.mark.parametrize('annual_rate', [0.0, 3.5, 7.0, 18.0])
+@pytest.mark.parametrize('term_years', [1, 3, 5, 7])
+def test_principal_sums_to_loan_amount(annual_rate, term_years):
+    for schedule in (annual_schedule(27500, annual_rate, term_years, 10),
+                     amortization_schedule(27500, annual_rate, term_years)):
+        assert schedule.principal.sum() == pytest.approx(27500)
+        np.testing.assert_allclose(schedule.payment, schedule.principal + schedule.interest)
+
+
+def test_schedules_broadcast_over_loans():
+    principal, rates, terms = np.array([10000, 20000, 0]), np.array([0.0, 5.0, 5.0]), np.array([2, 5, 5])
+    schedule = annual_schedule(principal, rates, terms, 6)
+    assert schedule.payment.shape == (3, 6)
+    for i in range(3):
+        single = annual_schedule(principal[i], rates[i], terms[i], 6)
+        np.testing.assert_array_equal(schedule.payment[i], single.payment)
+    assert (schedule.payment[2] == 0).all()
+
+
+@pytest.mark.parametrize('annual_rate', [0.0, 0.1, 4.9, 7.0, 30.0])
+@pytest.mark.parametrize('term_years', [1, 4, 6])
+def test_max_principal_inverts_monthly_payment(annual_rate, term_years):
+    principal = np.array([1000.0, 18000.0, 65000.0])
+    payment = monthly_payment(principal, annual_rate, term_years)
+    np.testing.assert_allclose(max_principal(payment, annual_rate, term_years), principal, rtol=1e-12)
@@ -0,0 +1,59 @@
+"""The model fingerprint moves when anything a forecast reads changes."""
+import os
+import shutil
+
+import pytest
+
+import fingerprint as fp
+from linear_model import MODEL_DIR
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """A copy of the model files and forecast modules that fingerprint reads from"""
+    for path in fp.MODEL_FILES:
+        if os.path.exists(path):
+            shutil.copy(path, tmp_path)
+    for module in fp.FORECAST_MODULES:
+        shutil.copy(os.path.join(MODEL_DIR, f"{module}.py"), tmp_path)
+    monkeypatch.setattr(fp, 'MODEL_DIR', str(tmp_path))
+    monkeypatch.setattr(fp, 'MODEL_FILES', tuple(str(tmp_path / os.path.basename(path)) for path in fp.MODEL_FILES))
+    fp.fingerprint.cache_clear()
+    yield tmp_path
+    fp.fingerprint.cache_clear()
+
+
+def test_backend_changes_fingerprint(tree):
+    assert fp.fingerprint('numpy') != fp.fingerprint('sklearn')
+
+
+@pytest.mark.parametrize('module', ['estimator', 'depreciation', 'battery', 'aging', 'ev_costs', 'insurance'])
+def test_forecast_source_changes_fingerprint(tree, module):
+    before = fp.fingerprint('numpy')
+    with open(tree / f"{module}.py", 'a') as f:
+        f.write('\nSOME_CONSTANT = 1.5\n')
+    # Cached until the cache is cleared, then recomputed from the new source
+    assert fp.fingerprint('numpy') == before
+    fp.fingerprint.cache_clear()
+    assert fp.fingerprint('numpy') != before
+
+
+def test_calibrated_params_change_fingerprint(tree):
+    params = tree / 'depreciation_params.json'
+    params.write_text('{"default": [0.182, 2000.0]}')
+    fp.fingerprint.cache_clear()
+    before = fp.fingerprint('numpy')
+    params.write_text('{"default": [0.2, 2000.0]}')
+    fp.fingerprint.cache_clear()
+    after = fp.fingerprint('numpy')
+    params.unlink()
+    fp.fingerprint.cache_clear()
+    assert len({before, after, fp.fingerprint('numpy')}) == 3
+
+
+def test_reference_table_changes_fingerprint(tree, monkeypatch):
+    before = fp.fingerprint('numpy')
+    tables = fp.reference_tables()
+    monkeypatch.setattr(fp, 'reference_tables', lambda: {**tables, 'msrp_data': {**tables['msrp_data'], ('X', 'Y'): 1}})
+    fp.fingerprint.cache_clear()
+    assert fp.fingerprint('numpy') != before
@@ -0,0 +1,34 @@
+"""Replacement decisions of fleet.plan_fleet on units whose right answer is clear-cut."""
+from depreciation import residual_values
+from fleet import plan_fleet
+
+START_YEAR = 2026
+UNIT = {'make': 'Honda', 'model': 'Civic', 'avg_mpy': 12000, 'mpg': 32, 'state': 'California'}
+
+
+def unit(unit_id, model_year, current_mileage):
+    price = float(residual_values(25000, model_year, START_YEAR))
+    return {**UNIT, 'unit_id': unit_id, 'model_year': model_year, 'current_mileage': current_mileage,
+            'purchase_price': price, 'msrp': 25000, 'replacement_price': 25000}
+
+
+def replacement_years(*units, **options):
+    """Forecast year each unit is replaced in (1 = this year, 0 = never)"""
+    return plan_fleet(list(units), years=30, start_year=START_YEAR, **options).replacement_year
+
+
+def test_new_car_is_kept():
+    new, young = replacement_years(unit('new', START_YEAR, 0), unit('young', START_YEAR - 2, 10000))
+    assert new == 0 or new > 5
+    assert young == 0 or young > 5
+
+
+def test_car_past_end_of_life_is_replaced_at_once():
+    assert replacement_years(unit('old', START_YEAR - 25, 300000))[0] == 1
+
+
+def test_swap_cost_delays_replacement():
+    old = unit('old', START_YEAR - 9, 110000)
+    cheap = replacement_years(old, swap_cost=0, resale_haircut=0)[0]
+    dear = replacement_years(old, swap_cost=10000, resale_haircut=0.3)[0]
+    assert cheap > 0 and (dear == 0 or dear > cheap)
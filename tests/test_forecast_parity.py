@@ -0,0 +1,101 @@
+"""forecast_batch against frozen output of the per-vehicle forecast loop it replaced.
+
+tests/data/legacy_forecasts.json.gz holds predict_5_years_cost output for 400
+randomized forecasts (a quarter of them EVs, with loans, every driving style
+and terrain, and MSRPs either side of the insurance surcharge), computed by the
+per-vehicle loop just before forecast_batch replaced it, for forecasts
+starting in ``start_year``.
+"""
+import gzip
+import json
+import os
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from estimator import forecast_batch
+from forecast_result import (
+    ACTIVITY_BITS, EV_ACTIVITY_ORDER, ICE_ACTIVITY_ORDER, ForecastResult, decode_activities, encode_activities
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'legacy_forecasts.json.gz')
+
+
+def load_baseline():
+    with gzip.open(BASELINE_PATH, 'rt') as f:
+        return json.load(f)
+
+
+def batched_results(baseline):
+    """``(case, ForecastResult)`` per baseline case, forecast in one forecast_batch call per horizon"""
+    by_years = defaultdict(list)
+    for case in baseline['cases']:
+        by_years[case['inputs'][8]].append(case)
+    for years, cases in sorted(by_years.items()):
+        columns = [list(column) for column in zip(*(case['inputs'] for case in cases))]
+        columns[8] = years
+        columns[14] = np.array(columns[14], dtype=object)
+        batch = forecast_batch(*columns, start_year=baseline['start_year'])
+        for i, case in enumerate(cases):
+            yield case, batch[i]
+
+
+@pytest.fixture(scope='module')
+def results():
+    return list(batched_results(load_baseline()))
+
+
+def test_baseline_covers_evs_and_loans(results):
+    assert len(results) == 400
+    assert any(result.is_ev for _, result in results)
+    assert any(case['inputs'][9] > 0 for case, _ in results)
+
+
+def test_display_columns_match_baseline(results):
+    mismatched = defaultdict(list)
+    for k, (case, result) in enumerate(results):
+        _, frame, _ = result.to_legacy()
+        assert list(frame.columns) == list(case['columns'])
+        for name, expected in case['columns'].items():
+            if frame[name].tolist() != expected:
+                mismatched[name].append(k)
+    assert not mismatched
+
+
+def test_summary_and_intersection_match_baseline(results):
+    for case, result in results:
+        summary, _, intersection = result.to_legacy()
+        assert summary == case['summary']
+        assert intersection == case['intersection']
+
+
+@pytest.mark.parametrize('order', [ICE_ACTIVITY_ORDER, EV_ACTIVITY_ORDER], ids=['ice', 'ev'])
+def test_activity_bitmask_round_trip(order):
+    is_ev = order is EV_ACTIVITY_ORDER
+    assert decode_activities(0, is_ev) == []
+    assert decode_activities(encode_activities(order), is_ev) == list(order)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        names = [name for name in order if rng.random() < 0.3]
+        shuffled = list(rng.permutation(names))
+        mask = encode_activities(shuffled)
+        assert decode_activities(mask, is_ev) == names
+        # Masks survive the uint64 arrays ForecastResult stores them in
+        assert decode_activities(np.array([mask], dtype=np.uint64)[0], is_ev) == names
+
+
+def test_activity_bits_are_distinct():
+    bits = list(ACTIVITY_BITS.values())
+    assert len(set(bits)) == len(bits)
+    assert all(bit & (bit - 1) == 0 for bit in bits)
+    assert max(bits) < 2**64
+
+
+def test_activity_list_reads_the_bitmask():
+    names = list(ICE_ACTIVITY_ORDER[:3])
+    zeros = np.zeros(2)
+    result = ForecastResult(False, zeros, zeros, zeros, zeros, zeros, zeros, np.zeros(2, dtype=np.int64),
+                            np.array([encode_activities(names), 0], dtype=np.uint64))
+    assert result.activity_list(0) == names
+    assert result.activity_list(1) == []
@@ -0,0 +1,112 @@
+"""Persistent forecast cache: hits, unreadable payloads, invalidation and eviction."""
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+import forecast_store
+from estimator import forecast_costs
+from forecast_store import ForecastStore, forecast_key
+
+ARGS = ('Toyota', 'Camry', 2018, 60000, 12000, 30, 15000.0, 'Texas', 5, 0.0, 0.0, 1, 40, 18, 26000, 'normal', 'flat')
+START_YEAR = 2026
+
+
+@pytest.fixture(scope='module')
+def result():
+    return forecast_costs(*ARGS, start_year=START_YEAR)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ForecastStore(str(tmp_path / 'forecasts.sqlite'))
+
+
+def hits(store, key):
+    return store._connection().execute('SELECT hits FROM forecasts WHERE key = ?', (key,)).fetchone()[0]
+
+
+def test_round_trip(store, result):
+    store.put('k', result)
+    loaded = store.get('k', 'fp')
+    assert loaded.fingerprint == 'fp'
+    for name in forecast_store.RESULT_FIELDS:
+        assert np.array_equal(getattr(loaded, name), getattr(result, name))
+    assert store.get('missing') is None
+
+
+def test_hits_are_batched(store, result):
+    store.put('k', result)
+    for _ in range(3):
+        store.get('k')
+    assert hits(store, 'k') == 0
+    assert store.flush_touches()
+    assert hits(store, 'k') == 3
+
+
+def test_locked_file_still_serves_hits(store, result, monkeypatch):
+    store.put('k', result)
+    monkeypatch.setattr(forecast_store, 'TOUCH_INTERVAL', 0.0)
+    writer = sqlite3.connect(store.path, isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE')
+    try:
+        start = time.perf_counter()
+        assert store.get('k') is not None
+        assert time.perf_counter() - start < forecast_store.BUSY_TIMEOUT / 2
+    finally:
+        writer.execute('ROLLBACK')
+        writer.close()
+    # The hit stayed batched and is written once the lock is released
+    assert store.flush_touches()
+    assert hits(store, 'k') == 1
+
+
+@pytest.mark.parametrize('payload', [b'', b'not a forecast', b'PK\x03\x04truncated'])
+def test_unreadable_payload_is_a_miss_and_deleted(store, result, payload):
+    store.put('k', result)
+    store._connection().execute('UPDATE forecasts SET payload = ? WHERE key = ?', (payload, 'k'))
+    assert store.get('k') is None
+    assert store.stats()['entries'] == 0
+
+
+def test_stored_forecast_recomputes_unreadable_payload(store, result, monkeypatch):
+    monkeypatch.setattr(forecast_store, 'default_store', lambda: store)
+    key = forecast_key(ARGS, forecast_store.model_fingerprint(), START_YEAR)
+    store.put(key, result)
+    store._connection().execute('UPDATE forecasts SET payload = ? WHERE key = ?', (b'garbage', key))
+    recomputed = forecast_store.stored_forecast(*ARGS, start_year=START_YEAR)
+    assert np.array_equal(recomputed.total, result.total)
+    assert store.get(key) is not None
+
+
+def test_key_changes_with_start_year():
+    fingerprint = forecast_store.model_fingerprint()
+    assert forecast_key(ARGS, fingerprint, START_YEAR) != forecast_key(ARGS, fingerprint, START_YEAR + 1)
+    assert forecast_key(ARGS, fingerprint, START_YEAR) == forecast_key(ARGS, fingerprint, START_YEAR)
+
+
+def test_key_changes_with_format_version(monkeypatch):
+    before = forecast_key(ARGS, 'fp', START_YEAR)
+    monkeypatch.setattr(forecast_store, 'FORMAT_VERSION', forecast_store.FORMAT_VERSION + 1)
+    assert forecast_key(ARGS, 'fp', START_YEAR) != before
+
+
+def test_key_normalizes_numbers():
+    as_floats = tuple(float(arg) if isinstance(arg, int) else arg for arg in ARGS)
+    assert forecast_key(ARGS, 'fp', START_YEAR) == forecast_key(as_floats, 'fp', START_YEAR)
+    assert forecast_key(ARGS, 'fp', START_YEAR) != forecast_key(ARGS, 'other', START_YEAR)
+
+
+def test_eviction_keeps_file_under_cap_and_recently_used(tmp_path, result):
+    store = ForecastStore(str(tmp_path / 'forecasts.sqlite'), max_bytes=64 * 1024)
+    store.put('first', result)
+    for i in range(200):
+        store.put(f'k{i}', result)
+        store.get('first')          # kept in use throughout
+        assert store.size() <= store.max_bytes
+    entries = store.stats()['entries']
+    assert 0 < entries < 200
+    assert store.get('first') is not None
+    assert store.get('k0') is None
+    assert store.get('k199') is not None
@@ -0,0 +1,83 @@
+"""Rating-table premiums against the inline formula the forecast used before insurance.py."""
+import numpy as np
+import pytest
+
+from insurance import DEFAULT_RATING_TABLE, quote_book, rate_premiums, territory_factors
+from reference_data import state_cost_multipliers
+
+STATES = sorted(state_cost_multipliers) + ['Nowhere']
+MSRPS = [None, 0, 30000, 50000, 50000.01, 50001, 90000]
+ANNUAL_MILES = [5000, 6999, 7000, 7000.5, 12000, 15000, 15001, 25000]
+
+
+def legacy_premium(driver_age, years_driving, msrp, annual_miles, vehicle_age, state):
+    """The forecast loop's premium for one year, as it was written before the rating table"""
+    premium = 1200
+    if driver_age < 25:
+        premium += 700
+    if driver_age >= 25 and years_driving >= 10:
+        premium -= 200
+    if msrp and msrp > 50000:
+        premium += 400
+    if annual_miles > 15000:
+        premium += 200
+    elif annual_miles < 7000:
+        premium -= 100
+    if vehicle_age > 10:
+        age_discount = min(0.3, (vehicle_age - 10) * 0.03)
+        premium *= (1 - age_discount)
+    premium *= state_cost_multipliers.get(state, 1.0)
+    return max(700, round(premium))
+
+
+@pytest.fixture(scope='module')
+def cases():
+    rng = np.random.default_rng(0)
+    n = 20000
+    driver_age = rng.integers(16, 90, n)
+    return {
+        'driver_age': driver_age,
+        'years_driving': driver_age - rng.integers(14, 30, n),
+        'msrp': [MSRPS[i] for i in rng.integers(len(MSRPS), size=n)],
+        'annual_miles': np.array(ANNUAL_MILES)[rng.integers(len(ANNUAL_MILES), size=n)],
+        'vehicle_age': rng.integers(0, 40, n),
+        'state': [STATES[i] for i in rng.integers(len(STATES), size=n)],
+    }
+
+
+def test_rate_premiums_matches_legacy_formula(cases):
+    msrp = np.array([np.nan if m is None else m for m in cases['msrp']], dtype=np.float64)
+    premiums = rate_premiums(cases['driver_age'], cases['years_driving'], msrp, cases['annual_miles'],
+                             cases['vehicle_age'], territory_factors(cases['state']))
+    expected = [legacy_premium(*row) for row in zip(*(
+        cases[name].tolist() if isinstance(cases[name], np.ndarray) else cases[name]
+        for name in ('driver_age', 'years_driving', 'msrp', 'annual_miles', 'vehicle_age', 'state')
+    ))]
+    assert premiums.dtype == np.int64
+    assert premiums.tolist() == expected
+
+
+@pytest.mark.parametrize('msrp', MSRPS)
+def test_scalar_msrp_matches_legacy_formula(msrp):
+    premium = rate_premiums(30, 12, msrp, 12000, 5, territory_factors('Texas'))
+    assert int(premium) == legacy_premium(30, 12, msrp, 12000, 5, 'Texas')
+
+
+def test_minimum_premium():
+    premium = rate_premiums(60, 40, None, 5000, 30, 0.1)
+    assert int(premium) == DEFAULT_RATING_TABLE.minimum
+
+
+def test_quote_book_rates_every_driver_vehicle_and_year():
+    user_ages, start_ages, annual_miles = [18, 24, 40, 70], [16, 16, 16, 50], [5000, 12000, 15001, 7000]
+    msrps, vehicle_ages, states = [None, 30000, 90000], [0, 9, 22], ['Texas', 'California', 'Nowhere']
+    years = 12
+    book = quote_book(user_ages, start_ages, annual_miles, msrps, vehicle_ages, states, years)
+    assert book.shape == (4, 3, years)
+    assert book.dtype == np.int64
+    for d, (user_age, start_age, miles) in enumerate(zip(user_ages, start_ages, annual_miles)):
+        for v, (msrp, vehicle_age, state) in enumerate(zip(msrps, vehicle_ages, states)):
+            for i in range(1, years + 1):
+                driver_age = user_age + i - 1
+                expected = legacy_premium(driver_age, driver_age - start_age, msrp, miles, vehicle_age + i, state)
+                assert book[d, v, i - 1] == expected
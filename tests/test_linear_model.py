@@ -0,0 +1,79 @@
+"""The NumPy port of the maintenance model against the pickles it was exported from."""
+import json
+import os
+import shutil
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from estimator import load_models
+from linear_model import COEFFICIENTS_PATH, FEATURES, MODEL_DIR, PICKLE_FILES, LinearCostModel, coefficients_stale
+
+
+@pytest.fixture(scope='module')
+def pickles():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')      # the pickles may come from another scikit-learn version
+        return load_models()
+
+
+@pytest.fixture(scope='module')
+def exported():
+    return LinearCostModel.from_json(COEFFICIENTS_PATH)
+
+
+def test_predict_matches_pickle(pickles, exported):
+    trained_model = pickles[0]
+    rng = np.random.default_rng(0)
+    n = 10000
+    X = pd.DataFrame({
+        'Make_Encoded': rng.integers(0, len(exported.make_classes), n),
+        'Model_Encoded': rng.integers(0, len(exported.model_classes), n),
+        'Year': rng.integers(1990, 2031, n),
+        'Mileage': rng.integers(0, 600000, n),
+        'Avg_Miles_Per_Year': rng.integers(0, 100001, n),
+    })[FEATURES].astype(np.float64)
+    assert np.array_equal(exported.predict(X.to_numpy()), trained_model.predict(X))
+
+
+def test_encode_matches_label_encoders(pickles, exported):
+    _, le_make, le_model = pickles
+    makes, models = list(le_make.classes_), list(le_model.classes_)
+    # Pair every make with a model and every model with a make, so both encoders see every class
+    pairs = [(makes[i % len(makes)], models[i % len(models)]) for i in range(max(len(makes), len(models)))]
+    encoded = [exported.encode(make, model) for make, model in pairs]
+    assert [make for make, _ in encoded] == list(le_make.transform([make for make, _ in pairs]))
+    assert [model for _, model in encoded] == list(le_model.transform([model for _, model in pairs]))
+
+
+def test_encode_rejects_unseen_labels(exported):
+    with pytest.raises(ValueError):
+        exported.encode('No Such Make', exported.model_classes[0])
+
+
+def test_coefficients_fresh_for_deployed_pickles():
+    assert coefficients_stale(COEFFICIENTS_PATH, MODEL_DIR) == []
+
+
+def test_coefficients_stale_after_pickle_changes(tmp_path):
+    for name in PICKLE_FILES:
+        shutil.copy(os.path.join(MODEL_DIR, name), tmp_path / name)
+    path = tmp_path / 'car_maintenance_model.json'
+    shutil.copy(COEFFICIENTS_PATH, path)
+    assert coefficients_stale(str(path), str(tmp_path)) == []
+
+    with open(tmp_path / 'le_make.pkl', 'ab') as f:
+        f.write(b'\0')
+    coefficients_stale.cache_clear()
+    assert coefficients_stale(str(path), str(tmp_path)) == ['le_make.pkl']
+
+
+def test_coefficients_without_digests_are_not_stale(tmp_path):
+    with open(COEFFICIENTS_PATH) as f:
+        data = json.load(f)
+    del data['pickle_digests']
+    path = tmp_path / 'car_maintenance_model.json'
+    path.write_text(json.dumps(data))
+    assert coefficients_stale(str(path), MODEL_DIR) == []
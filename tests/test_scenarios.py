@@ -0,0 +1,107 @@
+"""compare_scenarios against forecasting every scenario on its own."""
+import numpy as np
+import pytest
+
+import forecast_store
+from estimator import forecast_batch
+from scenarios import INPUTS, RESULT_FIELDS, compare_scenarios
+
+START_YEAR = 2026
+ICE = {
+    'make': 'Toyota', 'model': 'Camry', 'model_year': 2019, 'current_mileage': 55000, 'avg_mpy': 12000,
+    'mpg': 30, 'purchase_price': 18000.0, 'state': 'Texas', 'years': 8, 'loan_amount': 15000.0, 'irate': 6.5,
+    'lt_years': 5, 'user_age': 23, 'start_age': 17, 'msrp': 27000, 'driving_style': 'normal', 'terrain': 'flat',
+}
+EV = {**ICE, 'make': 'Tesla', 'model': 'Model 3', 'mpg': 0, 'purchase_price': 32000.0, 'msrp': 42000}
+
+INCREMENTAL = [
+    {'loan_amount': 0},
+    {'irate': 2.9, 'lt_years': 3},
+    {'user_age': 45, 'start_age': 18},
+    {'msrp': 60000},
+    {'msrp': None},
+    {'purchase_price': 25000.0},
+    {'mpg': 40},
+    {'charging': 'home'},
+    {'charging': 'public'},
+    {'loan_amount': 0, 'msrp': 60000, 'purchase_price': 9000.0, 'mpg': 22, 'charging': 'home'},
+]
+FULL = [
+    {'driving_style': 'aggressive'},
+    {'terrain': 'hilly', 'loan_amount': 0},
+    {'avg_mpy': 20000},
+    {'state': 'California'},
+]
+
+
+@pytest.fixture(autouse=True)
+def no_persistent_cache(monkeypatch):
+    monkeypatch.setattr(forecast_store, 'default_store', lambda: None)
+
+
+def standalone(inputs, start_year=START_YEAR):
+    """forecast_batch on one complete set of inputs"""
+    merged = {'charging': 'mixed', **inputs}
+    columns = [[merged[name]] for name in INPUTS]
+    columns[INPUTS.index('years')] = merged['years']
+    return forecast_batch(*columns, start_year=start_year, chargings=[merged['charging']])[0]
+
+
+@pytest.mark.parametrize('base', [ICE, EV], ids=['ice', 'ev'])
+@pytest.mark.parametrize('years', [1, 8, 20])
+def test_incremental_scenarios_match_standalone_forecasts(base, years):
+    base = {**base, 'years': years}
+    comparison = compare_scenarios(base, INCREMENTAL, start_year=START_YEAR)
+    assert all('forecast' not in recomputed for recomputed in comparison.recomputed)
+    for k, overrides in enumerate(INCREMENTAL):
+        expected = standalone({**base, **overrides})
+        for name in RESULT_FIELDS:
+            assert np.array_equal(getattr(comparison.scenarios, name)[k], getattr(expected, name)), (overrides, name)
+
+
+@pytest.mark.parametrize('base', [ICE, EV], ids=['ice', 'ev'])
+def test_full_scenarios_match_standalone_forecasts(base):
+    comparison = compare_scenarios(base, FULL, start_year=START_YEAR)
+    assert all(recomputed == ('forecast',) for recomputed in comparison.recomputed)
+    for k, overrides in enumerate(FULL):
+        expected = standalone({**base, **overrides})
+        for name in RESULT_FIELDS:
+            np.testing.assert_allclose(getattr(comparison.scenarios, name)[k], getattr(expected, name),
+                                       rtol=1e-12, atol=1e-9)
+
+
+def test_base_and_deltas():
+    comparison = compare_scenarios(ICE, {'Cash': {'loan_amount': 0}}, start_year=START_YEAR)
+    base = standalone(ICE)
+    for name in RESULT_FIELDS:
+        assert np.array_equal(getattr(comparison.base, name), getattr(base, name))
+    assert np.array_equal(comparison.delta('loan')[0], -base.loan)
+    assert comparison.recomputed == [('loan',)]
+    assert list(comparison.summary_frame().index) == ['Cash']
+
+
+def test_base_comes_from_the_store_for_its_own_inputs_and_year(tmp_path, monkeypatch):
+    store = forecast_store.ForecastStore(str(tmp_path / 'forecasts.sqlite'))
+    monkeypatch.setattr(forecast_store, 'default_store', lambda: store)
+    compare_scenarios(ICE, [{'loan_amount': 0}], start_year=START_YEAR)
+    compare_scenarios(ICE, [{'loan_amount': 0}], start_year=START_YEAR + 1)
+    compare_scenarios({**ICE, 'mpg': 25}, [{'loan_amount': 0}], start_year=START_YEAR)
+    assert store.stats()['entries'] == 3
+    later = compare_scenarios(ICE, [{'loan_amount': 0}], start_year=START_YEAR + 1)
+    assert store.stats()['hits'] == 1
+    assert np.array_equal(later.base.total, standalone(ICE, START_YEAR + 1).total)
+    assert not np.array_equal(later.base.total, standalone(ICE).total)
+
+
+@pytest.mark.parametrize('overrides, message', [
+    ({'years': 3}, 'horizon'),
+    ({'color': 'red'}, 'unknown inputs'),
+])
+def test_invalid_overrides(overrides, message):
+    with pytest.raises(ValueError, match=message):
+        compare_scenarios(ICE, [overrides], start_year=START_YEAR)
+
+
+def test_base_must_be_complete():
+    with pytest.raises(ValueError, match='missing'):
+        compare_scenarios({k: v for k, v in ICE.items() if k != 'state'}, [{}], start_year=START_YEAR)
@@ -0,0 +1,167 @@
+"""Hourly time-of-use charging simulator.
+
+A vehicle's annual home-charging kWh is spread over the 8760 hours of a year
+according to a charging profile (the share of energy drawn in each hour), and
+each hour is priced at the peak or off-peak rate of the state's TOU tariff:
+
+    peak_kwh = kWh * (profile @ peak_hours)
+    cost     = peak_kwh * peak_rate + (kWh - peak_kwh) * off_peak_rate
+
+Profiles are reduced over the hour axis once, so a fleet costs one dot product
+per distinct profile plus a few array operations per vehicle. Public charging
+is billed at a flat rate, as in ev_costs.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from ev_costs import DEFAULT_PUBLIC_RATE, DEFAULT_RESIDENTIAL_RATE, vehicle_charging_arrays
+from reference_data import state_electricity_rates, time_of_use_rates
+
+HOURS_PER_DAY = 24
+DAYS_PER_YEAR = 365
+HOURS_PER_YEAR = HOURS_PER_DAY * DAYS_PER_YEAR
+
+# Weekday peak window, [start, end) in local hours
+PEAK_START = 16
+PEAK_END = 21
+
+# Relative charging weight for each hour of the day
+CHARGING_PROFILES = {
+    'overnight': [1] * 6 + [0] * 17 + [1],                  # plugged in 23:00-06:00
+    'evening': [0] * 18 + [1] * 4 + [0] * 2,                # plugged in on arrival, 18:00-22:00
+    'workplace': [0] * 9 + [1] * 7 + [0] * 8,               # at work, 09:00-16:00
+    'uniform': [1] * HOURS_PER_DAY,
+}
+PROFILE_LABELS = {
+    'overnight': 'Overnight (11pm-6am)',
+    'evening': 'Evening (6pm-10pm)',
+    'workplace': 'Workplace (9am-4pm)',
+    'uniform': 'Around the clock',
+}
+
+
+@lru_cache(maxsize=None)
+def peak_hours(start=PEAK_START, end=PEAK_END, weekends_off_peak=True, first_weekday=0):
+    """Boolean mask over the 8760 hours of a year marking peak-rate hours.
+
+    ``first_weekday`` is the weekday of January 1st (0 = Monday).
+    """
+    hour = np.arange(HOURS_PER_YEAR) % HOURS_PER_DAY
+    mask = (hour >= start) & (hour < end)
+    if weekends_off_peak:
+        weekday = (np.arange(HOURS_PER_YEAR) // HOURS_PER_DAY + first_weekday) % 7
+        mask &= weekday < 5
+    mask.flags.writeable = False
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _named_profile(name):
+    profile = hourly_profile(CHARGING_PROFILES[name])
+    profile.flags.writeable = False
+    return profile
+
+
+def hourly_profile(weights):
+    """Normalize 24-hour (repeated daily) or 8760-hour weights to shares summing to 1.
+
+    A named profile from CHARGING_PROFILES is also accepted. Weights of shape
+    ``(N, 24)`` or ``(N, 8760)`` give one profile per row.
+    """
+    if isinstance(weights, str):
+        return _named_profile(weights)
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape[-1] == HOURS_PER_DAY:
+        weights = np.tile(weights, DAYS_PER_YEAR)
+    elif weights.shape[-1] != HOURS_PER_YEAR:
+        raise ValueError(f"Charging profile needs {HOURS_PER_DAY} or {HOURS_PER_YEAR} hourly weights, "
+                         f"got {weights.shape[-1]}")
+    return weights / weights.sum(axis=-1, keepdims=True)
+
+
+def peak_fraction(profile, peak=None):
+    """Share of home-charging energy drawn in peak hours.
+
+    ``profile`` is a profile name, a sequence of names (one per vehicle) or an
+    array of hourly weights accepted by hourly_profile.
+    """
+    peak = peak_hours() if peak is None else peak
+    if isinstance(profile, str):
+        return float(hourly_profile(profile) @ peak)
+    profile = np.asarray(profile)
+    if profile.dtype.kind in 'OUS':
+        names, index = np.unique(profile, return_inverse=True)
+        return np.array([hourly_profile(name) @ peak for name in names.tolist()])[index]
+    return hourly_profile(profile) @ peak
+
+
+def tou_rates(states):
+    """Peak and off-peak home rates per state; states without a TOU plan pay their flat rate both ways"""
+    peak, off_peak = [], []
+    for state in states:
+        flat = state_electricity_rates.get(state, DEFAULT_RESIDENTIAL_RATE)
+        tariff = time_of_use_rates.get(state, {})
+        peak.append(tariff.get('peak', flat))
+        off_peak.append(tariff.get('off_peak', flat))
+    return np.array(peak, dtype=np.float64), np.array(off_peak, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class ChargingSimulation:
+    """Annual charging energy and cost per vehicle, split by tariff period"""
+    peak_kwh: np.ndarray
+    off_peak_kwh: np.ndarray
+    public_kwh: np.ndarray
+    peak_cost: np.ndarray
+    off_peak_cost: np.ndarray
+    public_cost: np.ndarray
+
+    @property
+    def home_kwh(self):
+        return self.peak_kwh + self.off_peak_kwh
+
+    @property
+    def annual_kwh(self):
+        return self.home_kwh + self.public_kwh
+
+    @property
+    def annual_cost(self):
+        return self.peak_cost + self.off_peak_cost + self.public_cost
+
+    @property
+    def peak_share(self):
+        """Share of home-charging kWh bought at the peak rate"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.home_kwh > 0, self.peak_kwh / self.home_kwh, 0.0)
+
+
+def simulate_charging(makes, models, states, annual_miles, profile='overnight', home_share=1.0,
+                      peak_rate=None, off_peak_rate=None, public_rate=DEFAULT_PUBLIC_RATE, peak=None):
+    """Simulate a year of charging for each vehicle.
+
+    ``profile`` is one profile for every vehicle or one per vehicle (see
+    peak_fraction). Rates default to each state's TOU tariff; every numeric
+    argument broadcasts over vehicles.
+    """
+    efficiency, home_loss, public_loss = vehicle_charging_arrays(makes, models)
+    if peak_rate is None or off_peak_rate is None:
+        state_peak, state_off_peak = tou_rates(states)
+        peak_rate = state_peak if peak_rate is None else peak_rate
+        off_peak_rate = state_off_peak if off_peak_rate is None else off_peak_rate
+
+    home_share = np.clip(np.asarray(home_share, dtype=np.float64), 0.0, 1.0)
+    kwh = np.asarray(annual_miles, dtype=np.float64) / efficiency
+    home_kwh = kwh * home_share * (1 + home_loss)
+    public_kwh = kwh * (1 - home_share) * (1 + public_loss)
+    peak_kwh = home_kwh * peak_fraction(profile, peak)
+    off_peak_kwh = home_kwh - peak_kwh
+    return ChargingSimulation(
+        peak_kwh=peak_kwh,
+        off_peak_kwh=off_peak_kwh,
+        public_kwh=public_kwh,
+        peak_cost=peak_kwh * peak_rate,
+        off_peak_cost=off_peak_kwh * off_peak_rate,
+        public_cost=public_kwh * public_rate,
+    )